@@ -1,9 +1,8 @@
 import streamlit as st
 import pandas as pd
-import joblib
 import os
-import numpy as np
 import datetime
+import sys
 
 st.set_page_config(
     page_title="Araba Fiyat Analizi",
@@ -16,33 +15,81 @@ CURRENT_FILE_PATH = os.path.abspath(__file__)
 APP_DIR = os.path.dirname(CURRENT_FILE_PATH)
 PROJECT_ROOT = os.path.dirname(APP_DIR)
 
-MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'catboost_model.pkl')
-DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'ilanlar_final.csv')
+sys.path.append(os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+from dataset import APP_COLUMNS, DATA_PATH, dataset_stamp, dataset_version, load_listings
+from model_store import MODELS_DIR, model_stamp
+from predict import PriceEstimator
+from prediction_cache import PredictionCache
+from precompute_predictions import filter_listings, load_predictions, top_opportunities
+from hierarchy import build_hierarchy
+from comparables import load_or_build
+from whatif import GIRILEN, curves, depreciation_table, what_if
+
 CURRENT_YEAR = datetime.date.today().year
+REFERANS_TOPLAMA = 'first'  # Formda sorulmayan özellikler: 'first' (modelin ilk ilanı) veya 'mode'
+
+
+@st.cache_resource(max_entries=1)
+def load_estimator(stamp):
+    # stamp: model dosyalarının damgası; yeni model yüklendiğinde motor yeniden kurulur
+    estimator = PriceEstimator.load(MODELS_DIR, CURRENT_YEAR)
+    # Önceki modelin tahminleri paylaşılan önbelleklerden bir kez, yükleme anında atılır
+    load_prediction_cache().set_version(estimator.version)
+    load_whatif_cache().set_version(estimator.version)
+    return estimator
 
 
 @st.cache_resource
-def load_models():
-    m_main = joblib.load(os.path.join(PROJECT_ROOT, 'models', "catboost_main.pkl"))
-    m_low = joblib.load(os.path.join(PROJECT_ROOT, 'models', "catboost_low.pkl"))
-    m_high = joblib.load(os.path.join(PROJECT_ROOT, 'models', "catboost_high.pkl"))
-    return m_main, m_low, m_high
+def load_prediction_cache():
+    # Tüm oturumlarca paylaşılır; anahtarlar model sürümünü içerir
+    return PredictionCache()
+
+
+@st.cache_resource
+def load_whatif_cache():
+    # Senaryo ızgaraları form girdisi ve model sürümüyle anahtarlanır; tahmin önbelleğinden ayrı tutulur
+    return PredictionCache(maxsize=500)
+
+
+@st.cache_data(max_entries=1)
+def load_data_version(stamp):
+    # stamp: veri dosyasının damgası; içerik özeti yalnızca dosya değiştiğinde yeniden hesaplanır
+    return dataset_version(DATA_PATH)
+
 
+@st.cache_data(max_entries=1)
+def load_data(data_version):
+    # Güncel bir Parquet kopyası varsa yalnızca gereken sütunlar oradan okunur, yoksa CSV
+    return load_listings(DATA_PATH, APP_COLUMNS)
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv(DATA_PATH, low_memory=False)
-    cat_cols = ['Marka', 'Seri', 'Model', 'Vites Tipi', 'Yakıt Tipi', 'Kasa Tipi', 'Renk', 'Kimden', 'Çekiş']
-    for col in cat_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str)
-            df = df[df[col] != 'nan']
-    return df
+
+@st.cache_resource(max_entries=1)
+def load_hierarchy(data_version):
+    """Marka/Seri/Model seçenekleri ve model referansları; veri setinin her sürümü için bir kez kurulur."""
+    return build_hierarchy(load_data(data_version), REFERANS_TOPLAMA)
+
+
+@st.cache_resource(max_entries=1)
+def load_comparables(data_version):
+    """Emsal ilan dizini; kayıtlı dizin veri setinin eski bir sürümüne aitse yüklü veriden yeniden kurulur."""
+    return load_or_build(DATA_PATH, df=load_data(data_version))
+
+
+@st.cache_resource(max_entries=1)
+def load_opportunity_data(data_version, models_version):
+    """Önceden hesaplanmış tahminleri veri setiyle birleştirir; güncel sürüm yoksa None döner."""
+    preds = load_predictions(data_version, models_version, CURRENT_YEAR)
+    if preds is None:
+        return None
+    return load_data(data_version).join(preds, how='inner')
 
 
 try:
-    model_main, model_low, model_high = load_models()
-    df = load_data()
+    estimator = load_estimator(model_stamp(MODELS_DIR))
+    prediction_cache = load_prediction_cache()
+    data_version = load_data_version(dataset_stamp(DATA_PATH))
+    df = load_data(data_version)
+    hierarchy = load_hierarchy(data_version)
 except Exception as e:
     st.error(f"Yükleme Hatası: {e}")
     st.stop()
@@ -75,62 +122,12 @@ with st.sidebar:
     Bu proje eğitim ve portfolyo amaçlı hazırlanmıştır.
     """)
 
+    cache_stats = prediction_cache.stats()
+    st.caption(f"Tahmin önbelleği: {cache_stats['isabet']} isabet / {cache_stats['iska']} ıska "
+               f"({cache_stats['boyut']} kayıt)")
     st.caption(f"vFinal | © {CURRENT_YEAR}")
 
 
-def prepare_input(df_input, model):
-    df_proc = df_input.copy()
-
-    if 'Boyalı Parçalar' in df_proc.columns and df_proc['Boyalı Parçalar'].dtype == 'object':
-        def count_parts(text):
-            if pd.isna(text) or str(text) in ['Yok', 'Belirtilmemiş', 'Orijinal', 'Tamamı orjinal', 'Hatasız',
-                                              'nan']: return 0
-            return len(str(text).split(','))
-
-        def check_part(text, part):
-            if pd.isna(text): return 0
-            return 1 if part.lower() in str(text).lower() else 0
-
-        df_proc['Boyali_Sayisi'] = df_proc['Boyalı Parçalar'].apply(count_parts) + df_proc[
-            'Lokal Boyalı Parçalar'].apply(count_parts)
-        df_proc['Degisen_Sayisi'] = df_proc['Değişen Parçalar'].apply(count_parts)
-
-        df_proc['Kaput_Degisen'] = df_proc['Değişen Parçalar'].apply(lambda x: check_part(x, 'kaput'))
-        df_proc['Tavan_Boyali'] = df_proc['Boyalı Parçalar'].apply(lambda x: check_part(x, 'tavan'))
-
-    if 'Yıl' in df_proc.columns:
-        df_proc['Yas'] = CURRENT_YEAR - df_proc['Yıl']
-        df_proc['Yas'] = df_proc['Yas'].replace(0, 1)
-
-    if 'Kilometre' in df_proc.columns and 'Yas' in df_proc.columns:
-        df_proc['Yillik_KM'] = df_proc['Kilometre'] / df_proc['Yas']
-
-    if 'Boyali_Sayisi' in df_proc.columns and 'Degisen_Sayisi' in df_proc.columns:
-        df_proc['Hasar_Skoru'] = (df_proc['Boyali_Sayisi'] * 1) + (df_proc['Degisen_Sayisi'] * 2)
-
-    for col in ['Motor Hacmi', 'Motor Gücü', 'Yakıt Deposu', 'Ort. Yakıt Tüketimi']:
-        if col in df_proc.columns and df_proc[col].dtype == 'object':
-            df_proc[col] = pd.to_numeric(
-                df_proc[col].astype(str).str.replace(' cc', '').str.replace(' hp', '').str.replace(' lt',
-                                                                                                   '').str.replace('.',
-                                                                                                                   '').str.replace(
-                    ',', '.'), errors='coerce').fillna(0).astype(int)
-
-    if 'Tramer' in df_proc.columns and df_proc['Tramer'].dtype == 'object':
-        df_proc['Tramer'] = pd.to_numeric(df_proc['Tramer'].astype(str).str.replace(' TL', '').str.replace('.', ''),
-                                          errors='coerce').fillna(0).astype(int)
-
-    model_cols = model.feature_names_
-    for col in model_cols:
-        if col not in df_proc.columns:
-            if col in ['Marka', 'Seri', 'Model', 'Renk', 'Kimden', 'Vites Tipi', 'Yakıt Tipi', 'Kasa Tipi', 'Çekiş']:
-                df_proc[col] = "Bilinmiyor"
-            else:
-                df_proc[col] = 0
-
-    return df_proc[model_cols]
-
-
 st.title("🚗 Yapay Zeka Araba Değerleme")
 
 tab1, tab2 = st.tabs(["💰 Fiyat Hesapla", "🕵️‍♂️ Fırsat Bul"])
@@ -140,13 +137,13 @@ with tab1:
 
     with c1:
         st.subheader("Araç Özellikleri")
-        markalar = sorted(df['Marka'].unique())
+        markalar = hierarchy['markalar']
         s_marka = st.selectbox("Marka", markalar)
 
-        seriler = sorted(df[df['Marka'] == s_marka]['Seri'].unique())
+        seriler = hierarchy['seriler'].get(s_marka, [])
         s_seri = st.selectbox("Seri", seriler)
 
-        modeller = sorted(df[(df['Marka'] == s_marka) & (df['Seri'] == s_seri)]['Model'].unique())
+        modeller = hierarchy['modeller'].get((s_marka, s_seri), [])
         s_model = st.selectbox("Model", modeller)
 
         col_y, col_k = st.columns(2)
@@ -154,8 +151,8 @@ with tab1:
         km = col_k.number_input("Kilometre", min_value=0, max_value=1000000, value=50000, step=5000)
 
         col_v, col_ykt = st.columns(2)
-        vites = col_v.selectbox("Vites Tipi", sorted(df['Vites Tipi'].unique()))
-        yakit = col_ykt.selectbox("Yakıt Tipi", sorted(df['Yakıt Tipi'].unique()))
+        vites = col_v.selectbox("Vites Tipi", hierarchy['secenekler']['Vites Tipi'])
+        yakit = col_ykt.selectbox("Yakıt Tipi", hierarchy['secenekler']['Yakıt Tipi'])
 
     with c2:
         st.subheader("Ekspertiz Durumu")
@@ -178,9 +175,10 @@ with tab1:
 
         st.divider()
         hesapla = st.button("Fiyatı Hesapla 🔮", use_container_width=True, type="primary")
+        senaryo = st.checkbox("📈 Km / yıl / hasar senaryolarını da göster")
 
     if hesapla:
-        ref = df[df['Model'] == s_model].iloc[0] if not df[df['Model'] == s_model].empty else df.iloc[0]
+        ref = hierarchy['referans'].get(s_model, hierarchy['varsayilan_referans'])
 
         toplam_boyali = diger_boyali + (1 if kaput_boyali else 0) + (1 if tavan_boyali else 0)
         toplam_degisen = diger_degisen + (1 if kaput_degisen else 0)
@@ -198,12 +196,9 @@ with tab1:
             'Tavan_Boyali': [1 if tavan_boyali else 0]
         })
 
-        processed_input = prepare_input(input_data, model_main)
-
         try:
-            pred_main = np.expm1(model_main.predict(processed_input)[0])
-            pred_low = np.expm1(model_low.predict(processed_input)[0])
-            pred_high = np.expm1(model_high.predict(processed_input)[0])
+            preds = prediction_cache.predict(estimator, input_data).iloc[0]
+            pred_main, pred_low, pred_high = preds['AI_Tahmin'], preds['AI_Alt'], preds['AI_Ust']
 
             if agir_hasar:
                 factor = 0.70  # %30 indirim
@@ -216,6 +211,48 @@ with tab1:
                         unsafe_allow_html=True)
             st.info(f"📊 Piyasa Aralığı: **{int(pred_low):,} TL** - **{int(pred_high):,} TL**")
 
+            with st.spinner("Benzer ilanlar aranıyor..."):
+                emsaller = load_comparables(data_version).nearest(input_data)
+            if not emsaller.empty:
+                st.markdown("#### 🔎 Benzer İlanlar")
+                st.caption(f"En yakın {len(emsaller)} ilanın fiyat medyanı: "
+                           f"**{int(emsaller['Fiyat'].median()):,} TL**")
+                st.dataframe(
+                    emsaller[['Model', 'Yıl', 'Kilometre', 'Motor Gücü', 'Hasar_Skoru', 'Tramer', 'Fiyat', 'Link']],
+                    column_config={
+                        "Link": st.column_config.LinkColumn("İlan", display_text="Git"),
+                        "Yıl": st.column_config.NumberColumn("Yıl", format="%d"),
+                        "Kilometre": st.column_config.NumberColumn("Kilometre", format="%d km"),
+                        "Motor Gücü": st.column_config.NumberColumn("Motor Gücü", format="%d hp"),
+                        "Hasar_Skoru": st.column_config.NumberColumn("Hasar Skoru", format="%d"),
+                        "Tramer": st.column_config.NumberColumn("Tramer", format="%d TL"),
+                        "Fiyat": st.column_config.NumberColumn("Fiyat", format="%d TL"),
+                    }, hide_index=True
+                )
+
+            if senaryo:
+                with st.spinner("Senaryolar hesaplanıyor..."):
+                    senaryolar = what_if(estimator, input_data, load_whatif_cache())
+                if agir_hasar:
+                    senaryolar[['AI_Tahmin', 'AI_Alt', 'AI_Ust']] *= factor
+                km_egrisi, yil_egrisi = curves(senaryolar, input_data)
+
+                st.markdown("#### 📈 Senaryolar")
+                g1, g2 = st.columns(2)
+                g1.caption(f"{yil} model, kilometreye göre")
+                g1.line_chart(km_egrisi)
+                g2.caption(f"{km:,} km, model yılına göre")
+                g2.line_chart(yil_egrisi)
+
+                kayip_ayarlari = {
+                    "Fiyat": st.column_config.NumberColumn("Fiyat", format="%d TL"),
+                    "Kayıp (TL)": st.column_config.NumberColumn("Kayıp", format="%d TL"),
+                    "Kayıp (%)": st.column_config.NumberColumn("Kayıp (%)", format="%.1f"),
+                }
+                t_km, t_yil = st.tabs(["Kilometreye Göre Değer Kaybı", "Yaşa Göre Değer Kaybı"])
+                t_km.dataframe(depreciation_table(km_egrisi, GIRILEN), column_config=kayip_ayarlari)
+                t_yil.dataframe(depreciation_table(yil_egrisi, GIRILEN), column_config=kayip_ayarlari)
+
         except Exception as e:
             st.error(f"Hata: {e}")
 
@@ -224,22 +261,24 @@ with tab2:
         col1, col2 = st.columns(2)
         f_butce = col1.number_input("Max Bütçe", value=1500000, step=50000)
         f_yil = col2.slider("Yıl Aralığı", 2000, CURRENT_YEAR, (2015, CURRENT_YEAR))
-        f_marka = st.selectbox("Marka Filtresi", ["Tümü"] + sorted(df['Marka'].unique()))
+        f_marka = st.selectbox("Marka Filtresi", ["Tümü"] + hierarchy['markalar'])
 
     if st.button("Fırsatları Tara"):
         with st.spinner("Piyasa taranıyor..."):
-            f_df = df.copy()
-            if f_marka != "Tümü": f_df = f_df[f_df['Marka'] == f_marka]
-            f_df = f_df[(f_df['Fiyat'] <= f_butce) & (f_df['Yıl'] >= f_yil[0]) & (f_df['Yıl'] <= f_yil[1])]
-
-            if len(f_df) > 0:
-                processed_data = prepare_input(f_df, model_main)
+            opp_df = load_opportunity_data(data_version, estimator.version)
+            if opp_df is not None:
+                f_df = filter_listings(opp_df, f_marka, f_butce, f_yil)
+            else:
+                st.caption("Önceden hesaplanmış tahmin yok, ilanlar canlı puanlanıyor "
+                           "(`python src/modeling/precompute_predictions.py`).")
+                f_df = filter_listings(df, f_marka, f_butce, f_yil).copy()
+                if len(f_df) > 0:
+                    f_df['AI_Tahmin'] = estimator.predict(f_df, which=('main',))['AI_Tahmin']
 
-                log_preds = model_main.predict(processed_data)
-                f_df['AI_Tahmin'] = np.expm1(log_preds)
+                    f_df['Kazanç'] = f_df['AI_Tahmin'] - f_df['Fiyat']
 
-                f_df['Kazanç'] = f_df['AI_Tahmin'] - f_df['Fiyat']
-                firsatlar = f_df[f_df['Kazanç'] > 20000].sort_values('Kazanç', ascending=False).head(50)
+            if len(f_df) > 0:
+                firsatlar = top_opportunities(f_df)
 
                 if not firsatlar.empty:
                     st.success(f"{len(firsatlar)} adet fırsat bulundu!")
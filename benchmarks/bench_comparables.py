@@ -0,0 +1,82 @@
+"""Emsal ilan aramasını (en yakın k ilan) elle pandas filtresiyle ve comparables dizini ile karşılaştırır.
+
+pandas_filtre: her sorguda veri setini Marka/Seri'ye göre filtreleyip özellikleri hazırlar ve
+               mesafeye göre en yakın k ilanı seçer (dizinden önceki tek yol)
+dizin_tekil  : comparables.ComparablesIndex.nearest, sorgular tek tek (uygulamadaki kullanım)
+dizin_toplu  : aynı sorgular tek çağrıda
+Sentetik veride yalnızca 10 Marka/Seri olduğu için bölümler gerçek veriye göre çok kalabalıktır.
+    python benchmarks/bench_comparables.py --sizes 100000 500000 --queries 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+
+import numpy as np  # noqa: E402
+
+from comparables import EMSAL_SAYISI, ComparablesIndex, listing_features  # noqa: E402
+from synthetic import make_final_listings  # noqa: E402
+
+
+def nearest_pandas(df, query, k):
+    """Tek sorgu için elle filtre: aynı Marka/Seri, z-skorlu özelliklerde Öklid mesafesi."""
+    group = df[(df['Marka'] == query['Marka'].iloc[0]) & (df['Seri'] == query['Seri'].iloc[0])]
+    features = listing_features(group)
+    target = listing_features(query).iloc[0]
+    scale = features.std().replace(0, 1)
+    dist = (((features - target) / scale) ** 2).sum(axis=1)
+    return group.loc[dist.nsmallest(k + 1).index].drop(index=query.index, errors='ignore').head(k)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 500_000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=EMSAL_SAYISI)
+    args = parser.parse_args()
+
+    print(f"{'İlan':>9} | {'Kurulum (sn)':>12} | {'Yükleme (sn)':>12} | {'Yöntem':<13} | "
+          f"{'Sorgu başına (ms)':>17} | {'Sorgu/sn':>9}")
+    for n in args.sizes:
+        df = make_final_listings(n)
+        queries = df.sample(args.queries, random_state=0)
+
+        started = time.perf_counter()
+        index = ComparablesIndex.build(df)
+        build_s = time.perf_counter() - started
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'emsaller.pkl')
+            index.save(path)
+            started = time.perf_counter()
+            index = ComparablesIndex.load(path)
+            load_s = time.perf_counter() - started
+
+        timings = {}
+        started = time.perf_counter()
+        for i in range(len(queries)):
+            nearest_pandas(df, queries.iloc[[i]], args.k)
+        timings['pandas_filtre'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for i in range(len(queries)):
+            index.nearest(queries.iloc[[i]], args.k)
+        timings['dizin_tekil'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = index.nearest(queries, args.k)
+        timings['dizin_toplu'] = time.perf_counter() - started
+        assert len(result) == len(queries) * args.k and np.all(result['Link'].to_numpy() != queries.loc[
+            result['Sorgu'], 'Link'].to_numpy())
+
+        for method, seconds in timings.items():
+            print(f"{n:>9,} | {build_s:>12.2f} | {load_s:>12.2f} | {method:<13} | "
+                  f"{seconds / len(queries) * 1000:>17.2f} | {len(queries) / seconds:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
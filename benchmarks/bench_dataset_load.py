@@ -0,0 +1,88 @@
+"""Uygulamanın veri seti yükleme süresini ve belleğini CSV ve Parquet yolları için karşılaştırır.
+
+Her yükleme ayrı bir süreçte ölçülür (soğuk başlangıç); tepe RSS değerleri birbirini etkilemez.
+    python benchmarks/bench_dataset_load.py --sizes 45000 500000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+
+import pandas as pd  # noqa: E402
+
+import dataset  # noqa: E402
+from bench_utils import peak_rss_mb  # noqa: E402
+from features import CAT_COLS  # noqa: E402
+from synthetic import make_final_listings  # noqa: E402
+
+
+# --- Eski uygulama (app/streamlit_app.py load_data) mantığı, karşılaştırma için ---
+def load_data_legacy(path):
+    df = pd.read_csv(path, low_memory=False)
+    for col in CAT_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype(str)
+            df = df[df[col] != 'nan']
+    return df
+
+
+def measure(mode, csv_path, parquet_path):
+    rss_before = peak_rss_mb()
+
+    started = time.perf_counter()
+    if mode == 'csv':
+        df = load_data_legacy(csv_path)
+    else:
+        df = dataset.load_listings(csv_path, dataset.APP_COLUMNS, parquet_path)
+    elapsed = time.perf_counter() - started
+
+    rss_after = peak_rss_mb()
+    return {
+        'mode': mode,
+        'rows': len(df),
+        'seconds': elapsed,
+        'frame_mb': df.memory_usage(deep=True).sum() / 1e6,
+        'peak_rss_mb': rss_after,
+        'load_rss_delta_mb': rss_after - rss_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[45_000, 500_000])
+    parser.add_argument('--worker', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(*args.worker)))
+        return
+
+    print(f"{'Satır':>10} | {'Yol':<8} | {'Süre (sn)':>10} | {'DataFrame (MB)':>15} | "
+          f"{'Tepe RSS (MB)':>14} | {'Yükleme artışı (MB)':>20}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in args.sizes:
+            csv_path = os.path.join(tmp_dir, f"ilanlar_{n}.csv")
+            parquet_path = os.path.join(tmp_dir, f"ilanlar_{n}.parquet")
+            make_final_listings(n).to_csv(csv_path, index=False, encoding='utf-8-sig')
+            dataset.write_parquet(csv_path, parquet_path)
+
+            results = {}
+            for mode in ['csv', 'parquet']:
+                out = subprocess.run([sys.executable, __file__, '--worker', mode, csv_path, parquet_path],
+                                     capture_output=True, text=True, check=True)
+                r = results[mode] = json.loads(out.stdout)
+                print(f"{n:>10,} | {mode:<8} | {r['seconds']:>10.3f} | {r['frame_mb']:>15.1f} | "
+                      f"{r['peak_rss_mb']:>14.1f} | {r['load_rss_delta_mb']:>20.1f}")
+            print(f"{'':>10} | Parquet: {results['csv']['seconds'] / results['parquet']['seconds']:.1f}x hızlı, "
+                  f"{results['csv']['frame_mb'] / results['parquet']['frame_mb']:.1f}x küçük\n")
+
+
+if __name__ == "__main__":
+    main()
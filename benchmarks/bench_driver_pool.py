@@ -0,0 +1,161 @@
+"""Çalışan başına kendi Chrome'u ile ortak oturum havuzunu sahte bir sürücüyle karşılaştırır.
+
+Sahte sürücü sayfaları local_server'dan gerçekten çeker; açılışı --startup sn sürer, her sayfada
+belleği büyür ve --fail-rate olasılıkla hata verir. Hataların --fatal-ratio kadarı oturumu bozar
+('invalid session id'); kalanı sayfaya özgüdür (zaman aşımı).
+eski  : price_fixer'ın önceki hali; her hatada sürücü kapatılır, --restart-pause sn beklenir, yenisi açılır
+havuz : driver_pool.DriverPool; yalnızca bozulan, sayfa ya da bellek sınırını aşan oturum yenilenir
+    python benchmarks/bench_driver_pool.py --pages 400 --workers 4
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'data_collection'))
+
+from driver_pool import DriverPool  # noqa: E402
+from local_server import start_server  # noqa: E402
+
+
+class FakeDriver:
+    """Selenium sürücüsünün scraper'ların kullandığı kısmını taklit eder."""
+    starts = 0
+    peak_memory_mb = 0.0
+    _lock = threading.Lock()
+
+    def __init__(self, startup, fail_rate, fatal_ratio, memory_per_page, rng):
+        time.sleep(startup)
+        with FakeDriver._lock:
+            FakeDriver.starts += 1
+        self.fail_rate, self.fatal_ratio, self.memory_per_page, self.rng = fail_rate, fatal_ratio, memory_per_page, rng
+        self.memory_mb = 300.0
+        self.alive = True
+        self.page_source = ''
+        self._url = 'about:blank'
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("invalid session id")
+        return self._url
+
+    def get(self, url):
+        if not self.alive:
+            raise RuntimeError("invalid session id")
+        if self.rng.random() < self.fail_rate:
+            if self.rng.random() < self.fatal_ratio:
+                self.alive = False
+                raise RuntimeError("invalid session id")
+            raise TimeoutError("timeout: Timed out receiving message from renderer")
+        with urllib.request.urlopen(url) as response:
+            self.page_source = response.read().decode('utf-8')
+        self._url = url
+        self.memory_mb += self.memory_per_page
+        with FakeDriver._lock:
+            FakeDriver.peak_memory_mb = max(FakeDriver.peak_memory_mb, self.memory_mb)
+
+    def quit(self):
+        self.alive = False
+
+
+def run_legacy(urls, workers, make_driver, restart_pause):
+    """Önceki price_fixer: çalışan başına sürücü, her hatada kapat-bekle-yeniden aç."""
+    queue, failed = iter(urls), []
+    queue_lock, start_lock = threading.Lock(), threading.Lock()
+
+    def worker():
+        with start_lock:
+            driver = make_driver()
+        while True:
+            with queue_lock:
+                url = next(queue, None)
+            if url is None:
+                break
+            try:
+                driver.get(url)
+                driver.page_source
+            except Exception:
+                failed.append(url)
+                driver.quit()
+                time.sleep(restart_pause)
+                with start_lock:
+                    driver = make_driver()
+        driver.quit()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return failed
+
+
+def run_pool(urls, workers, make_driver, max_pages):
+    queue, failed = iter(urls), []
+    queue_lock = threading.Lock()
+
+    with DriverPool(make_driver, workers, name='bench', max_pages=max_pages, max_memory_mb=1000,
+                    memory_probe=lambda d: d.memory_mb) as pool:
+        def worker():
+            while True:
+                with queue_lock:
+                    url = next(queue, None)
+                if url is None:
+                    break
+                try:
+                    with pool.session() as driver:
+                        driver.get(url)
+                        driver.page_source
+                except Exception:
+                    failed.append(url)
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--startup', type=float, default=1.0, help="Sahte sürücünün açılış süresi (sn)")
+    parser.add_argument('--restart-pause', type=float, default=3.0)
+    parser.add_argument('--fail-rate', type=float, default=0.03)
+    parser.add_argument('--fatal-ratio', type=float, default=0.3)
+    parser.add_argument('--memory-per-page', type=float, default=8.0, help="Sayfa başına bellek artışı (MB)")
+    parser.add_argument('--max-pages', type=int, default=50, help="Havuzda oturum başına sayfa sınırı")
+    args = parser.parse_args()
+
+    server, base_url = start_server()
+    urls = [f"{base_url}/ilan/ornek/{27500000 + i % 7}" for i in range(args.pages)]
+
+    print(f"Sayfa: {args.pages} | Çalışan: {args.workers} | Açılış: {args.startup} sn | Hata: %{args.fail_rate * 100:.0f}")
+    print(f"{'Yöntem':<6} | {'Süre (sn)':>9} | {'Sayfa/sn':>8} | {'Açılış':>6} | {'Hatalı':>6} | {'Tepe oturum belleği (MB)':>24}")
+    for name in ['eski', 'havuz']:
+        FakeDriver.starts, FakeDriver.peak_memory_mb = 0, 0.0
+        ids = itertools.count()  # Sürücü başına tohum: sonuçlar tekrarlanabilir
+        make_driver = lambda: FakeDriver(args.startup, args.fail_rate, args.fatal_ratio, args.memory_per_page,
+                                         random.Random(next(ids)))
+        started = time.perf_counter()
+        if name == 'eski':
+            failed = run_legacy(urls, args.workers, make_driver, args.restart_pause)
+        else:
+            failed = run_pool(urls, args.workers, make_driver, args.max_pages)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<6} | {elapsed:>9.1f} | {args.pages / elapsed:>8.1f} | {FakeDriver.starts:>6} | "
+              f"{len(failed):>6} | {FakeDriver.peak_memory_mb:>24.0f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Eski satır satır (.apply) özellik hazırlığını src/modeling/features.py ile karşılaştırır.
+
+Her boyutta önce çıktıların birebir aynı olduğu doğrulanır, sonra süreler ölçülür.
+    python benchmarks/bench_features.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+
+import features  # noqa: E402
+from synthetic import make_final_listings  # noqa: E402
+
+CURRENT_YEAR = features.CURRENT_YEAR
+
+
+# --- Eski uygulama (app/streamlit_app.py) mantığı, karşılaştırma için ---
+def prepare_input_legacy(df_input, model_cols):
+    df_proc = df_input.copy()
+
+    if 'Boyalı Parçalar' in df_proc.columns and df_proc['Boyalı Parçalar'].dtype == 'object':
+        def count_parts(text):
+            if pd.isna(text) or str(text) in ['Yok', 'Belirtilmemiş', 'Orijinal', 'Tamamı orjinal', 'Hatasız',
+                                              'nan']: return 0
+            return len(str(text).split(','))
+
+        def check_part(text, part):
+            if pd.isna(text): return 0
+            return 1 if part.lower() in str(text).lower() else 0
+
+        df_proc['Boyali_Sayisi'] = df_proc['Boyalı Parçalar'].apply(count_parts) + df_proc[
+            'Lokal Boyalı Parçalar'].apply(count_parts)
+        df_proc['Degisen_Sayisi'] = df_proc['Değişen Parçalar'].apply(count_parts)
+
+        df_proc['Kaput_Degisen'] = df_proc['Değişen Parçalar'].apply(lambda x: check_part(x, 'kaput'))
+        df_proc['Tavan_Boyali'] = df_proc['Boyalı Parçalar'].apply(lambda x: check_part(x, 'tavan'))
+
+    if 'Yıl' in df_proc.columns:
+        df_proc['Yas'] = CURRENT_YEAR - df_proc['Yıl']
+        df_proc['Yas'] = df_proc['Yas'].replace(0, 1)
+
+    if 'Kilometre' in df_proc.columns and 'Yas' in df_proc.columns:
+        df_proc['Yillik_KM'] = df_proc['Kilometre'] / df_proc['Yas']
+
+    if 'Boyali_Sayisi' in df_proc.columns and 'Degisen_Sayisi' in df_proc.columns:
+        df_proc['Hasar_Skoru'] = (df_proc['Boyali_Sayisi'] * 1) + (df_proc['Degisen_Sayisi'] * 2)
+
+    for col in ['Motor Hacmi', 'Motor Gücü', 'Yakıt Deposu', 'Ort. Yakıt Tüketimi']:
+        if col in df_proc.columns and df_proc[col].dtype == 'object':
+            df_proc[col] = pd.to_numeric(
+                df_proc[col].astype(str).str.replace(' cc', '').str.replace(' hp', '').str.replace(' lt', '')
+                .str.replace('.', '').str.replace(',', '.'), errors='coerce').fillna(0).astype(int)
+
+    if 'Tramer' in df_proc.columns and df_proc['Tramer'].dtype == 'object':
+        df_proc['Tramer'] = pd.to_numeric(df_proc['Tramer'].astype(str).str.replace(' TL', '').str.replace('.', ''),
+                                          errors='coerce').fillna(0).astype(int)
+
+    for col in model_cols:
+        if col not in df_proc.columns:
+            if col in ['Marka', 'Seri', 'Model', 'Renk', 'Kimden', 'Vites Tipi', 'Yakıt Tipi', 'Kasa Tipi', 'Çekiş']:
+                df_proc[col] = "Bilinmiyor"
+            else:
+                df_proc[col] = 0
+
+    return df_proc[model_cols]
+
+
+# --- Eski eğitim notebook'u (02_model_egitimi) mantığı, karşılaştırma için ---
+def build_training_frame_legacy(df):
+    df = df.copy()
+
+    def clean_text_to_numeric(text, remove_str):
+        if pd.isna(text): return np.nan
+        clean_text = str(text).replace(remove_str, '').replace('.', '').replace(',', '.')
+        try:
+            return float(clean_text)
+        except:
+            return np.nan
+
+    df['Motor Hacmi'] = df['Motor Hacmi'].apply(lambda x: clean_text_to_numeric(x, ' cc'))
+    df['Motor Gücü'] = df['Motor Gücü'].apply(lambda x: clean_text_to_numeric(x, ' hp'))
+    df['Tramer'] = df['Tramer'].apply(lambda x: clean_text_to_numeric(x, ' TL')).fillna(0)
+
+    for col in ['Motor Hacmi', 'Motor Gücü']:
+        df[col] = df[col].fillna(df.groupby('Model')[col].transform('median')).fillna(0)
+
+    def remove_model_outliers(group):
+        if len(group) < 5: return group
+        Q1 = group['Fiyat'].quantile(0.10)
+        Q3 = group['Fiyat'].quantile(0.90)
+        return group[(group['Fiyat'] >= Q1) & (group['Fiyat'] <= Q3)]
+
+    # pandas 3'te apply gruplama sütununu düşürdüğü için Model sütunu ayrıca korunur
+    parts = [remove_model_outliers(g) for _, g in df.groupby('Model')]
+    df = pd.concat(parts) if parts else df.iloc[:0]
+
+    df['Yas'] = features.TRAIN_CURRENT_YEAR - df['Yıl']
+    df['Yas'] = df['Yas'].replace(0, 1)
+    df['Yillik_KM'] = df['Kilometre'] / df['Yas']
+
+    def count_parts(text):
+        if pd.isna(text) or str(text) in ['Yok', 'Belirtilmemiş', 'Orijinal', 'Tamamı orjinal', 'Hatasız', 'nan']: return 0
+        return len(str(text).split(','))
+
+    df['Boyali_Sayisi'] = df['Boyalı Parçalar'].apply(count_parts) + df['Lokal Boyalı Parçalar'].apply(count_parts)
+    df['Degisen_Sayisi'] = df['Değişen Parçalar'].apply(count_parts)
+    df['Hasar_Skoru'] = (df['Boyali_Sayisi'] * 1) + (df['Degisen_Sayisi'] * 2)
+
+    for col in features.CAT_COLS:
+        if col in df.columns:
+            df[col] = df[col].fillna("Bilinmiyor").astype(str)
+
+    X = df.drop(columns=['Fiyat'] + [c for c in features.TRAIN_DROP_COLS if c in df.columns], errors='ignore')
+    return X, df['Fiyat']
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'Satır':>10} | {'Adım':<16} | {'Eski (sn)':>10} | {'Yeni (sn)':>10} | {'Hızlanma':>9}")
+    for n in args.sizes:
+        # CSV'den okunmuş gibi metin sütunları object dtype olsun (eski dtype == 'object' kontrolleri için)
+        df = make_final_listings(n)
+        df = df.astype({c: object for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])})
+        feature_names = list(features.build_training_frame(df.head(1000))[0].columns)
+
+        old, t_old = timed(prepare_input_legacy, df, feature_names)
+        new, t_new = timed(features.prepare_input, df, feature_names, CURRENT_YEAR)
+        pd.testing.assert_frame_equal(old, new, check_dtype=False)
+        print(f"{n:>10,} | {'prepare_input':<16} | {t_old:>10.3f} | {t_new:>10.3f} | {t_old / t_new:>8.1f}x")
+
+        (x_old, y_old), t_old = timed(build_training_frame_legacy, df)
+        (x_new, y_new), t_new = timed(features.build_training_frame, df)
+        pd.testing.assert_frame_equal(x_old, x_new, check_dtype=False)
+        pd.testing.assert_series_equal(y_old, y_new)
+        print(f"{n:>10,} | {'eğitim verisi':<16} | {t_old:>10.3f} | {t_new:>10.3f} | {t_old / t_new:>8.1f}x")
+
+    print("\nTüm boyutlarda eski ve yeni çıktılar birebir aynı.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""HTML çıkarım backend'lerini kaydedilmiş ilan/liste sayfaları üzerinde karşılaştırır.
+
+Her backend ayrı bir süreçte ölçülür; böylece tepe bellek (RSS) değerleri birbirini etkilemez.
+Ölçümden önce her backend'in scraper'ların kullandığı tüm çıkarım fonksiyonlarında (parse_listing,
+parse_price, parse_list_page, parse_list_rows) bs4 ile aynı sonucu verdiği doğrulanır.
+    python benchmarks/bench_html_parsers.py --rounds 50
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+SAMPLE_PAGES_DIR = os.path.join(CURRENT_DIR, 'sample_pages')
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'data_collection'))
+
+import html_extract  # noqa: E402
+from bench_utils import peak_rss_mb  # noqa: E402
+
+ILAN_LINKI = 'https://www.arabam.com/ilan/ornek/1'
+LISTE_LINKI = 'https://www.arabam.com/ikinci-el/otomobil/ornek?page=1'
+
+# Sayfa türüne göre eşdeğerliği denetlenen çıkarım fonksiyonları
+ESDEGERLIK = {
+    'ilan': {
+        'parse_listing': lambda html, backend: html_extract.parse_listing(html, ILAN_LINKI, backend),
+        'parse_price': lambda html, backend: html_extract.parse_price(html, backend),
+    },
+    'liste': {
+        'parse_list_page': lambda html, backend: html_extract.parse_list_page(html, LISTE_LINKI, backend),
+        'parse_list_rows': lambda html, backend: html_extract.parse_list_rows(html, LISTE_LINKI, backend),
+    },
+}
+
+
+def load_corpus(pages_dir=SAMPLE_PAGES_DIR):
+    """(tür, dosya_adı, html) listesi döner. tür: 'ilan' veya 'liste'."""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        name = os.path.basename(path)
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        corpus.append(('ilan' if name.startswith('ilan_') else 'liste', name, html))
+    return corpus
+
+
+def extract(kind, html, backend):
+    if kind == 'ilan':
+        return html_extract.parse_listing(html, ILAN_LINKI, backend)
+    return html_extract.parse_list_page(html, LISTE_LINKI, backend)
+
+
+def measure(backend, rounds):
+    corpus = load_corpus()
+    html_extract.get_backend(backend)
+    rss_before = peak_rss_mb()
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for kind, _, html in corpus:
+            extract(kind, html, backend)
+    elapsed = time.perf_counter() - started
+
+    rss_after = peak_rss_mb()
+    return {
+        'backend': backend,
+        'pages': rounds * len(corpus),
+        'pages_per_sec': rounds * len(corpus) / elapsed,
+        'peak_rss_mb': rss_after,
+        'parse_rss_delta_mb': rss_after - rss_before,
+    }
+
+
+def check_identical(backends):
+    """Her backend'in her çıkarım fonksiyonunda bs4 ile birebir aynı sonucu ürettiğini doğrular.
+
+    [(backend, dosya_adı, fonksiyon), ...] olarak farkları döner.
+    """
+    mismatches = []
+    for kind, name, html in load_corpus():
+        for func_name, func in ESDEGERLIK[kind].items():
+            expected = func(html, 'bs4')
+            for backend in backends:
+                if func(html, backend) != expected:
+                    mismatches.append((backend, name, func_name))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.rounds)))
+        return
+
+    backends = html_extract.available_backends()
+    corpus = load_corpus()
+    print(f"Derlem: {sum(k == 'ilan' for k, _, _ in corpus)} ilan + {sum(k == 'liste' for k, _, _ in corpus)} "
+          f"liste sayfası | Tur: {args.rounds} | Backend'ler: {', '.join(backends)}")
+
+    mismatches = check_identical(backends)
+    for backend, name, func_name in mismatches:
+        print(f"[UYARI] {backend} backend'i {name} için {func_name}'da bs4'ten farklı sonuç üretti!")
+    if not mismatches:
+        print(f"Tüm backend'ler bs4 ile birebir aynı alanları üretti "
+              f"({', '.join(f for funcs in ESDEGERLIK.values() for f in funcs)}).")
+
+    print(f"\n{'Backend':<12}{'Sayfa/sn':>12}{'Tepe RSS (MB)':>16}{'Ayrıştırma artışı (MB)':>26}")
+    baseline = None
+    for backend in backends:
+        out = subprocess.run([sys.executable, __file__, '--worker', backend, '--rounds', str(args.rounds)],
+                             capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout)
+        baseline = baseline or r['pages_per_sec']
+        print(f"{backend:<12}{r['pages_per_sec']:>12.1f}{r['peak_rss_mb']:>16.1f}{r['parse_rss_delta_mb']:>26.1f}"
+              f"   ({r['pages_per_sec'] / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Yeniden taramada detay sayfası çekme sayısını liste özetiyle ve özetsiz karşılaştırır.
+
+Sentetik bir marka için liste sayfaları üretilir (örnek sayfalarla aynı satır yapısı). İlk tarama
+tüm ilanların detayını çeker. İkinci taramadan önce ilanların --removed oranı kalkar, --new oranı
+kadar yeni ilan gelir, --changed oranının fiyatı ya da km'si değişir.
+tam       : yeniden taramada bütün ilanların detayı yeniden çekilir (değişiklikleri yakalamanın tek yolu)
+yalnız_yeni: eski LinkWriter; yalnızca yeni linkler kuyruğa girer, değişen ilanlar eskimiş kalır
+artımlı   : collect_links.LinkWriter.write_rows; yeni ve fiyatı/km'si değişen ilanlar kuyruğa girer
+    python benchmarks/bench_incremental_crawl.py --listings 20000 --changed 0.05
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'data_collection'))
+
+from collect_links import LinkWriter  # noqa: E402
+from crawl_state import CrawlState, PENDING  # noqa: E402
+from html_extract import parse_list_page, parse_list_rows  # noqa: E402
+from listing_index import listing_id  # noqa: E402
+
+BRAND_URL = 'https://www.arabam.com/ikinci-el/otomobil/ornek'
+SAYFA_BASINA_ILAN = 20
+
+
+def _nokta(n):
+    return f"{n:,}".replace(',', '.')
+
+
+def make_listings(count, rng, start_id=27500000):
+    return {start_id + i: {'Fiyat': rng.randrange(400, 5000) * 1000, 'Kilometre': rng.randrange(0, 300) * 1000,
+                           'Yıl': rng.randrange(2005, 2025)} for i in range(count)}
+
+
+def render_page(items, page, last_page):
+    """Sitenin liste sayfası yapısında bir sayfa üretir."""
+    satirlar = []
+    for ilan_no, ilan in items:
+        href = f"/ilan/galeriden-satilik-ornek/temiz-arac/{ilan_no}"
+        hucre = lambda icerik, cls='listing-text pl8 pr8 tac pr': (
+            f'<td class="{cls}"><div class="fade-out-content-wrapper"><a href="{href}">{icerik}</a></div></td>')
+        satirlar.append(
+            f'<tr class="listing-list-item should-hover bg-white" id="listing{ilan_no}">'
+            f'<td class="listing-image"><img src="/img/{ilan_no}/0.jpg" alt=""></td>'
+            f'<td class="listing-modelname pr"><div class="listing-text-new"><a class="link-overlay" href="{href}">'
+            f'Örnek Model</a></div></td>'
+            f'<td class="horizontal-half-padder-minus pr"><div class="listing-title-lines"><a href="{href}">'
+            f'Temiz araç</a></div></td>'
+            + hucre(ilan['Yıl']) + hucre(_nokta(ilan['Kilometre'])) + hucre('Beyaz')
+            + hucre(f'<span class="db no-wrap listing-price">{_nokta(ilan["Fiyat"])} TL</span>', 'pl8 pr8 tac pr')
+            + hucre('15 Kasım 2025', 'listing-text tac pr') + hucre('Antalya Muratpaşa', 'listing-text tac pr')
+            + '</tr>')
+    sayfalama = (f'<div class="pagination-wrapper"><ul class="pagination"><li class="active">'
+                 f'<a href="{BRAND_URL}?page={page}">{page}</a></li>'
+                 f'<li><a title="Son Sayfa" href="{BRAND_URL}?page={last_page}">&raquo;</a></li></ul></div>')
+    return ('<html><body><table class="listing-table"><tbody>' + ''.join(satirlar)
+            + '</tbody></table>' + sayfalama + '</body></html>')
+
+
+def render_site(listings):
+    items = list(listings.items())
+    last_page = max(1, -(-len(items) // SAYFA_BASINA_ILAN))
+    return {f"{BRAND_URL}?page={p}": render_page(items[(p - 1) * SAYFA_BASINA_ILAN:p * SAYFA_BASINA_ILAN], p, last_page)
+            for p in range(1, last_page + 1)}
+
+
+def scrape_pending(state, listings):
+    """scrape_details'in yerine: bekleyen her ilanın 'detay sayfasını' gerçek değerlerle kaydeder."""
+    links = state.claim('detay', None)
+    for link in links:
+        ilan = listings.get(int(link.rsplit('/', 1)[-1]))
+        if ilan is None:
+            state.mark_failed('detay', link, 'ilan kaldırılmış')
+            continue
+        state.mark_done('detay', link, {'Link': link, 'Fiyat': f"{_nokta(ilan['Fiyat'])} TL",
+                                        'Kilometre': f"{_nokta(ilan['Kilometre'])} km", 'Yıl': str(ilan['Yıl'])})
+    return len(links)
+
+
+def crawl(state, pages, mode):
+    """Liste sayfalarını LinkWriter'a verir; (görülen ilanların dizini, ayrıştırma + kuyruk süresi) döner."""
+    writer = LinkWriter(io.StringIO(), state, incremental=(mode == 'artımlı'))
+    started = time.perf_counter()
+    for url, html in pages.items():
+        if mode == 'artımlı':
+            rows, _ = parse_list_rows(html, url)
+            writer.write_rows(rows)
+        else:
+            links, _ = parse_list_page(html, url)
+            writer.write(links)
+    return writer.index, time.perf_counter() - started
+
+
+def stale_count(state, listings):
+    """Kayıtlı detay verisi sitedeki güncel fiyat/km ile uyuşmayan ilan sayısı."""
+    stale = 0
+    for link, ilan_data in state.iter_payloads('detay'):
+        ilan = listings.get(int(link.rsplit('/', 1)[-1]))
+        if ilan and ilan_data['Fiyat'] != f"{_nokta(ilan['Fiyat'])} TL":
+            stale += 1
+        elif ilan and ilan_data['Kilometre'] != f"{_nokta(ilan['Kilometre'])} km":
+            stale += 1
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--listings', type=int, default=20000)
+    parser.add_argument('--changed', type=float, default=0.05, help="Fiyatı ya da km'si değişen ilan oranı")
+    parser.add_argument('--new', type=float, default=0.03, help="Yeni gelen ilan oranı")
+    parser.add_argument('--removed', type=float, default=0.03, help="Kalkan ilan oranı")
+    parser.add_argument('--detail-seconds', type=float, default=0.5,
+                        help="Tahmini süre için detay sayfası başına saniye")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ilk = make_listings(args.listings, rng)
+    ikinci = {ilan_no: dict(ilan) for ilan_no, ilan in ilk.items() if rng.random() >= args.removed}
+    for ilan_no in rng.sample(sorted(ikinci), int(len(ikinci) * args.changed)):
+        alan = rng.choice(['Fiyat', 'Kilometre'])
+        ikinci[ilan_no][alan] += rng.choice([-1, 1]) * rng.randrange(1, 50) * 1000 if alan == 'Fiyat' else 5000
+    ikinci.update(make_listings(int(args.listings * args.new), rng, start_id=28000000))
+    ilk_sayfalar, ikinci_sayfalar = render_site(ilk), render_site(ikinci)
+
+    print(f"İlan: {args.listings} -> {len(ikinci)} | Liste sayfası: {len(ikinci_sayfalar)} | "
+          f"Değişen: %{args.changed * 100:g}, yeni: %{args.new * 100:g}, kalkan: %{args.removed * 100:g}")
+    print(f"{'Yöntem':<11} | {'Detay çekimi':>12} | {'Tahmini süre (dk)':>17} | {'Eskimiş kayıt':>13} | "
+          f"{'Liste işleme (sn)':>17}")
+    for mode in ['tam', 'yalnız_yeni', 'artımlı']:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state = CrawlState(os.path.join(tmp_dir, 'durum.sqlite'))
+            crawl(state, ilk_sayfalar, mode)
+            scrape_pending(state, ilk)
+
+            gorulen, liste_suresi = crawl(state, ikinci_sayfalar, mode)
+            if mode == 'tam':
+                state.requeue('detay', [link for link in state.iter_urls('detay') if listing_id(link) in gorulen])
+            cekilen = state.counts('detay').get(PENDING, 0)
+            scrape_pending(state, ikinci)
+            eskimis = stale_count(state, ikinci)
+            state.close()
+
+        print(f"{mode:<11} | {cekilen:>12} | {cekilen * args.detail_seconds / 60:>17.1f} | {eskimis:>13} | "
+              f"{liste_suresi:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
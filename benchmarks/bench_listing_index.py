@@ -0,0 +1,122 @@
+"""Link tekilleştirmesi için URL kümesi, tamsayı kümesi, sıralı dizi ve ilan dizinini karşılaştırır.
+
+Her yöntem ayrı bir süreçte N ilan numarası ekler (--spread x N aralığından rastgele, tekrarsız),
+ardından yarısı kayıtlı yarısı yeni N sorgu yapar. Bellek, yapı kurulduktan sonraki RSS artışıdır.
+url_kumesi   : tam URL'lerden oluşan set (scraper'ların eski hali)
+int_kumesi   : ilan numaralarından oluşan set
+sirali_dizi  : numpy sıralı int64 dizi + searchsorted (yalnızca toplu; tek tek ekleme O(n))
+dizin        : listing_index.ListingIndex, URL'den numara çıkararak 1000'lik partilerle ekleme (filter_new)
+dizin_toplu  : listing_index.ListingIndex.add_many / contains_many
+    python benchmarks/bench_listing_index.py --sizes 1000000 10000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'data_collection'))
+
+import numpy as np  # noqa: E402
+
+from bench_utils import current_rss_mb  # noqa: E402
+from listing_index import ListingIndex  # noqa: E402
+
+URL_KALIBI = "https://www.arabam.com/ilan/galeriden-satilik-renault-clio/temiz-arac/{}"
+ILK_NUMARA = 27_000_000
+METHODS = ['url_kumesi', 'int_kumesi', 'sirali_dizi', 'dizin', 'dizin_toplu']
+
+
+def make_ids(n, spread, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = ILK_NUMARA + rng.choice(int(n * spread), size=n, replace=False)
+    yeni = ILK_NUMARA + int(n * spread) + rng.choice(n, size=n // 2, replace=False)
+    queries = np.concatenate([rng.choice(ids, size=n - n // 2, replace=False), yeni])
+    rng.shuffle(queries)
+    return ids, queries
+
+
+def measure(method, n, spread):
+    ids, queries = make_ids(n, spread)
+    id_list, query_list = ids.tolist(), queries.tolist()
+    extra = {}
+    base_rss = current_rss_mb()
+
+    started = time.perf_counter()
+    if method == 'url_kumesi':
+        s = set()
+        for i in id_list:
+            s.add(URL_KALIBI.format(i))
+    elif method == 'int_kumesi':
+        s = set(id_list)
+    elif method == 'sirali_dizi':
+        s = np.unique(ids)
+    elif method == 'dizin':
+        s = ListingIndex()
+        for start in range(0, n, 1000):
+            s.filter_new([URL_KALIBI.format(i) for i in id_list[start:start + 1000]])
+    else:
+        s = ListingIndex()
+        s.add_many(ids)
+    built = time.perf_counter()
+    rss = current_rss_mb() - base_rss
+
+    if method == 'url_kumesi':
+        hits = sum(URL_KALIBI.format(i) in s for i in query_list)
+    elif method == 'int_kumesi':
+        hits = sum(i in s for i in query_list)
+    elif method == 'sirali_dizi':
+        pos = np.minimum(np.searchsorted(s, queries), len(s) - 1)
+        hits = int((s[pos] == queries).sum())
+    elif method == 'dizin':
+        hits = sum(i in s for i in query_list)
+    else:
+        hits = int(s.contains_many(queries).sum())
+    finished = time.perf_counter()
+
+    if isinstance(s, ListingIndex):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'dizin.idx')
+            save_started = time.perf_counter()
+            s.save(path)
+            load_started = time.perf_counter()
+            ListingIndex.load(path)
+            extra = {'disk_mb': os.path.getsize(path) / 2 ** 20, 'save_s': load_started - save_started,
+                     'load_s': time.perf_counter() - load_started}
+
+    assert hits == n - n // 2
+    return {'build_s': built - started, 'query_s': finished - built, 'rss_mb': rss, **extra}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--spread', type=float, default=1.5, help="Numaralar N x spread aralığından seçilir")
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=METHODS)
+    parser.add_argument('--worker', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        method, n, spread = args.worker
+        print(json.dumps(measure(method, int(n), float(spread))))
+        return
+
+    print(f"{'İlan':>11} | {'Yöntem':<11} | {'Ekleme (bin/sn)':>15} | {'Sorgu (bin/sn)':>14} | {'Bellek (MB)':>11} | "
+          f"{'Disk (MB)':>9} | {'Yükleme (sn)':>12}")
+    for n in args.sizes:
+        for method in args.methods:
+            out = subprocess.run([sys.executable, __file__, '--worker', method, str(n), str(args.spread)],
+                                 capture_output=True, text=True, check=True)
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            disk = f"{r['disk_mb']:.1f}" if 'disk_mb' in r else '-'
+            load = f"{r['load_s']:.3f}" if 'load_s' in r else '-'
+            print(f"{n:>11,} | {method:<11} | {n / r['build_s'] / 1000:>15,.0f} | {n / r['query_s'] / 1000:>14,.0f} | "
+                  f"{r['rss_mb']:>11.1f} | {disk:>9} | {load:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Uygulama açılışında model yüklemeyi karşılaştırır: pickle (joblib), CatBoost .cbm ve tembel .cbm.
+
+"İlk ekran" süresi, tahmin motorunun hazır olduğu ana kadar geçen süredir (eski uygulama
+sayfayı çizmeden önce üç modeli de yüklüyordu). "İlk değerleme" buna ilk üç sınırlı tahmini ekler.
+Her yol ayrı bir süreçte ölçülür.
+    python benchmarks/bench_model_startup.py --models-dir models
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+
+from bench_utils import peak_rss_mb  # noqa: E402
+
+MODES = {
+    'pkl': {'format': 'pkl', 'lazy': False},
+    'cbm': {'format': 'auto', 'lazy': False},
+    'cbm_tembel': {'format': 'auto', 'lazy': True},
+}
+
+
+def measure(mode, models_dir):
+    started = time.perf_counter()
+    import catboost  # noqa: F401  (tüm yollarda ortak; yükleme süresinden ayrı tutulur)
+    import model_store
+    from predict import PriceEstimator
+    from features import TRAIN_CURRENT_YEAR
+    import pandas as pd
+    imported = time.perf_counter()
+
+    model_store.MODEL_FORMATI = MODES[mode]['format']
+    estimator = PriceEstimator.load(models_dir, TRAIN_CURRENT_YEAR, lazy=MODES[mode]['lazy'])
+    ready = time.perf_counter()
+    rss_ready = peak_rss_mb()
+
+    row = pd.DataFrame([{'Marka': 'Renault', 'Seri': 'Clio', 'Model': '1.5 dCi Joy', 'Yıl': 2018,
+                         'Kilometre': 90_000, 'Vites Tipi': 'Manuel', 'Yakıt Tipi': 'Dizel'}])
+    estimator.predict(row)
+    valued = time.perf_counter()
+
+    return {
+        'mode': mode,
+        'import_s': imported - started,
+        'first_render_s': ready - started,
+        'first_valuation_s': valued - started,
+        'rss_ready_mb': rss_ready,
+        'rss_peak_mb': peak_rss_mb(),
+    }
+
+
+def prepare_models(models_dir, rows, iterations):
+    """models_dir'de pickle modeller yoksa sentetik veriyle küçük modeller eğitir; .cbm'leri üretir."""
+    import model_store
+    import train
+    from features import build_training_frame
+    from synthetic import make_final_listings
+    import numpy as np
+
+    if not all(os.path.exists(p) for p in model_store.model_paths(models_dir).values()):
+        X, y = build_training_frame(make_final_listings(rows))
+        params = {**train.COMMON_PARAMS, 'iterations': iterations, 'verbose': 0}
+        models = {name: train._fit(loss, X, np.log1p(y), X, np.log1p(y), params)
+                  for name, loss in train.THREE_LOSSES.items()}
+        train.save_three(models, models_dir)
+    model_store.export_native(models_dir, 'three')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--models-dir', default=None, help="Varsayılan: geçici klasörde eğitilen modeller")
+    parser.add_argument('--rows', type=int, default=30_000)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--worker', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(*args.worker)))
+        return
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        models_dir = tmp_dir
+        if args.models_dir:
+            # Gerçek modeller kopyalanır; .cbm ve manifest geçici klasöre yazılır
+            for file_name in os.listdir(args.models_dir):
+                if file_name.endswith('.pkl'):
+                    shutil.copy2(os.path.join(args.models_dir, file_name), tmp_dir)
+        prepare_models(models_dir, args.rows, args.iterations)
+
+        print(f"{'Yol':<12}{'İçe aktarma (sn)':>18}{'Model yükleme (sn)':>20}{'İlk ekran (sn)':>16}"
+              f"{'İlk değerleme (sn)':>20}{'RSS hazır (MB)':>16}{'Tepe RSS (MB)':>15}")
+        for mode in MODES:
+            runs = []
+            for _ in range(args.repeats):
+                out = subprocess.run([sys.executable, __file__, '--worker', mode, models_dir],
+                                     capture_output=True, text=True, check=True)
+                runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+            r = min(runs, key=lambda run: run['first_render_s'])
+            print(f"{mode:<12}{r['import_s']:>18.3f}{r['first_render_s'] - r['import_s']:>20.3f}"
+                  f"{r['first_render_s']:>16.3f}{r['first_valuation_s']:>20.3f}"
+                  f"{r['rss_ready_mb']:>16.1f}{r['rss_peak_mb']:>15.1f}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Üç ayrı CatBoost modelini (MAE + Quantile 0.10 + Quantile 0.90) tek bir MultiQuantile
+modeliyle karşılaştırır: eğitim süresi, model boyutu, yükleme süresi, tahmin gecikmesi ve doğruluk.
+    python benchmarks/bench_multi_quantile.py --rows 50000 --iterations 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+
+import train  # noqa: E402
+from features import TRAIN_CURRENT_YEAR, build_training_frame  # noqa: E402
+from model_store import MODEL_FILES, MULTI_MODEL_FILE  # noqa: E402
+from predict import PriceEstimator  # noqa: E402
+from sklearn.model_selection import train_test_split  # noqa: E402
+from synthetic import make_final_listings  # noqa: E402
+
+
+def pinball(y_true, y_pred, alpha):
+    diff = y_true - y_pred
+    return float(np.mean(np.maximum(alpha * diff, (alpha - 1) * diff)))
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def latency_ms(estimator, rows, repeats):
+    times = []
+    for i in range(repeats):
+        row = rows.iloc[[i % len(rows)]]
+        started = time.perf_counter()
+        estimator.predict(row)
+        times.append((time.perf_counter() - started) * 1000)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=300, help="Tek satır gecikmesi için tekrar sayısı")
+    args = parser.parse_args()
+
+    df = make_final_listings(args.rows)
+    X, y = build_training_frame(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, np.log1p(y), test_size=0.2, random_state=42)
+    params = {**train.COMMON_PARAMS, 'iterations': args.iterations, 'verbose': 0}
+    print(f"Eğitim: {len(X_train):,} satır | Test: {len(X_test):,} satır | İterasyon: {args.iterations}\n")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as models_dir:
+        three, t_three = timed(train.train_three, X_train, y_train, X_test, y_test, params)
+        train.save_three(three, models_dir)
+        multi, t_multi = timed(train.train_multi, X_train, y_train, X_test, y_test, params)
+        train.save_multi(multi, models_dir)
+
+        sizes = {
+            'three': sum(os.path.getsize(os.path.join(models_dir, f)) for f in MODEL_FILES.values()),
+            'multi': os.path.getsize(os.path.join(models_dir, MULTI_MODEL_FILE)),
+        }
+        for kind, t_train in [('three', t_three), ('multi', t_multi)]:
+            estimator, t_load = timed(PriceEstimator.load, models_dir, TRAIN_CURRENT_YEAR, kind)
+            preds, t_batch = timed(estimator.predict, X_test)
+            p50, p99 = latency_ms(estimator, X_test, args.repeats)
+
+            log_main, log_low, log_high = (np.log1p(preds[c]) for c in ('AI_Tahmin', 'AI_Alt', 'AI_Ust'))
+            metrics = train.evaluate(log_main, log_low, log_high, y_test)
+            results[kind] = {
+                'train_s': t_train, 'size_mb': sizes[kind] / 1e6, 'load_s': t_load,
+                'p50_ms': p50, 'p99_ms': p99, 'batch_rows_s': len(X_test) / t_batch,
+                'mae': metrics['mae'], 'r2': metrics['r2'], 'kapsama': metrics['kapsama'],
+                'pinball_low': pinball(y_test.values, log_low.values, 0.10),
+                'pinball_high': pinball(y_test.values, log_high.values, 0.90),
+            }
+
+    rows = [
+        ('Eğitim süresi (sn)', 'train_s', '{:.1f}'),
+        ('Model boyutu (MB)', 'size_mb', '{:.2f}'),
+        ('Yükleme süresi (sn)', 'load_s', '{:.3f}'),
+        ('Tek satır p50 (ms)', 'p50_ms', '{:.2f}'),
+        ('Tek satır p99 (ms)', 'p99_ms', '{:.2f}'),
+        ('Toplu tahmin (satır/sn)', 'batch_rows_s', '{:,.0f}'),
+        ('MAE (TL)', 'mae', '{:,.0f}'),
+        ('R²', 'r2', '{:.4f}'),
+        ('Alt-Üst kapsama', 'kapsama', '{:.3f}'),
+        ('Pinball 0.10 (log)', 'pinball_low', '{:.4f}'),
+        ('Pinball 0.90 (log)', 'pinball_high', '{:.4f}'),
+    ]
+    print(f"{'Ölçüm':<26}{'Üç model':>14}{'MultiQuantile':>16}")
+    for label, key, fmt in rows:
+        print(f"{label:<26}{fmt.format(results['three'][key]):>14}{fmt.format(results['multi'][key]):>16}")
+
+
+if __name__ == "__main__":
+    main()
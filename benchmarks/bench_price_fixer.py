@@ -0,0 +1,193 @@
+"""price_fixer: sabit parçalı/iterrows yaklaşımı ile ortak kuyruk/vektörel birleştirmeyi karşılaştırır.
+
+Üç ölçüm de gerçek kodu çalıştırır:
+  [CSV yükleme]  eski: her çalışan CSV'yi baştan okur | yeni: price_fixer.main'deki gibi bir okuma +
+                 eksik linklerin durum deposuna eklenmesi
+  [Birleştirme]  eski: iterrows | yeni: durum deposundan sonuçları okuma + price_fixer.merge_prices
+  [İş dağıtımı]  eski: her çalışan kendi sabit parçasını kendi tarayıcısıyla işler | yeni: gerçek
+                 get_price_worker iş parçacıkları, CrawlState kuyruğu ve DriverPool. Tarayıcılar sahte
+                 sürücülerdir: sayfa süresi uzun kuyruklu dağılımdan gelir, tarayıcıların hızları
+                 farklıdır, süreler --time-scale ile kısaltılır (tahmini gerçek süre = ölçülen / time-scale).
+    python benchmarks/bench_price_fixer.py --rows 100000 --jobs 2000
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'data_collection'))
+
+from crawl_state import CrawlState, DONE, PRICE_MISSING  # noqa: E402
+from driver_pool import DriverPool  # noqa: E402
+from html_extract import parse_price  # noqa: E402
+from listing_index import open_stage_index  # noqa: E402
+from price_fixer import get_price_worker, merge_prices  # noqa: E402
+from synthetic import make_raw_listings  # noqa: E402
+from throttle import Throttle  # noqa: E402
+
+ZAMAN_ASIMI = 23.0  # sn; zaman aşımına düşen sayfanın ek maliyeti
+FIYAT_SAYFASI = '<html><body><div class="product-price">1.250.000 TL</div></body></html>'
+
+
+def merge_prices_legacy(df, df_temp):
+    """Eski price_fixer birleştirmesi (karşılaştırma için)."""
+    for _, row in df_temp.iterrows():
+        orj_idx = int(row['Index'])
+        yeni_fiyat = row['Fiyat']
+        if pd.notna(yeni_fiyat) and yeni_fiyat != "Hata":
+            df.at[orj_idx, 'Fiyat'] = yeni_fiyat
+
+
+class StubDriver:
+    """Sayfa başına önceden belirlenmiş süre kadar bekleyen sahte tarayıcı."""
+
+    def __init__(self, speed, durations, scale, startup):
+        time.sleep(startup * scale)
+        self.speed, self.durations, self.scale = speed, durations, scale
+        self.current_url = 'about:blank'
+        self.page_source = ''
+
+    def get(self, url):
+        time.sleep(self.durations[url] * self.speed * self.scale)
+        self.current_url = url
+        self.page_source = FIYAT_SAYFASI
+
+    def quit(self):
+        pass
+
+
+def run_fixed_chunks(links, durations, speeds, scale, startup, stagger):
+    """Eski düzen: çalışan w, w * stagger sn bekleyip kendi tarayıcısını açar ve kendi parçasını işler."""
+    workers = len(speeds)
+    chunk_size = -(-len(links) // workers)
+
+    def worker(w):
+        time.sleep(w * stagger * scale)
+        driver = StubDriver(speeds[w], durations, scale, startup)
+        for link in links[w * chunk_size:(w + 1) * chunk_size]:
+            driver.get(link)
+            parse_price(driver.page_source)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started
+
+
+def run_shared_queue(links, durations, speeds, scale, startup, state_path):
+    """Yeni düzen: price_fixer.main'in çalıştırdığı get_price_worker'lar, ortak kuyruk ve oturum havuzu."""
+    state = CrawlState(state_path)
+    state.add('fiyat', links)
+    speed_iter = itertools.cycle(speeds)  # Havuz bir tarayıcıyı yenilerse hız sırası korunur
+    workers = len(speeds)
+    throttle = Throttle(name='bench_price_fixer', max_concurrency=workers, start_delay=0.0)
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with DriverPool(lambda: StubDriver(next(speed_iter), durations, scale, startup), workers,
+                        name='bench_price_fixer', max_pages=None, memory_probe=lambda driver: None) as pool:
+            threads = [threading.Thread(target=get_price_worker, args=(i, state, pool, throttle))
+                       for i in range(workers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+    elapsed = time.perf_counter() - started
+
+    done = state.counts('fiyat').get(DONE, 0)
+    state.close()
+    assert done == len(links), f"{len(links) - done} iş tamamlanmadı"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=5)
+    parser.add_argument('--missing-ratio', type=float, default=0.3)
+    parser.add_argument('--jobs', type=int, default=2000, help="İş dağıtımı ölçümündeki sayfa sayısı")
+    parser.add_argument('--time-scale', type=float, default=0.002, help="Sahte sayfa sürelerinin çarpanı")
+    parser.add_argument('--startup', type=float, default=4.0,
+                        help="Tarayıcı açılış süresi (sn, ölçeklenmeden önce)")
+    parser.add_argument('--stagger', type=float, default=5.0,
+                        help="Eski düzende çalışanlar arası başlangıç gecikmesi (sn, ölçeklenmeden önce)")
+    args = parser.parse_args()
+
+    df = make_raw_listings(args.rows, missing_price_ratio=args.missing_ratio)
+    eksik = df.index[df['Fiyat'].isna()]
+    rng = np.random.default_rng(0)
+    sonuc = pd.DataFrame({
+        'Index': eksik,
+        'Link': df.loc[eksik, 'Link'].to_numpy(),
+        'Fiyat': np.where(rng.random(len(eksik)) < 0.05, "Hata", "1.250.000 TL"),
+    })
+    print(f"Satır: {len(df):,} | Eksik fiyat: {len(eksik):,} | Çalışan: {args.workers}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1) CSV yükleme
+        csv_path = os.path.join(tmp, 'ilanlar_ham.csv')
+        df.to_csv(csv_path, index=False)
+        t0 = time.perf_counter()
+        for _ in range(args.workers):
+            pd.read_csv(csv_path, on_bad_lines='skip', low_memory=False)
+        old_load = time.perf_counter() - t0
+
+        state = CrawlState(os.path.join(tmp, 'durum.sqlite'))
+        t0 = time.perf_counter()
+        yeni_df = pd.read_csv(csv_path, on_bad_lines='skip', low_memory=False)
+        linkler = yeni_df.loc[yeni_df['Fiyat'].isna() | (yeni_df['Fiyat'] == ''), 'Link']
+        bilinen, son_id = open_stage_index(state, 'fiyat', os.path.join(tmp, 'fiyat_kuyrugu.idx'))
+        state.add('fiyat', bilinen.filter_new(linkler.tolist()))
+        bilinen.save(os.path.join(tmp, 'fiyat_kuyrugu.idx'), son_id=son_id)
+        new_load = time.perf_counter() - t0
+        print(f"\n[CSV yükleme] eski: {old_load:.2f} sn ({args.workers} okuma) | "
+              f"yeni: {new_load:.2f} sn (1 okuma + kuyruğa ekleme)")
+
+        # 2) Sonuçların birleştirilmesi
+        state.put_payloads('fiyat', {link: {'Fiyat': fiyat} for link, fiyat in zip(sonuc['Link'], sonuc['Fiyat'])
+                                     if fiyat != "Hata"})
+        df_old, df_new = df.copy(), df.copy()
+        t0 = time.perf_counter()
+        merge_prices_legacy(df_old, sonuc)
+        legacy_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        sonuclar = pd.DataFrame([{'Link': link, 'Fiyat': payload['Fiyat']}
+                                 for link, payload in state.iter_payloads('fiyat', (DONE, PRICE_MISSING))],
+                                columns=['Link', 'Fiyat'])
+        merge_prices(df_new, sonuclar)
+        vector_time = time.perf_counter() - t0
+        state.close()
+        assert df_old['Fiyat'].equals(df_new['Fiyat']), "Birleştirme sonuçları farklı!"
+        print(f"[Birleştirme] iterrows: {legacy_time:.3f} sn | durum deposu + vektörel: {vector_time:.3f} sn "
+              f"| hızlanma: {legacy_time / vector_time:,.0f}x")
+
+        # 3) İş dağıtımı: sayfa süreleri uzun kuyruklu, arada zaman aşımı var, tarayıcıların hızı farklı
+        links = sonuc['Link'].head(args.jobs).tolist()
+        sureler = rng.lognormal(mean=0.6, sigma=0.5, size=len(links)) + 1.0
+        sureler[rng.random(len(links)) < 0.02] += ZAMAN_ASIMI
+        durations = dict(zip(links, sureler))
+        speeds = rng.uniform(0.8, 1.6, size=args.workers)
+
+        fixed = run_fixed_chunks(links, durations, speeds, args.time_scale, args.startup, args.stagger)
+        shared = run_shared_queue(links, durations, speeds, args.time_scale, args.startup,
+                                  os.path.join(tmp, 'kuyruk.sqlite'))
+        print(f"[İş dağıtımı, {len(links)} sayfa, sahte tarayıcı] sabit parçalar: {fixed:.2f} sn "
+              f"(~{fixed / args.time_scale / 3600:.2f} saat) | ortak kuyruk: {shared:.2f} sn "
+              f"(~{shared / args.time_scale / 3600:.2f} saat) | hızlanma: {fixed / shared:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
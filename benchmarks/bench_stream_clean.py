@@ -0,0 +1,78 @@
+"""Ham veriden eğitim verisine giden yolu tüm dosyayı belleğe alarak ve parça parça karşılaştırır.
+
+tam     : read_csv + clean_raw_listings + to_csv, ardından read_csv + build_training_frame
+parçalı : stream_clean.clean_file + stream_clean.build_training_file
+Her yol ayrı bir süreçte ölçülür; tepe RSS veri boyutuyla büyümemelidir.
+    python benchmarks/bench_stream_clean.py --sizes 300000 1000000 --chunk-size 100000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+
+import pandas as pd  # noqa: E402
+
+import stream_clean  # noqa: E402
+from bench_utils import peak_rss_mb  # noqa: E402
+from cleaning import clean_raw_listings  # noqa: E402
+from features import build_training_frame  # noqa: E402
+from synthetic import make_raw_listings  # noqa: E402
+
+
+def measure(mode, raw_path, chunk_size):
+    tmp_dir = os.path.dirname(raw_path)
+    clean_path = os.path.join(tmp_dir, f"final_{mode}.csv")
+    features_path = os.path.join(tmp_dir, f"egitim_{mode}.parquet")
+    chunk_size = int(chunk_size)
+
+    started = time.perf_counter()
+    if mode == 'tam':
+        clean_raw_listings(pd.read_csv(raw_path, low_memory=False)).to_csv(clean_path, index=False,
+                                                                           encoding='utf-8-sig')
+        cleaned = time.perf_counter()
+        df = pd.read_csv(clean_path, low_memory=False)
+        X, y = build_training_frame(df)
+        X.assign(Fiyat=y, Link=df.loc[X.index, 'Link']).to_parquet(features_path, index=False)
+    else:
+        stream_clean.clean_file(raw_path, clean_path, chunk_size)
+        cleaned = time.perf_counter()
+        stream_clean.build_training_file(clean_path, features_path, chunk_size=chunk_size)
+    finished = time.perf_counter()
+
+    return {'mode': mode, 'clean_s': cleaned - started, 'features_s': finished - cleaned,
+            'peak_rss_mb': peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[300_000, 1_000_000])
+    parser.add_argument('--chunk-size', type=int, default=stream_clean.PARCA_BOYUTU)
+    parser.add_argument('--worker', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(*args.worker)))
+        return
+
+    print(f"{'Satır':>10} | {'Yol':<8} | {'Temizlik (sn)':>14} | {'Özellikler (sn)':>16} | {'Tepe RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in args.sizes:
+            raw_path = os.path.join(tmp_dir, "ilanlar_ham.csv")
+            make_raw_listings(n).to_csv(raw_path, index=False, encoding='utf-8-sig')
+            for mode in ['tam', 'parçalı']:
+                out = subprocess.run([sys.executable, __file__, '--worker', mode, raw_path, str(args.chunk_size)],
+                                     capture_output=True, text=True, check=True)
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{n:>10,} | {mode:<8} | {r['clean_s']:>14.2f} | {r['features_s']:>16.2f} | "
+                      f"{r['peak_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
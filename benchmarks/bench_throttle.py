@@ -0,0 +1,145 @@
+"""Sabit beklemeli tarama ile uyarlanır hız denetleyicisini (throttle.Throttle) hız sınırlı yerel sunucuda karşılaştırır.
+
+Sunucu saniyede --rate istekten fazlasını 429 ile (ya da --block-mode kaldirildi ise fiyatsız sayfayla)
+geri çevirir. Her yöntem aynı sayfaları çeker; engellenen sayfa kuyruğa geri konur, yani sonunda hepsi çekilir.
+sabit      : her çalışan istekler arasında uniform(0.5, 1.5) x --fixed-delay sn bekler (scraper'ların eski hali)
+beklemesiz : çalışanlar hiç beklemez; engellenince Retry-After kadar durur
+adaptif    : Throttle, çalışan sayısı kadar eşzamanlılık ve sıfır beklemeden başlar
+async      : async_fetch.fetch_all (Throttle ile), yalnızca 429 kipinde
+    python benchmarks/bench_throttle.py --pages 300 --rate 20 --workers 8
+"""
+import argparse
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'data_collection'))
+
+import async_fetch  # noqa: E402
+from html_extract import parse_price  # noqa: E402
+from local_server import RateLimiter, start_server  # noqa: E402
+from throttle import BULUNAMADI, SINIR, Throttle  # noqa: E402
+
+
+def fetch(url):
+    """(html, retry_after) döner; sunucu 429 verirse html None olur."""
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.read().decode('utf-8'), None
+    except urllib.error.HTTPError as e:
+        if e.code == 429:
+            return None, float(e.headers.get('Retry-After', 1))
+        raise
+
+
+def run_threads(urls, workers, fixed_delay=None, throttle=None):
+    """Çalışanlar ortak kuyruktan sayfa çeker; engellenen sayfa kuyruğa geri döner. Deneme sayısını döner."""
+    jobs = queue.Queue()
+    for url in urls:
+        jobs.put(url)
+    remaining = [len(urls)]
+    attempts = [0]
+    lock = threading.Lock()
+
+    def get_page(url):
+        html, retry_after = fetch(url)
+        blocked = html is None or parse_price(html) == "Bulunamadı"
+        return blocked, retry_after
+
+    def worker():
+        while True:
+            with lock:
+                if not remaining[0]:
+                    return
+            try:
+                url = jobs.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            with lock:
+                attempts[0] += 1
+
+            if throttle:
+                with throttle.request() as req:
+                    blocked, retry_after = get_page(url)
+                    if blocked:
+                        req.outcome, req.retry_after = (SINIR, retry_after) if retry_after else (BULUNAMADI, None)
+            else:
+                blocked, retry_after = get_page(url)
+                if blocked and retry_after:
+                    time.sleep(retry_after)
+                if fixed_delay:
+                    time.sleep(random.uniform(0.5, 1.5) * fixed_delay)
+
+            if blocked:
+                jobs.put(url)
+            else:
+                with lock:
+                    remaining[0] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return attempts[0]
+
+
+def run_async(urls, workers):
+    throttle = Throttle(name='bench_async', max_concurrency=workers, start_delay=0.0)
+    failed = async_fetch.fetch_all(urls, lambda url, html: True, per_host=workers, max_retries=10, backoff=0.5,
+                                   throttle=throttle)
+    return len(failed), throttle
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=20.0, help="Sunucunun saniyede izin verdiği istek")
+    parser.add_argument('--burst', type=int, default=5)
+    parser.add_argument('--fixed-delay', type=float, default=1.0)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--latency-per-request', type=float, default=0.01)
+    parser.add_argument('--block-mode', choices=['429', 'kaldirildi'], default='429')
+    args = parser.parse_args()
+
+    urls = [f"/ilan/ornek/{27500000 + i % 6}" for i in range(args.pages)]  # Fiyatı olan örnek ilanlar
+    methods = ['sabit', 'beklemesiz', 'adaptif'] + (['async'] if args.block_mode == '429' else [])
+
+    print(f"Sayfa: {args.pages} | Çalışan: {args.workers} | Sunucu sınırı: {args.rate:g} istek/sn "
+          f"| Engelleme: {args.block_mode}")
+    print(f"{'Yöntem':<10} | {'Süre (sn)':>9} | {'Sayfa/sn':>8} | {'Engellenen':>10} | {'Son durum':<30}")
+    for method in methods:
+        limiter = RateLimiter(args.rate, args.burst, args.block_mode, latency=args.latency,
+                              latency_per_request=args.latency_per_request)
+        server, base_url = start_server(limiter=limiter)
+        page_urls = [base_url + url for url in urls]
+
+        started = time.perf_counter()
+        note = ''
+        if method == 'sabit':
+            run_threads(page_urls, args.workers, fixed_delay=args.fixed_delay)
+        elif method == 'beklemesiz':
+            run_threads(page_urls, args.workers)
+        elif method == 'adaptif':
+            throttle = Throttle(name='bench', max_concurrency=args.workers, start_delay=0.0)
+            run_threads(page_urls, args.workers, throttle=throttle)
+            note = f"eşzamanlılık {throttle.concurrency}, bekleme {throttle.delay:.2f} sn"
+        else:
+            failed, throttle = run_async(page_urls, args.workers)
+            note = f"eşzamanlılık {throttle.concurrency}, bekleme {throttle.delay:.2f} sn, {failed} başarısız"
+        elapsed = time.perf_counter() - started
+        server.shutdown()
+
+        print(f"{method:<10} | {elapsed:>9.1f} | {args.pages / elapsed:>8.1f} | {limiter.counts['engel']:>10} | {note:<30}")
+
+
+if __name__ == "__main__":
+    main()
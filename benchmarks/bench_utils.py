@@ -0,0 +1,30 @@
+"""Benchmark betiklerinin ortak yardımcıları."""
+import resource
+
+
+def peak_rss_mb():
+    """Sürecin tepe RSS değeri (MB).
+
+    Linux'ta ru_maxrss, fork edilen büyük ana sürecin değerini exec sonrasında da taşıdığı
+    için önce /proc/self/status içindeki VmHWM okunur.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb():
+    """Sürecin o anki RSS değeri (MB); /proc yoksa tepe değer döner."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
@@ -0,0 +1,75 @@
+"""Senaryo ızgarasının (km x yıl x hasar) puanlanmasını formu tek tek göndermekle karşılaştırır.
+
+tek_tek   : ızgaranın her noktası ayrı bir form değerlemesi (satır başına prepare + 3 predict)
+toplu     : whatif.what_if, tüm ızgara tek prepare + model başına tek predict
+onbellekli: aynı form girdisi ikinci kez, ızgara önbellekten (PredictionCache)
+tek_tek süresi ilk --sample noktadan ölçülüp ızgaranın tamamına ölçeklenir.
+    python benchmarks/bench_whatif.py --models-dir models
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+
+import pandas as pd  # noqa: E402
+
+from bench_model_startup import prepare_models  # noqa: E402
+from predict import PriceEstimator  # noqa: E402
+from prediction_cache import PredictionCache  # noqa: E402
+from whatif import build_grid, what_if  # noqa: E402
+
+FORM_GIRDISI = {
+    'Marka': 'Renault', 'Seri': 'Clio', 'Model': '1.5 dCi Joy', 'Yıl': 2020, 'Kilometre': 50000,
+    'Vites Tipi': 'Manuel', 'Yakıt Tipi': 'Dizel', 'Kasa Tipi': 'Hatchback/5', 'Motor Hacmi': '1461 cc',
+    'Motor Gücü': '90 hp', 'Çekiş': 'Önden Çekiş', 'Renk': 'Beyaz', 'Kimden': 'Sahibinden',
+    'Boyali_Sayisi': 1, 'Degisen_Sayisi': 0, 'Tramer': 0, 'Kaput_Degisen': 0, 'Tavan_Boyali': 0,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--models-dir', default=None, help="Varsayılan: geçici klasörde eğitilen küçük modeller")
+    parser.add_argument('--sample', type=int, default=50, help="tek_tek için ölçülen nokta sayısı")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    models_dir = args.models_dir
+    if models_dir is None:
+        models_dir = os.path.join(tempfile.mkdtemp(), 'models')
+        prepare_models(models_dir, 20_000, 300)
+    estimator = PriceEstimator.load(models_dir, lazy=False)
+    base = pd.DataFrame([FORM_GIRDISI])
+    grid = build_grid(base)
+
+    timings = {}
+    started = time.perf_counter()
+    for i in range(min(args.sample, len(grid))):
+        estimator.predict(grid.iloc[[i]])
+    timings['tek_tek'] = (time.perf_counter() - started) / min(args.sample, len(grid)) * len(grid)
+
+    started = time.perf_counter()
+    for _ in range(args.repeats):
+        what_if(estimator, base)
+    timings['toplu'] = (time.perf_counter() - started) / args.repeats
+
+    cache = PredictionCache()
+    what_if(estimator, base, cache)
+    started = time.perf_counter()
+    for _ in range(args.repeats):
+        what_if(estimator, base, cache)
+    timings['onbellekli'] = (time.perf_counter() - started) / args.repeats
+
+    print(f"Izgara: {len(grid)} nokta ({grid['Hasar_Durumu'].nunique()} hasar x {grid['Yıl'].nunique()} yıl x "
+          f"{grid['Kilometre'].nunique()} km)")
+    print(f"{'Yöntem':<10} | {'Süre (ms)':>10} | {'Hızlanma':>8}")
+    for method, seconds in timings.items():
+        print(f"{method:<10} | {seconds * 1000:>10.1f} | {timings['tek_tek'] / seconds:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
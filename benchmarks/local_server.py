@@ -0,0 +1,153 @@
+"""Kaydedilmiş örnek sayfaları yerel bir HTTP sunucusundan yayınlar.
+
+Scraper'lar arabam.com yerine bu sunucuya yönlendirilerek ağ olmadan denenebilir:
+    python benchmarks/local_server.py --port 8765
+    http://127.0.0.1:8765/ilan/ornek/27500000            -> sample_pages/ilan_27500000.html
+    http://127.0.0.1:8765/ikinci-el/otomobil/renault?page=2 -> sample_pages/renault_2.html
+
+--rate-limit ile sunucu hız sınırı uygulayan bir siteyi taklit eder: saniyede izin verilenden fazla
+istek gelirse 429 (Retry-After ile) döner ya da --block-mode kaldirildi ise fiyatsız "ilan kaldırıldı"
+sayfası gösterir. Yanıt süresi de uçuştaki istek sayısıyla uzar (--latency-per-request).
+    python benchmarks/local_server.py --rate-limit 20 --burst 5
+"""
+import argparse
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_PAGES_DIR = os.path.join(CURRENT_DIR, 'sample_pages')
+
+
+def resolve_page(path, pages_dir=SAMPLE_PAGES_DIR):
+    """İstek yolunu örnek sayfa dosyasına çevirir; bulunamazsa None döner."""
+    url = urlsplit(path)
+    parts = [p for p in url.path.split('/') if p]
+    if not parts:
+        return None
+
+    if parts[0] == 'ilan':
+        file_name = f"ilan_{parts[-1]}.html"
+    elif parts[-1].endswith('.html'):
+        file_name = parts[-1]
+    else:
+        page = parse_qs(url.query).get('page', ['1'])[0]
+        file_name = f"{parts[-1]}_{page}.html"
+
+    file_path = os.path.join(pages_dir, os.path.basename(file_name))
+    return file_path if os.path.exists(file_path) else None
+
+
+class SamplePageHandler(BaseHTTPRequestHandler):
+    pages_dir = SAMPLE_PAGES_DIR
+
+    def do_GET(self):
+        file_path = resolve_page(self.path, self.pages_dir)
+        if not file_path:
+            self.send_error(404)
+            return
+
+        with open(file_path, 'rb') as f:
+            body = f.read()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RateLimiter:
+    """Saniyede `rate` isteğe, anlık `burst` isteğe izin veren jeton kovası ve yükle uzayan yanıt süresi."""
+
+    def __init__(self, rate, burst=5, block_mode='429', retry_after=1, latency=0.0, latency_per_request=0.0):
+        self.rate = rate
+        self.burst = burst
+        self.block_mode = block_mode
+        self.retry_after = retry_after
+        self.latency = latency
+        self.latency_per_request = latency_per_request
+        self.tokens = burst
+        self.in_flight = 0
+        self.counts = {'izin': 0, 'engel': 0}
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def enter(self):
+        """İstek geldiğinde çağrılır: (izin_var_mı, yanıttan önce beklenecek süre) döner."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.in_flight += 1
+            allowed = self.tokens >= 1
+            if allowed:
+                self.tokens -= 1
+            self.counts['izin' if allowed else 'engel'] += 1
+            return allowed, self.latency + self.latency_per_request * (self.in_flight - 1)
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+class RateLimitedHandler(SamplePageHandler):
+    limiter = None
+
+    def do_GET(self):
+        allowed, wait = self.limiter.enter()
+        try:
+            time.sleep(wait)
+            if allowed:
+                super().do_GET()
+            elif self.limiter.block_mode == 'kaldirildi':
+                # Bazı siteler engellerken hata yerine içeriksiz sayfa döndürür
+                self.path = '/ilan_kaldirildi.html'
+                super().do_GET()
+            else:
+                self.send_response(429)
+                self.send_header('Retry-After', str(self.limiter.retry_after))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+        finally:
+            self.limiter.leave()
+
+
+def start_server(port=0, pages_dir=SAMPLE_PAGES_DIR, handler_class=SamplePageHandler, limiter=None):
+    """Sunucuyu arka planda başlatır, (sunucu, kök_url) döner. limiter verilirse hız sınırı uygulanır."""
+    attrs = {'pages_dir': pages_dir}
+    if limiter is not None:
+        handler_class, attrs['limiter'] = RateLimitedHandler, limiter
+    handler = type('Handler', (handler_class,), attrs)
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Örnek ilan sayfalarını yerelde yayınlar.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages-dir', default=SAMPLE_PAGES_DIR)
+    parser.add_argument('--rate-limit', type=float, help="Saniyede izin verilen istek (verilmezse sınır yok)")
+    parser.add_argument('--burst', type=int, default=5)
+    parser.add_argument('--block-mode', choices=['429', 'kaldirildi'], default='429')
+    parser.add_argument('--latency', type=float, default=0.0, help="Temel yanıt süresi (sn)")
+    parser.add_argument('--latency-per-request', type=float, default=0.0,
+                        help="Uçuştaki her ek istek için yanıt süresine eklenen (sn)")
+    args = parser.parse_args()
+
+    limiter = None
+    if args.rate_limit:
+        limiter = RateLimiter(args.rate_limit, args.burst, args.block_mode, latency=args.latency,
+                              latency_per_request=args.latency_per_request)
+    server, base_url = start_server(args.port, args.pages_dir, limiter=limiter)
+    print(f"[INFO] Örnek sayfalar yayında: {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
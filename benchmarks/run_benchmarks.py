@@ -0,0 +1,311 @@
+"""Performans senaryolarını birkaç veri boyutunda çalıştırıp karşılaştırılabilir bir JSON dosyasına yazar.
+
+Senaryolar (her biri ayrı süreçte ölçülür; tepe RSS değerleri birbirini etkilemez):
+  html_*            kaydedilmiş örnek sayfalarda marka / liste / ilan / fiyat ayrıştırma (sayfa başına)
+  prepare_*         özellik hazırlığı: tek satır gecikmesi ve toplu verim
+  load_*            uygulamanın veri seti yüklemesi (CSV ve Parquet)
+  predict_*         form değerlemesi (tek satır) ve toplu tahmin
+  scan_*            "Fırsat Bul" taraması: önceden hesaplanmış tahminlerle ve canlı puanlamayla
+Her ölçümde verim (birim/sn), p50 / p99 gecikme ve tepe RSS kaydedilir. Sonuç dosyası
+benchmarks/results/ altına yazılır; --baseline ile önceki bir dosyayla karşılaştırıldığında verimi
+GERILEME_ESIGI'nden fazla düşen ya da p99'u o kadar artan ölçümler işaretlenir.
+    python benchmarks/run_benchmarks.py --sizes 10000 100000
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/20250101_120000_abc1234.json --strict
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+SAMPLE_PAGES_DIR = os.path.join(CURRENT_DIR, 'sample_pages')
+RESULTS_DIR = os.path.join(CURRENT_DIR, 'results')
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modeling'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'data_collection'))
+
+import numpy as np  # noqa: E402
+
+import dataset  # noqa: E402
+import html_extract  # noqa: E402
+from bench_utils import peak_rss_mb  # noqa: E402
+from precompute_predictions import (filter_listings, load_predictions, precompute, score_listings,  # noqa: E402
+                                    top_opportunities)
+from predict import PriceEstimator  # noqa: E402
+from synthetic import make_final_listings  # noqa: E402
+
+# --- AYARLAR ---
+TEKRAR = {'sayfa': 100, 'tekil': 200, 'toplu': 3, 'tarama': 30, 'canli_tarama': 5}
+GERILEME_ESIGI = 0.10
+MODEL_SATIRI = 30_000
+MODEL_ITERASYONU = 300
+# ----------------
+
+
+def summarize(name, size, durations, items_per_call=1, unit='işlem'):
+    d = np.asarray(durations)
+    return {
+        'senaryo': name,
+        'boyut': size,
+        'birim': unit,
+        'tekrar': len(d),
+        'verim': items_per_call * len(d) / d.sum(),
+        'p50_ms': float(np.percentile(d, 50) * 1000),
+        'p99_ms': float(np.percentile(d, 99) * 1000),
+    }
+
+
+def timed_calls(func, calls):
+    """calls içindeki her argüman demetiyle func'ı çağırır; çağrı sürelerini (sn) döner.
+
+    İlk çağrı (tembel yükleme, ısınma) ölçüme katılmadan bir kez önceden yapılır.
+    """
+    func(*calls[0])
+    durations = []
+    for args in calls:
+        started = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+# --- Senaryolar: (boyut, çalışma klasörü) -> ölçüm listesi ---
+def _paths(size, work_dir):
+    return (os.path.join(work_dir, f"ilanlar_{size}.csv"), os.path.join(work_dir, f"ilanlar_{size}.parquet"),
+            os.path.join(work_dir, f"tahminler_{size}"), os.path.join(work_dir, 'models'))
+
+
+def _sample_pages():
+    pages = {'marka': [], 'liste': [], 'ilan': []}
+    for path in sorted(glob.glob(os.path.join(SAMPLE_PAGES_DIR, '*.html'))):
+        name = os.path.basename(path)
+        kind = 'ilan' if name.startswith('ilan_') else 'marka' if name.startswith('otomobil_') else 'liste'
+        with open(path, encoding='utf-8') as f:
+            pages[kind].append(f.read())
+    return pages
+
+
+def run_html(size, work_dir):
+    pages = _sample_pages()
+    url = 'https://www.arabam.com/ikinci-el/otomobil/ornek?page=1'
+    parsers = {
+        'html_marka': (pages['marka'], lambda html: html_extract.parse_brand_links(html, url)),
+        'html_liste': (pages['liste'], lambda html: html_extract.parse_list_page(html, url)),
+        'html_ilan': (pages['ilan'], lambda html: html_extract.parse_listing(html, 'https://www.arabam.com/ilan/x/1')),
+        'html_fiyat': (pages['ilan'], html_extract.parse_price),
+    }
+    return [summarize(name, len(htmls), timed_calls(parse, [(html,) for html in htmls] * TEKRAR['sayfa']),
+                      unit='sayfa')
+            for name, (htmls, parse) in parsers.items()]
+
+
+def _load(size, work_dir):
+    csv_path, parquet_path, _, models_dir = _paths(size, work_dir)
+    estimator = PriceEstimator.load(models_dir, lazy=False)
+    return dataset.load_listings(csv_path, dataset.APP_COLUMNS, parquet_path), estimator
+
+
+def _single_rows(data, n):
+    rng = np.random.default_rng(0)
+    return [(data.iloc[[i]],) for i in rng.integers(len(data), size=n)]
+
+
+def run_prepare_single(size, work_dir):
+    data, estimator = _load(size, work_dir)
+    return [summarize('prepare_tekil', size, timed_calls(estimator.prepare, _single_rows(data, TEKRAR['tekil'])))]
+
+
+def run_prepare_batch(size, work_dir):
+    data, estimator = _load(size, work_dir)
+    durations = timed_calls(estimator.prepare, [(data,)] * TEKRAR['toplu'])
+    return [summarize('prepare_toplu', size, durations, len(data), 'satır')]
+
+
+def run_load_csv(size, work_dir):
+    csv_path = _paths(size, work_dir)[0]
+    durations = timed_calls(dataset.load_listings, [(csv_path, dataset.APP_COLUMNS, None)] * TEKRAR['toplu'])
+    return [summarize('load_csv', size, durations, size, 'satır')]
+
+
+def run_load_parquet(size, work_dir):
+    csv_path, parquet_path, _, _ = _paths(size, work_dir)
+    durations = timed_calls(dataset.load_listings, [(csv_path, dataset.APP_COLUMNS, parquet_path)] * TEKRAR['toplu'])
+    return [summarize('load_parquet', size, durations, size, 'satır')]
+
+
+def run_predict_single(size, work_dir):
+    data, estimator = _load(size, work_dir)
+    return [summarize('predict_tekil', size, timed_calls(estimator.predict, _single_rows(data, TEKRAR['tekil'])))]
+
+
+def run_predict_batch(size, work_dir):
+    data, estimator = _load(size, work_dir)
+    durations = timed_calls(estimator.predict, [(data,)] * TEKRAR['toplu'])
+    return [summarize('predict_toplu', size, durations, len(data), 'satır')]
+
+
+def _scan_filters(data, n):
+    rng = np.random.default_rng(0)
+    markalar = ["Tümü"] + sorted(data['Marka'].dropna().unique().tolist())
+    return [(rng.choice(markalar), int(rng.integers(5, 40)) * 100_000, (int(rng.integers(2000, 2020)), 2025))
+            for _ in range(n)]
+
+
+def run_scan_precomputed(size, work_dir):
+    csv_path, _, predictions_dir, _ = _paths(size, work_dir)
+    data, estimator = _load(size, work_dir)
+    preds = load_predictions(dataset.dataset_version(csv_path), estimator.version, predictions_dir=predictions_dir)
+    opp_df = data.join(preds, how='inner')
+
+    def scan(marka, butce, yil_araligi):
+        return top_opportunities(filter_listings(opp_df, marka, butce, yil_araligi))
+
+    return [summarize('scan_onceden', size, timed_calls(scan, _scan_filters(data, TEKRAR['tarama'])), unit='tarama')]
+
+
+def run_scan_live(size, work_dir):
+    data, estimator = _load(size, work_dir)
+
+    def scan(marka, butce, yil_araligi):
+        f_df = filter_listings(data, marka, butce, yil_araligi)
+        if f_df.empty:
+            return f_df
+        return top_opportunities(f_df.join(score_listings(f_df, estimator)[['Kazanç']]))
+
+    return [summarize('scan_canli', size, timed_calls(scan, _scan_filters(data, TEKRAR['canli_tarama'])),
+                      unit='tarama')]
+
+
+SCENARIOS = {
+    'html': (run_html, False),
+    'prepare_single': (run_prepare_single, True),
+    'prepare_batch': (run_prepare_batch, True),
+    'load_csv': (run_load_csv, True),
+    'load_parquet': (run_load_parquet, True),
+    'predict_single': (run_predict_single, True),
+    'predict_batch': (run_predict_batch, True),
+    'scan_precomputed': (run_scan_precomputed, True),
+    'scan_live': (run_scan_live, True),
+}
+
+
+# --- Hazırlık, çalıştırma, karşılaştırma ---
+def prepare_workdir(work_dir, sizes):
+    """Sentetik veri setlerini, Parquet kopyalarını, modelleri ve önceden hesaplanmış tahminleri üretir."""
+    from bench_model_startup import prepare_models
+
+    models_dir = os.path.join(work_dir, 'models')
+    if not os.path.exists(os.path.join(models_dir, 'manifest.json')):
+        prepare_models(models_dir, MODEL_SATIRI, MODEL_ITERASYONU)
+    for size in sizes:
+        csv_path, parquet_path, predictions_dir, _ = _paths(size, work_dir)
+        if not os.path.exists(csv_path):
+            make_final_listings(size, seed=size).to_csv(csv_path, index=False, encoding='utf-8-sig')
+        if dataset.parquet_version(parquet_path) != dataset.dataset_version(csv_path):
+            dataset.write_parquet(csv_path, parquet_path)
+        precompute(csv_path, models_dir, predictions_dir)
+
+
+def run_scenario(name, size, work_dir):
+    """Senaryoyu ayrı bir süreçte çalıştırır; ölçümlere sürecin tepe RSS'ini ekler."""
+    out = subprocess.run([sys.executable, __file__, '--worker', name, str(size), work_dir],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    print(f"\n{'Senaryo':<16}{'Boyut':>10}{'Verim':>14}  {'Birim':<8}{'p50 (ms)':>10}{'p99 (ms)':>10}{'Tepe RSS (MB)':>15}")
+    for r in results:
+        print(f"{r['senaryo']:<16}{r['boyut']:>10,}{r['verim']:>14,.1f}  {r['birim'] + '/sn':<8}"
+              f"{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['tepe_rss_mb']:>15.1f}")
+
+
+def compare(results, baseline, threshold=GERILEME_ESIGI):
+    """Önceki sonuç dosyasıyla karşılaştırır; gerileyen ölçümlerin listesini döner."""
+    previous = {(r['senaryo'], r['boyut']): r for r in baseline['sonuclar']}
+    regressions = []
+    print(f"\nKarşılaştırma: {baseline['meta'].get('commit')} ({baseline['meta'].get('tarih')})")
+    print(f"{'Senaryo':<16}{'Boyut':>10}{'Verim farkı':>14}{'p99 farkı':>12}{'RSS farkı (MB)':>16}")
+    for r in results:
+        b = previous.get((r['senaryo'], r['boyut']))
+        if b is None:
+            continue
+        verim = r['verim'] / b['verim'] - 1
+        p99 = r['p99_ms'] / b['p99_ms'] - 1
+        regressed = verim < -threshold or p99 > threshold
+        if regressed:
+            regressions.append(r['senaryo'])
+        print(f"{r['senaryo']:<16}{r['boyut']:>10,}{verim:>+14.1%}{p99:>+12.1%}"
+              f"{r['tepe_rss_mb'] - b['tepe_rss_mb']:>+16.1f}{'   <-- GERİLEME' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--work-dir', default=None, help="Veri ve modeller burada tutulur (sonraki çalıştırmalarda yeniden kullanılır)")
+    parser.add_argument('--output', default=None, help="Varsayılan: benchmarks/results/<tarih>_<commit>.json")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--strict', action='store_true', help="Gerileme varsa 1 koduyla çık")
+    parser.add_argument('--worker', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        name, size, work_dir = args.worker
+        records = SCENARIOS[name][0](int(size), work_dir)
+        rss = peak_rss_mb()
+        print(json.dumps([{**r, 'tepe_rss_mb': rss} for r in records]))
+        return
+
+    work_dir = args.work_dir or tempfile.mkdtemp()
+    os.makedirs(work_dir, exist_ok=True)
+    prepare_workdir(work_dir, args.sizes)
+
+    results = []
+    for name in args.scenarios:
+        sizes = args.sizes if SCENARIOS[name][1] else [0]
+        for size in sizes:
+            print(f"[INFO] {name} ({size:,} satır)" if size else f"[INFO] {name}")
+            results.extend(run_scenario(name, size, work_dir))
+    print_results(results)
+
+    commit = _git_commit()
+    meta = {
+        'tarih': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu': os.cpu_count(),
+        'boyutlar': args.sizes,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d_%H%M%S}_{commit or 'yerel'}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'sonuclar': results}, f, ensure_ascii=False, indent=2)
+    print(f"\n[INFO] Sonuçlar yazıldı: '{output}'")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f))
+        if regressions and args.strict:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark'lar için gerçek veri şemasını taklit eden sentetik ilan verisi üretir.
+
+Doğrudan çalıştırıldığında veriyi dosyaya yazar (uygulamayı ve hattı gerçek veri olmadan denemek için):
+    python benchmarks/synthetic.py final 100000 data/processed/ilanlar_final.csv
+    python benchmarks/synthetic.py raw 1000000 data/raw/ilanlar_ham.csv --seed 7
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+ARACLAR = [
+    ("Renault", "Clio", "1.5 dCi Joy", "Hatchback/5", "1461 cc", "90 hp", "Önden Çekiş", 950_000),
+    ("Renault", "Megane", "1.5 dCi Touch", "Sedan", "1461 cc", "110 hp", "Önden Çekiş", 1_150_000),
+    ("Volkswagen", "Passat", "1.6 TDi BlueMotion Highline", "Sedan", "1598 cc", "120 hp", "Önden Çekiş", 1_700_000),
+    ("Volkswagen", "Golf", "1.4 TSi Comfortline", "Hatchback/5", "1395 cc", "125 hp", "Önden Çekiş", 1_400_000),
+    ("Fiat", "Egea", "1.4 Fire Easy", "Sedan", "1368 cc", "95 hp", "Önden Çekiş", 800_000),
+    ("Fiat", "Doblo", "1.3 Multijet Safeline", "MPV", "1248 cc", "90 hp", "Önden Çekiş", 850_000),
+    ("BMW", "3 Serisi", "320i ED Luxury Line", "Sedan", "1597 cc", "170 hp", "Arkadan İtiş", 2_600_000),
+    ("Toyota", "Corolla", "1.6 Vision", "Sedan", "1598 cc", "132 hp", "Önden Çekiş", 1_300_000),
+    ("Dacia", "Duster", "1.5 dCi Laureate", "SUV", "1461 cc", "110 hp", "4WD (Sürekli)", 1_050_000),
+    ("Hyundai", "i20", "1.4 MPI Jump", "Hatchback/5", "1368 cc", "100 hp", "Önden Çekiş", 850_000),
+]
+PARCALAR = ["Sol Ön Çamurluk", "Sağ Ön Çamurluk", "Kaput", "Tavan", "Sol Ön Kapı", "Sağ Arka Kapı",
+            "Bagaj Kapağı", "Ön Tampon", "Arka Tampon"]
+BOS_HASAR = ["Yok", "Belirtilmemiş", "Orijinal", "Tamamı orjinal", "Hatasız"]
+RENKLER = ["Beyaz", "Siyah", "Gri", "Gümüş Gri", "Kırmızı", "Lacivert"]
+VITES = ["Manuel", "Otomatik", "Yarı Otomatik"]
+YAKIT = ["Dizel", "Benzin", "Benzin & LPG", "Hibrit"]
+KIMDEN = ["Sahibinden", "Galeriden"]
+
+
+def _tl(values):
+    return pd.Series(values).map(lambda v: f"{v:,}".replace(",", "."))
+
+
+def _hasar(rng, n):
+    secim = rng.random(n)
+    sonuc = np.empty(n, dtype=object)
+    for i in range(n):
+        if secim[i] < 0.5:
+            sonuc[i] = BOS_HASAR[rng.integers(len(BOS_HASAR))]
+        else:
+            adet = rng.integers(1, 4)
+            sonuc[i] = ", ".join(rng.choice(PARCALAR, adet, replace=False))
+    return sonuc
+
+
+def make_raw_listings(n, seed=42, missing_price_ratio=0.05):
+    """ilanlar_ham.csv şemasında (metin biçimli) n satır üretir."""
+    rng = np.random.default_rng(seed)
+    arac = rng.integers(len(ARACLAR), size=n)
+    araclar = [ARACLAR[i] for i in arac]
+
+    ilan_no = 27_000_000 + rng.permutation(n * 2)[:n]
+    yil = rng.integers(2000, 2025, size=n)
+    km = rng.integers(0, 400, size=n) * 1000
+    tramer = rng.integers(0, 80, size=n) * 1000
+    # Fiyat; araç, yaş, kilometre ve tramerle ilişkili olsun ki model doğruluğu ölçülebilsin
+    baz = np.array([a[7] for a in araclar], dtype=float)
+    fiyat = baz * 0.92 ** (2025 - yil) * (1 - km / 1_500_000) * rng.lognormal(0, 0.12, size=n) - tramer * 0.3
+    fiyat = np.maximum(fiyat // 10_000, 6).astype(int) * 10_000
+
+    df = pd.DataFrame({
+        'Link': [f"https://www.arabam.com/ilan/sahibinden-satilik-{a[0].lower()}/temiz/{no}"
+                 for a, no in zip(araclar, ilan_no)],
+        'Başlık': [f"Sahibinden {y} {a[0]} {a[1]}" for a, y in zip(araclar, yil)],
+        'Fiyat': _tl(fiyat) + " TL",
+        'İlan No': ilan_no,
+        'İlan Tarihi': "21 Kasım 2025",
+        'Marka': [a[0] for a in araclar],
+        'Seri': [a[1] for a in araclar],
+        'Model': [a[2] for a in araclar],
+        'Yıl': yil,
+        'Kilometre': _tl(km) + " km",
+        'Vites Tipi': rng.choice(VITES, n),
+        'Yakıt Tipi': rng.choice(YAKIT, n),
+        'Kasa Tipi': [a[3] for a in araclar],
+        'Renk': rng.choice(RENKLER, n),
+        'Motor Hacmi': [a[4] for a in araclar],
+        'Motor Gücü': [a[5] for a in araclar],
+        'Çekiş': [a[6] for a in araclar],
+        'Araç Durumu': "İkinci El",
+        'Ort. Yakıt Tüketimi': [f"{rng.integers(4, 9)},{rng.integers(10)} lt" for _ in range(n)],
+        'Yakıt Deposu': [f"{v} lt" for v in rng.integers(40, 70, size=n)],
+        'Boya-değişen': "Belirtilmemiş",
+        'Takasa Uygun': rng.choice(["Takasa Uygun", "Takasa Uygun Değil"], n),
+        'Kimden': rng.choice(KIMDEN, n),
+        'Tramer': (_tl(tramer) + " TL").where(rng.random(n) > 0.3, None),
+        'Boyalı Parçalar': _hasar(rng, n),
+        'Lokal Boyalı Parçalar': _hasar(rng, n),
+        'Değişen Parçalar': _hasar(rng, n),
+    })
+
+    df.loc[rng.random(n) < missing_price_ratio, 'Fiyat'] = None
+    return df
+
+
+def make_final_listings(n, seed=42):
+    """ilanlar_final.csv şemasında (01_veri_analizi temizliğinden geçmiş) n satır üretir."""
+    df = make_raw_listings(n, seed=seed, missing_price_ratio=0.0)
+    df['Fiyat'] = df['Fiyat'].str.replace(' TL', '', regex=False).str.replace('.', '', regex=False).astype(int)
+    df['Kilometre'] = df['Kilometre'].str.replace(' km', '', regex=False).str.replace('.', '', regex=False).astype(int)
+    df['Tramer'] = pd.to_numeric(df['Tramer'].fillna('0').str.replace(' TL', '', regex=False)
+                                 .str.replace('.', '', regex=False), errors='coerce').fillna(0).astype(int)
+    return df.drop(columns=['Başlık', 'İlan No', 'İlan Tarihi']).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik ilan verisi üretir.")
+    parser.add_argument('schema', choices=['raw', 'final'], help="raw: ilanlar_ham.csv, final: ilanlar_final.csv şeması")
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    make = make_raw_listings if args.schema == 'raw' else make_final_listings
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    make(args.rows, seed=args.seed).to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"[INFO] {args.rows} satır yazıldı: '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import metrics
+from throttle import HATA, SINIR, SINIR_KODLARI, Throttle
+
+# --- AYARLAR ---
+TOPLAM_BAGLANTI = 32          # Havuzdaki toplam açık bağlantı sayısı
+HOST_BASINA_ISTEK = 8         # Aynı sunucuya aynı anda gönderilecek en fazla istek
+MAKS_DENEME = 4
+GERI_CEKILME_TABANI = 1.0     # saniye; her denemede iki katına çıkar
+ZAMAN_ASIMI = 20
+# ----------------
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/108.0.0.0 Safari/537.36')
+
+TEKRAR_DENENECEK_KODLAR = {429, 500, 502, 503, 504}
+
+
+def backoff_delay(attempt, base=GERI_CEKILME_TABANI, retry_after=None):
+    """Üstel geri çekilme süresi (+ rastgele sapma). Sunucu Retry-After verdiyse ona uyar."""
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+    return base * (2 ** attempt) + random.uniform(0, base)
+
+
+def _record(labels, outcome, started):
+    metrics.histogram('scraper_fetch_seconds', "scraper_fetch süresi (sn)").observe(
+        time.perf_counter() - started, yontem='async', **labels)
+    metrics.ISTEKLER.inc(yontem='async', sonuc=outcome, **labels)
+
+
+async def fetch_page(session, url, host_limits, throttle, max_retries=MAKS_DENEME, backoff=GERI_CEKILME_TABANI,
+                     labels=None):
+    """Tek bir sayfayı çeker. (html, hata_mesajı) döner; başarılıysa hata None olur.
+
+    Her deneme throttle'dan izin alır ve sonucunu ona bildirir.
+    labels: ölçümlere eklenecek etiketler (ör. {'asama': 'detay'}).
+    """
+    semaphore = host_limits[urlsplit(url).netloc]
+    labels = labels or {}
+    last_error = None
+
+    for attempt in range(max_retries):
+        retry_after = None
+        started = time.perf_counter()
+        try:
+            async with semaphore, throttle.arequest() as req:
+                started = time.perf_counter()  # Semafor ve hız denetleyicisi beklemesi istek süresine sayılmaz
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        html = await response.text()
+                        _record(labels, '200', started)
+                        return html, None
+                    _record(labels, str(response.status), started)
+                    last_error = f"HTTP {response.status}"
+                    if response.status not in TEKRAR_DENENECEK_KODLAR:
+                        return None, last_error  # 404 gibi kodlar sitenin cevabıdır, yavaşlamayı gerektirmez
+                    retry_after = response.headers.get('Retry-After')
+                    outcome = str(response.status)
+                    req.outcome = SINIR if response.status in SINIR_KODLARI else HATA
+                    req.retry_after = retry_after
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            outcome = type(e).__name__
+            _record(labels, outcome, started)
+            last_error = f"{type(e).__name__}: {e}"
+
+        if attempt < max_retries - 1:
+            metrics.TEKRARLAR.inc(yontem='async', sonuc=outcome, **labels)
+            await asyncio.sleep(backoff_delay(attempt, backoff, retry_after))
+
+    return None, last_error
+
+
+async def _fetch_all(urls, handle_page, total_connections, per_host, max_retries, backoff, timeout, labels,
+                     throttle):
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+
+    host_limits = {}
+    for url in urls:
+        host_limits.setdefault(urlsplit(url).netloc, asyncio.Semaphore(per_host))
+
+    fallback_urls = []
+
+    connector = aiohttp.TCPConnector(limit=total_connections, limit_per_host=per_host, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     headers={'User-Agent': USER_AGENT}) as session:
+        async def worker():
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                # Beklenmedik hatalar (ör. çözülemeyen karakter kodlaması) yalnızca bu sayfayı Chrome'a bırakır;
+                # gather'a ulaşırlarsa partinin tamamı iptal olur
+                try:
+                    html, error = await fetch_page(session, url, host_limits, throttle, max_retries, backoff,
+                                                   labels)
+                except Exception as e:
+                    html, error = None, f"{type(e).__name__}: {e}"
+                if html is None:
+                    fallback_urls.append((url, error))
+                    continue
+                # handle_page False dönerse sayfa JS gerektiriyor demektir -> Chrome'a bırakılır.
+                # İşlenirken hata veren sayfa (ayrıştırma, yazma) da partinin kalanını durdurmadan ona bırakılır.
+                try:
+                    handled = handle_page(url, html)
+                except Exception as e:
+                    handled, error = False, f"{type(e).__name__}: {e}"
+                if not handled:
+                    fallback_urls.append((url, error))
+
+        await asyncio.gather(*(worker() for _ in range(min(total_connections, len(urls)))))
+
+    return fallback_urls
+
+
+def fetch_all(urls, handle_page, total_connections=TOPLAM_BAGLANTI, per_host=HOST_BASINA_ISTEK,
+              max_retries=MAKS_DENEME, backoff=GERI_CEKILME_TABANI, timeout=ZAMAN_ASIMI, labels=None, throttle=None):
+    """URL listesini ortak bir bağlantı havuzuyla eşzamanlı çeker.
+
+    Her başarılı sayfa için handle_page(url, html) çağrılır. Çekilemeyen (çekilirken ya da çözülürken
+    beklenmedik hata verenler dahil), handle_page'in reddettiği (JS gerektiren) ya da handle_page'de hata
+    veren sayfalar [(url, hata), ...] olarak döner.
+    İstek süreleri, durum kodları ve tekrarlar metrics'e labels etiketleriyle yazılır.
+    Eşzamanlılık ve istek aralığı throttle'a göre uyarlanır (verilmezse en fazla per_host eşzamanlı
+    istekle, beklemesiz başlayan bir Throttle kullanılır). Çağrılar arasında öğrenilen hızın korunması
+    için aynı Throttle tekrar verilebilir.
+    """
+    if not urls:
+        return []
+    throttle = throttle or Throttle(name='async_fetch', max_concurrency=per_host, start_delay=0.0)
+    return asyncio.run(_fetch_all(urls, handle_page, total_connections, per_host, max_retries, backoff, timeout,
+                                  labels, throttle))
@@ -1,40 +1,37 @@
 import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
 import time
-import random
-from tqdm import tqdm
+import threading
 import os
+import csv
+
+from html_extract import parse_list_page, parse_list_rows, LIST_ROW_COLUMNS
+from crawl_state import CrawlState, IN_PROGRESS, DONE, PRICE_MISSING
+from listing_index import ListingIndex, listing_id
+from html_archive import open_archive
+from driver_pool import DriverPool, PoolExhausted
+from throttle import Throttle
+import metrics
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
 
 INPUT_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'marka_linkleri.txt')
 OUTPUT_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'ilan_linkleri.txt')
+SUMMARY_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'ilan_ozetleri.csv')
 DRIVER_PATH = os.path.join(PROJECT_ROOT, 'chromedriver.exe')
 
-def get_last_page_for_brand(driver, brand_url):
-    try:
-        driver.get(brand_url)
-        time.sleep(3)
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        pagination_ul = soup.find('ul', class_='pagination')
-        if not pagination_ul: return 1
+# --- AYARLAR ---
+PARALEL_MOD = True
+CALISAN_SAYISI = 4
+RAPOR_ARALIGI = 10  # Her çalışan kaç sayfada bir hızını yazdırsın
+ILK_BEKLEME = 3.0  # sn; hız denetleyicisi tek çalışanla bu aralıktan başlayıp siteye göre uyarlar
+LISTE_OZETI = True  # Satırlardaki özet sütunları (fiyat, yıl, km, renk...) linkle birlikte kaydedilsin
+ARTIMLI_DETAY = True  # Detay sayfası yalnızca yeni ya da listede fiyatı/km'si değişen ilan için kuyruğa girsin
+DEGISIM_ALANLARI = ['Fiyat', 'Kilometre']
+DIZIN_KAYIT_ARALIGI = 50  # Link dizini kaç sayfada bir diske yazılsın
+# ----------------
 
-        last_page_link = pagination_ul.find('a', title='Son Sayfa')
-        if not last_page_link:
-            all_li = pagination_ul.find_all('li')
-            if len(all_li) > 2:
-                return int(all_li[-2].text.strip())
-            return 1
-
-        href = last_page_link.get('href')
-        return int(href.split('page=')[-1])
-
-    except Exception as e:
-        print(f"\nSayfa sayısı alınırken hata: {e}")
-        return 1
+OZET_SUTUNLARI = ['Link', 'İlan No', 'Model Adı', 'Başlık', 'Fiyat'] + LIST_ROW_COLUMNS
 
 
 def create_driver():
@@ -52,55 +49,315 @@ def create_driver():
         return None
 
 
-def main():
-    try:
-        # Dinamik input yolunu kullanıyoruz
-        with open(INPUT_FILE_PATH, 'r', encoding='utf-8') as f:
-            brand_urls = [line.strip() for line in f.readlines()]
-    except FileNotFoundError:
-        print(f"Hata: '{INPUT_FILE_PATH}' dosyası bulunamadı.")
-        return
+class ChromeFetcher:
+    """Ortak havuzdan bir Chrome oturumu ödünç alıp sayfa HTML'ini döner; istek aralığını throttle belirler."""
 
-    driver = create_driver()
-    if not driver:
-        return
+    def __init__(self, pool, throttle):
+        self.pool = pool
+        self.throttle = throttle
+
+    def fetch(self, url):
+        with self.throttle.request(), self.pool.session() as driver:
+            driver.get(url)
+            return driver.page_source
+
+    def close(self):
+        pass  # Oturumlar havuza aittir, havuzla birlikte kapanır
+
+
+def _digits(value):
+    """'2.390.000 TL' -> 2390000, '82.000 km' -> 82000; rakam yoksa None."""
+    rakamlar = ''.join(c for c in str(value or '') if c.isdigit())
+    return int(rakamlar) if rakamlar else None
+
+
+def listing_changed(ozet, ilan_data):
+    """Liste satırındaki fiyat ya da km, detay sayfasından kaydedilenden farklı mı?"""
+    for alan in DEGISIM_ALANLARI:
+        listede, kayitli = _digits(ozet.get(alan)), _digits(ilan_data.get(alan))
+        if listede is not None and kayitli is not None and listede != kayitli:
+            return True
+    return False
+
+
+DETAY_KARARLARI = metrics.counter('detail_queue_decisions_total', "Liste özetine göre detay kuyruğu kararları")
+
+
+class LinkWriter:
+    """Çalışanlardan gelen linkleri ilan numarasıyla tekilleştirip geldikleri anda dosyaya ve detay
+    kuyruğuna yazar.
+
+    Farklı kategorilerde (otomobil / arazi-suv-pick-up) farklı URL'le görünen ilan bir kez yazılır.
+    index_path verilirse dizin DIZIN_KAYIT_ARALIGI sayfada bir, dosyadaki konumuyla birlikte diske yazılır.
+    incremental=True ise daha önce detayı çekilmiş bir ilan yalnızca liste satırındaki fiyatı ya da
+    km'si değiştiyse yeniden kuyruğa girer; fiyatı eksik kalmış ilanın fiyatı listeden tamamlanır.
+    """
+
+    def __init__(self, file, state, index=None, incremental=ARTIMLI_DETAY, index_path=None):
+        self.file = file
+        self.state = state
+        self.index = index if index is not None else ListingIndex()
+        self.index_path = index_path
+        self.incremental = incremental
+        self.decisions = {}
+        self.pages = 0
+        self.lock = threading.Lock()
+
+    def _new(self, links):
+        with self.lock:
+            new_links = self.index.filter_new(links)
+            for link in new_links:
+                self.file.write(link + '\n')
+            self.file.flush()
+            self.pages += 1
+            if self.index_path and self.pages % DIZIN_KAYIT_ARALIGI == 0:
+                self.save_index()
+        return new_links
+
+    def save_index(self):
+        # Dosyadaki konum, bir sonraki çalışmada dizine eklenmemiş linklerin nereden okunacağını gösterir
+        self.index.save(self.index_path, ofset=self.file.tell())
+
+    def write(self, links):
+        new_links = self._new(links)
+        self.state.add('detay', new_links)
+        return len(new_links)
+
+    def write_rows(self, rows):
+        """Liste satırı özetlerini kaydeder; detay kuyruğunu artımlı moddaysa özetlere göre günceller."""
+        new_links = set(self._new([row['Link'] for row in rows]))
+        ozetler = {row['Link']: row for row in rows if row['Link'] in new_links}
+        with self.state.transaction():
+            self.state.put_payloads('ozet', ozetler)
+            if self.incremental:
+                self._queue_details(ozetler)
+            else:
+                self.state.add('detay', list(ozetler))
+        return len(ozetler)
 
-    total_links_found = 0
+    def _queue_details(self, ozetler):
+        kayitli = self.state.lookup('detay', ozetler)
+        yeni, degisen, fiyati_listeden = [], [], {}
+        for link, ozet in ozetler.items():
+            if link not in kayitli:
+                yeni.append(link)
+                continue
+            durum, ilan_data = kayitli[link]
+            if durum not in (DONE, PRICE_MISSING) or ilan_data is None:
+                continue  # Zaten kuyrukta
+            if listing_changed(ozet, ilan_data):
+                degisen.append(link)
+            elif durum == PRICE_MISSING and ozet.get('Fiyat'):
+                fiyati_listeden[link] = ozet['Fiyat']
 
-    # Dinamik output yolunu kullanıyoruz
-    with open(OUTPUT_FILE_PATH, 'w', encoding='utf-8') as f_ilanlar:
-        for brand_url in tqdm(brand_urls, desc="Tüm Markalar"):
-            last_page = get_last_page_for_brand(driver, brand_url)
-            print(f"\n-> {brand_url.split('/')[-1].upper()} markası için {last_page} sayfa taranacak...")
+        self.state.add('detay', yeni)
+        self.state.requeue('detay', degisen)
+        for link, fiyat in fiyati_listeden.items():
+            # price_fixer'ın bu ilan için detay sayfasını açmasına gerek kalmaz
+            self.state.update_payload('detay', link, {'Fiyat': fiyat})
+            self.state.mark_done('detay', link)
+            self.state.mark_done('fiyat', link, {'Fiyat': fiyat})
 
-            for page_num in tqdm(range(1, last_page + 1), desc=f"{brand_url.split('/')[-1]}"):
-                url = f"{brand_url}?page={page_num}"
+        sayilar = {'yeni': len(yeni), 'degisen': len(degisen), 'fiyat_listeden': len(fiyati_listeden)}
+        sayilar['atlanan'] = len(ozetler) - sum(sayilar.values())
+        with self.lock:
+            for karar, sayi in sayilar.items():
+                self.decisions[karar] = self.decisions.get(karar, 0) + sayi
+                if sayi:
+                    DETAY_KARARLARI.inc(sayi, karar=karar)
 
-                try:
-                    driver.get(url)
-                    time.sleep(random.uniform(2, 4))
 
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
+def export_summaries(state, index, output_path=SUMMARY_FILE_PATH):
+    """Bu taramada görülen (dizindeki) ilanların liste özetlerini CSV'ye yazar; satır sayısını döner."""
+    rows = [ozet for link, ozet in state.iter_payloads('ozet') if listing_id(link) in index]
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=OZET_SUTUNLARI, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
 
-                    ilan_listesi = soup.find_all("tr", class_="listing-list-item", id=True)
-                    if not ilan_listesi: continue
 
-                    for ilan_satiri in ilan_listesi:
-                        link_elementi = ilan_satiri.find("td", class_="listing-modelname").find('a')
-                        if link_elementi:
-                            ilan_linki = "https://www.arabam.com" + link_elementi.get('href')
-                            f_ilanlar.write(ilan_linki + '\n')
-                            total_links_found += 1
+def crawl_worker(worker_id, state, writer, fetcher, stats, stop, archive=None):
+    """stop: ortak threading.Event; bir çalışan havuzu tükenmiş bulursa kurar, diğerleri de durur."""
+    pages = 0
+    started = time.perf_counter()
 
-                except Exception as e:
-                    print(f"\n  !! Sayfa {url} işlenirken bir hata oluştu: {e}")
-                    continue
+    while not stop.is_set():
+        claimed = state.claim('liste')
+        if not claimed:
+            # Diğer çalışanlar hâlâ ilk sayfaları işliyorsa yeni sayfalar eklenebilir
+            if state.counts('liste').get(IN_PROGRESS, 0) == 0:
+                break
+            stop.wait(0.5)
+            continue
+
+        url = claimed[0]
+        try:
+            with metrics.span('scraper_fetch', asama='liste', calisan=worker_id):
+                html = fetcher.fetch(url)
+            with metrics.span('scraper_parse', asama='liste'):
+                if LISTE_OZETI:
+                    rows, last_page = parse_list_rows(html, url)
+                else:
+                    links, last_page = parse_list_page(html, url)
+
+            with metrics.span('scraper_write', asama='liste'):
+                if archive:
+                    archive.put(url, html, kind='liste')
+                # Markanın ilk sayfası aynı zamanda toplam sayfa sayısını verir
+                with state.transaction():
+                    if url.endswith('?page=1'):
+                        brand_url = url[:-len('?page=1')]
+                        sayfalar = [f"{brand_url}?page={p}" for p in range(2, last_page + 1)]
+                        # Önceki taramadan kalan sayfalar da bu taramada yeniden çekilmek üzere bekleyene döner
+                        state.add('liste', sayfalar)
+                        state.requeue('liste', sayfalar)
+                    state.mark_done('liste', url)
+
+                if LISTE_OZETI:
+                    writer.write_rows(rows)
+                else:
+                    writer.write(links)
+            metrics.SAYFALAR.inc(asama='liste', calisan=worker_id)
+        except PoolExhausted as e:
+            # Sayfa bir sonraki çalışmada tekrar denenmek üzere bekleyene döner; ortak havuz tükendiği için
+            # diğer çalışanlar da durdurulur (aksi halde bu sayfanın bitmesini sonsuza dek beklerler)
+            state.requeue('liste', [url])
+            stop.set()
+            print(f"\n  !! [Worker-{worker_id}] {e} Çalışanlar durduruluyor.")
+            break
+        except Exception as e:
+            state.mark_failed('liste', url, e)
+            print(f"\n  !! [Worker-{worker_id}] Sayfa {url} işlenirken bir hata oluştu: {e}")
+
+        pages += 1
+        if pages % RAPOR_ARALIGI == 0:
+            rate = pages / (time.perf_counter() - started)
+            print(f"[Worker-{worker_id}] {pages} sayfa, {rate:.2f} sayfa/sn")
+
+    stats[worker_id] = (pages, time.perf_counter() - started)
+
+
+def index_path_for(output_path):
+    return os.path.splitext(output_path)[0] + '.idx'
+
+
+def load_link_index(output_path, index_path):
+    """Link dizinini diskten yükler; son kayıttan sonra dosyaya yazılmış linkleri de ekler."""
+    index = ListingIndex.open(index_path)
+    offset = index.meta.get('ofset', 0)
+    if offset > os.path.getsize(output_path):
+        # Dizin başka bir link dosyasına ait; dosyadan baştan kurulur
+        index, offset = ListingIndex(), 0
+    with open(output_path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            index.add_url(line.decode('utf-8').strip())
+    return index
+
+
+def crawl_parallel(brand_urls, output_path, worker_count=CALISAN_SAYISI, fetcher_factory=None, state=None,
+                   summary_path=SUMMARY_FILE_PATH):
+    """(marka, sayfa) işlerini durum deposundan N çalışana dağıtır. Toplam tekil link sayısını döner.
+
+    Önceki tarama yarıda kaldıysa kalan sayfalardan devam eder; tamamlandıysa yeni tarama başlatır.
+    fetcher_factory verilmezse çalışanlar N oturumluk ortak bir Chrome havuzunu paylaşır.
+    LISTE_OZETI açıksa satır özetleri summary_path'e yazılır.
+    """
+    state = state or CrawlState()
+    state.reset_in_progress('liste')
+
+    # Deneme hakkı bitmiş hatalı sayfalar devam sebebi değildir; yalnızca onlar kaldıysa tarama baştan başlar
+    kalan = state.claimable('liste')
+    resume = kalan > 0 and os.path.exists(output_path)
+    index_path = index_path_for(output_path)
+    if resume:
+        print(f"[INFO] Önceki tarama yarıda kalmış, {kalan} sayfadan devam ediliyor.")
+        index = load_link_index(output_path, index_path)
+    else:
+        index = ListingIndex()
+    ilk_sayfalar = [f"{brand_url}?page=1" for brand_url in brand_urls]
+    state.add('liste', ilk_sayfalar)
+    if not resume:
+        # Yeni taramada yalnızca ilk sayfalar kuyruğa girer; önceki taramanın diğer sayfaları (artık
+        # olmayabilirler) ilk sayfa güncel son sayfayı bildirdiğinde, o sayıya kadar yeniden kuyruğa alınır
+        state.requeue('liste', ilk_sayfalar)
+
+    pool = None
+    if fetcher_factory is None:
+        pool = DriverPool(create_driver, worker_count, name='collect_links').start()
+        # Eski sabit bekleme (çalışan başına 2-4 sn) çalışanlar arasında paylaştırılmış olarak başlar
+        throttle = Throttle(name='collect_links', max_concurrency=worker_count, start_delay=ILK_BEKLEME / worker_count)
+        fetcher_factory = lambda: ChromeFetcher(pool, throttle)
+    fetchers = [fetcher_factory() for _ in range(worker_count)]
+    archive = open_archive()
+    stats = {}
+    stop = threading.Event()
+    metrics.serve()
+
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as f_ilanlar:
+        writer = LinkWriter(f_ilanlar, state, index, index_path=index_path)
+        threads = [threading.Thread(target=crawl_worker, args=(i, state, writer, fetchers[i], stats, stop, archive))
+                   for i in range(worker_count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.save_index()
+
+    for fetcher in fetchers:
+        fetcher.close()
+    if pool:
+        pool.close()
+    if archive:
+        archive.close()
+
+    for worker_id, (pages, elapsed) in sorted(stats.items()):
+        rate = pages / elapsed if elapsed else 0
+        print(f"[Worker-{worker_id}] Toplam {pages} sayfa, {rate:.2f} sayfa/sn")
+    if LISTE_OZETI:
+        yazilan = export_summaries(state, index, summary_path)
+        print(f"[INFO] {yazilan} ilanın liste özeti kaydedildi.")
+    if writer.decisions:
+        d = writer.decisions
+        print(f"[INFO] Detay kuyruğu: {d.get('yeni', 0)} yeni, {d.get('degisen', 0)} fiyatı/km'si değişen, "
+              f"{d.get('fiyat_listeden', 0)} fiyatı listeden tamamlanan, "
+              f"{d.get('atlanan', 0)} değişmediği için atlanan ilan.")
+    metrics.report('collect_links')
+
+    return len(index)
+
+
+def crawl_sequential(brand_urls, output_path):
+    """Tek Chrome oturumuyla tarama: crawl_parallel'in tek çalışanlı hali.
+
+    Aynı durum deposu, link dizini ve LinkWriter kullanılır; farklı kategorilerden gelen aynı ilan
+    bir kez yazılır ve yarıda kalan tarama kaldığı yerden devam eder.
+    """
+    try:
+        return crawl_parallel(brand_urls, output_path, worker_count=1)
+    except PoolExhausted as e:
+        print(f"[HATA] {e}")
+        return 0
+
+
+def main():
+    try:
+        # Dinamik input yolunu kullanıyoruz
+        with open(INPUT_FILE_PATH, 'r', encoding='utf-8') as f:
+            brand_urls = [line.strip() for line in f.readlines()]
+    except FileNotFoundError:
+        print(f"Hata: '{INPUT_FILE_PATH}' dosyası bulunamadı.")
+        return
 
-    driver.quit()
+    if PARALEL_MOD:
+        total_links_found = crawl_parallel(brand_urls, OUTPUT_FILE_PATH)
+    else:
+        total_links_found = crawl_sequential(brand_urls, OUTPUT_FILE_PATH)
 
     print("\n-------------------------------------------")
     print(f"Toplam {total_links_found} adet ilan linki '{OUTPUT_FILE_PATH}' dosyasına kaydedildi.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,206 @@
+"""Scraper'ların ortak tarama durumu (SQLite).
+
+Her iş (stage, url) çifti olarak tutulur; durumu, deneme sayısı ve son hatası kayıtlıdır.
+Her yazma kendi işleminde (transaction) yapılır, çökme durumunda en fazla üzerinde
+çalışılan iş kaybolur. Aynı dosyayı birden fazla süreç aynı anda kullanabilir (WAL).
+
+Aşamalar:
+    'liste' -> collect_links (marka?page=N sayfaları)
+    'ozet'  -> collect_links (liste satırlarındaki ilan özetleri, payload = fiyat, yıl, km, renk...)
+    'detay' -> scrape_details (ilan detay sayfaları, payload = ilan alanları)
+    'fiyat' -> price_fixer (fiyatı eksik ilanlar, payload = {'Fiyat': ...})
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+STATE_DB_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'tarama_durumu.sqlite')
+
+PENDING = 'pending'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+FAILED = 'failed'
+PRICE_MISSING = 'price_missing'
+
+MAKS_DENEME = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    stage TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    payload TEXT,
+    updated_at REAL,
+    UNIQUE (stage, url)
+);
+CREATE INDEX IF NOT EXISTS idx_items_stage_status ON items (stage, status, attempts);
+"""
+
+
+class CrawlState:
+
+    def __init__(self, path=STATE_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._in_transaction = False
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """İç içe çağrılabilir; yalnızca en dıştaki blok işlemi açıp kapatır."""
+        with self._lock:
+            if self._in_transaction:
+                yield self._conn
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._in_transaction = False
+
+    def add(self, stage, urls, status=PENDING):
+        """Yeni işleri ekler (var olanlara dokunmaz). Eklenen iş sayısını döner."""
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO items (stage, url, status, updated_at) VALUES (?, ?, ?, ?)",
+                             ((stage, url, status, time.time()) for url in urls))
+            return conn.total_changes - before
+
+    def claim(self, stage, limit=1, max_attempts=MAKS_DENEME):
+        """Bekleyen (veya deneme hakkı kalan hatalı) işleri kilitleyip url listesini döner."""
+        with self.transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, url FROM items WHERE stage = ? AND status = ? "
+                "UNION ALL "
+                "SELECT id, url FROM items WHERE stage = ? AND status = ? AND attempts < ? "
+                "ORDER BY id LIMIT ?",
+                (stage, PENDING, stage, FAILED, max_attempts, -1 if limit is None else limit)).fetchall()
+            conn.executemany("UPDATE items SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                             ((IN_PROGRESS, time.time(), row_id) for row_id, _ in rows))
+        return [url for _, url in rows]
+
+    def mark(self, stage, url, status, payload=None, error=None):
+        with self.transaction() as conn:
+            conn.execute("UPDATE items SET status = ?, payload = COALESCE(?, payload), last_error = ?, updated_at = ? "
+                         "WHERE stage = ? AND url = ?",
+                         (status, json.dumps(payload, ensure_ascii=False) if payload is not None else None,
+                          error, time.time(), stage, url))
+
+    def mark_done(self, stage, url, payload=None):
+        self.mark(stage, url, DONE, payload)
+
+    def mark_failed(self, stage, url, error):
+        self.mark(stage, url, FAILED, error=str(error)[:500])
+
+    def update_payload(self, stage, url, fields):
+        """Kayıtlı payload'un yalnızca verilen alanlarını günceller."""
+        with self.transaction() as conn:
+            row = conn.execute("SELECT payload FROM items WHERE stage = ? AND url = ?", (stage, url)).fetchone()
+            if row is None or row[0] is None:
+                return False
+            payload = json.loads(row[0])
+            payload.update(fields)
+            conn.execute("UPDATE items SET payload = ?, updated_at = ? WHERE stage = ? AND url = ?",
+                         (json.dumps(payload, ensure_ascii=False), time.time(), stage, url))
+            return True
+
+    def put_payloads(self, stage, payloads, status=DONE):
+        """{url: payload} kayıtlarını ekler ya da payload ve durumlarını üzerine yazar."""
+        with self.transaction() as conn:
+            now = time.time()
+            conn.executemany(
+                "INSERT INTO items (stage, url, status, payload, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (stage, url) DO UPDATE SET status = excluded.status, payload = excluded.payload, "
+                "updated_at = excluded.updated_at",
+                ((stage, url, status, json.dumps(payload, ensure_ascii=False), now)
+                 for url, payload in payloads.items()))
+
+    def lookup(self, stage, urls):
+        """Kayıtlı url'ler için {url: (durum, payload)} döner; payload yoksa None."""
+        urls = list(urls)
+        found = {}
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT url, status, payload FROM items WHERE stage = ? AND url IN ({','.join('?' * len(chunk))})",
+                    (stage, *chunk)).fetchall()
+                for url, status, payload in rows:
+                    found[url] = (status, json.loads(payload) if payload is not None else None)
+        return found
+
+    def requeue(self, stage, urls):
+        """Verilen işleri deneme sayılarıyla birlikte tekrar bekleyene çevirir (payload korunur)."""
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany("UPDATE items SET status = ?, attempts = 0, last_error = NULL, updated_at = ? "
+                             "WHERE stage = ? AND url = ?",
+                             ((PENDING, time.time(), stage, url) for url in urls))
+            return conn.total_changes - before
+
+    def reset_in_progress(self, stage):
+        """Yarıda kalmış bir çalışmadan kalan kilitli işleri tekrar bekleyene çevirir."""
+        with self.transaction() as conn:
+            return conn.execute("UPDATE items SET status = ? WHERE stage = ? AND status = ?",
+                                (PENDING, stage, IN_PROGRESS)).rowcount
+
+    def claimable(self, stage, max_attempts=MAKS_DENEME):
+        """claim'in verebileceği iş sayısı: bekleyenler ve deneme hakkı kalan hatalılar."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM items WHERE stage = ? AND (status = ? OR (status = ? AND attempts < ?))",
+                (stage, PENDING, FAILED, max_attempts)).fetchone()[0]
+
+    def counts(self, stage):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM items WHERE stage = ? GROUP BY status",
+                                      (stage,)).fetchall()
+        return dict(rows)
+
+    def last_id(self):
+        """Son eklenen işin sırası; iter_urls(after=...) ile bundan sonra eklenenler okunabilir."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM items").fetchone()[0]
+
+    def iter_urls(self, stage, batch_size=10000, after=0):
+        """Aşamadaki url'leri eklenme sırasıyla, parça parça okuyarak döner; after: bu sıradan sonrakiler."""
+        last_id = after
+        while True:
+            with self._lock:
+                rows = self._conn.execute("SELECT id, url FROM items WHERE stage = ? AND id > ? ORDER BY id LIMIT ?",
+                                          (stage, last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield from (url for _, url in rows)
+
+    def iter_payloads(self, stage, statuses=(DONE,)):
+        """(url, payload) çiftlerini eklenme sırasıyla döner."""
+        placeholders = ",".join("?" * len(statuses))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url, payload FROM items WHERE stage = ? AND status IN ({placeholders}) "
+                f"AND payload IS NOT NULL ORDER BY id", (stage, *statuses)).fetchall()
+        for url, payload in rows:
+            yield url, json.loads(payload)
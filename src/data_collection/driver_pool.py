@@ -0,0 +1,202 @@
+"""Scraper'ların ortak tarayıcı oturum havuzu.
+
+Havuz açılışta N oturumu sırayla başlatır (undetected_chromedriver'ın sürücü yamalaması eşzamanlı
+açılışlarda çakışır) ve işlere dağıtır. Bir oturum şu durumlarda kapatılıp yerine yenisi açılır:
+  * OTURUM_BASINA_SAYFA sayfadan sonra,
+  * tarayıcı süreç ağacının belleği MAKS_BELLEK_MB'ı aşınca (psutil kuruluysa),
+  * 'read timed out' / 'invalid session id' gibi oturumu bozan bir hatadan ya da başarısız
+    sağlık kontrolünden sonra.
+Sürücüyü üreten fonksiyon dışarıdan verilir; gerçek Chrome yerine sahte bir sürücüyle de
+çalışır (benchmarks/bench_driver_pool.py).
+
+    with DriverPool(create_driver, size=4, name='collect_links') as pool:
+        with pool.session() as driver:
+            driver.get(url)
+            html = driver.page_source
+"""
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+
+try:
+    import psutil
+except ImportError:  # İsteğe bağlı; yoksa bellek sınırı uygulanmaz
+    psutil = None
+
+# --- AYARLAR ---
+OTURUM_BASINA_SAYFA = 200     # Bu kadar sayfadan sonra oturum yenilenir (None: sınırsız)
+MAKS_BELLEK_MB = 1500         # Tarayıcı süreç ağacı bu RSS'i aşarsa oturum yenilenir (None: sınırsız)
+BELLEK_KONTROL_ARALIGI = 20   # Bellek kaç sayfada bir ölçülsün
+BEKLEME_SURESI = 300          # Boş oturum için en fazla kaç sn beklensin
+# ----------------
+
+BOZUK_OTURUM_NEDENLERI = ('read_timed_out', 'invalid_session_id')
+
+
+class PoolExhausted(RuntimeError):
+    """Havuzda çalışan oturum kalmadı (yenileri de başlatılamadı)."""
+
+
+def driver_memory_mb(driver):
+    """Sürücünün tarayıcı süreç ağacının toplam RSS'i (MB); ölçülemezse None."""
+    if psutil is None:
+        return None
+    pid = getattr(driver, 'browser_pid', None)  # undetected_chromedriver
+    if pid is None:
+        process = getattr(getattr(driver, 'service', None), 'process', None)  # selenium: chromedriver süreci
+        pid = getattr(process, 'pid', None)
+    if pid is None:
+        return None
+    try:
+        root = psutil.Process(pid)
+        return sum(p.memory_info().rss for p in [root] + root.children(recursive=True)) / 2 ** 20
+    except psutil.Error:
+        return None
+
+
+def is_healthy(driver):
+    """Oturum hâlâ komut kabul ediyor mu?"""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class PooledSession:
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """factory() ile üretilen sürücüleri ön ısıtır, dağıtır ve gerektiğinde yeniler. İş parçacığı güvenlidir."""
+
+    def __init__(self, factory, size=1, name='havuz', max_pages=OTURUM_BASINA_SAYFA, max_memory_mb=MAKS_BELLEK_MB,
+                 memory_probe=driver_memory_mb, health_check=is_healthy, wait_timeout=BEKLEME_SURESI):
+        self.factory = factory
+        self.size = size
+        self.name = name
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.memory_probe = memory_probe
+        self.health_check = health_check
+        self.wait_timeout = wait_timeout
+        self._idle = queue.Queue()
+        self._live = 0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """Oturumları sırayla açar; hiçbiri açılamazsa PoolExhausted."""
+        for _ in range(self.size):
+            driver = self._create()
+            if driver is not None:
+                with self._lock:
+                    self._live += 1
+                self._idle.put(PooledSession(driver))
+        if not self._live:
+            raise PoolExhausted(f"[{self.name}] Hiçbir tarayıcı oturumu başlatılamadı.")
+        return self
+
+    def _create(self):
+        # Fabrika hata fırlatabilir ya da None dönebilir; ikisi de başarısız açılış sayılır
+        with self._start_lock:
+            try:
+                with metrics.span('scraper_driver_start', betik=self.name):
+                    return self.factory()
+            except Exception as e:
+                print(f"[HATA] [{self.name}] Driver başlatılamadı: {e}")
+                return None
+
+    def _retire(self, session, reason):
+        """Oturumu kapatır, yerine yenisini açar; açılamazsa havuz bir küçülür."""
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+        driver = None
+        if not self._closed:
+            metrics.SURUCU_YENIDEN_BASLATMA.inc(betik=self.name, neden=reason)
+            print(f"[INFO] [{self.name}] Oturum yenileniyor ({reason}, {session.pages} sayfa).")
+            driver = self._create()
+        if driver is None:
+            with self._lock:
+                self._live -= 1
+        else:
+            self._idle.put(PooledSession(driver))
+
+    def acquire(self):
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                session = self._idle.get(timeout=1)
+            except queue.Empty:
+                if not self._live:
+                    raise PoolExhausted(f"[{self.name}] Çalışan tarayıcı oturumu kalmadı.")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"[{self.name}] {self.wait_timeout} sn içinde boş oturum bulunamadı.")
+                continue
+            if self.health_check(session.driver):
+                return session
+            self._retire(session, 'saglik')
+
+    def release(self, session, error=None):
+        session.pages += 1
+        reason = None
+        if self._closed:
+            reason = 'kapanis'
+        elif error is not None:
+            neden = metrics.classify_error(error)
+            if neden in BOZUK_OTURUM_NEDENLERI:
+                reason = neden
+            elif not self.health_check(session.driver):
+                reason = 'saglik'
+        # Hatalı ama sağlıklı görünen oturum da sayfa ve bellek sınırlarına tabidir
+        if reason is None:
+            reason = self._recycle_reason(session)
+
+        if reason:
+            self._retire(session, reason)
+        else:
+            self._idle.put(session)
+
+    def _recycle_reason(self, session):
+        if self.max_pages and session.pages >= self.max_pages:
+            return 'sayfa_siniri'
+        if self.max_memory_mb and session.pages % BELLEK_KONTROL_ARALIGI == 0:
+            mb = self.memory_probe(session.driver)
+            if mb is not None and mb > self.max_memory_mb:
+                return 'bellek'
+        return None
+
+    @contextmanager
+    def session(self):
+        """Bir oturumu blok süresince ödünç verir; blokta çıkan hata oturumun durumuna göre değerlendirilir."""
+        session = self.acquire()
+        try:
+            yield session.driver
+        except Exception as e:
+            self.release(session, e)
+            raise
+        self.release(session)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(session, 'kapanis')
@@ -3,10 +3,11 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import time
 import os
 
+from html_extract import parse_brand_links
+
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
 
@@ -42,18 +43,10 @@ def get_brand_links():
                 EC.presence_of_element_located((By.CLASS_NAME, "category-list-wrapper"))
             )
 
-            page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-
-            category_wrapper = soup.find('div', class_='category-list-wrapper')
+            links = parse_brand_links(driver.page_source, category_url)
 
-            if category_wrapper:
-                link_elements = category_wrapper.find_all('a', class_='list-item')
-                for link_element in link_elements:
-                    href = link_element.get('href')
-                    if href and href.startswith('/'):
-                        full_link = "https://www.arabam.com" + href
-                        brand_links.add(full_link)
+            if links is not None:
+                brand_links.update(links)
             else:
                 print(f"Uyarı: '{category_url}' için marka listesi kutusu bulunamadı.")
 
@@ -0,0 +1,101 @@
+"""Çekilen sayfaların sıkıştırılmış, içerik adresli yerel arşivi.
+
+Her sayfa gövdesi SHA-256 özetiyle adlandırılmış bir .html.gz dosyası olarak bir kez saklanır
+(aynı içerik tekrar yazılmaz). Hangi URL'nin hangi zamanda hangi içerikle çekildiği ayrı bir
+SQLite dizininde tutulur. Seçici değiştiğinde sayfalar ağa çıkmadan yeniden ayrıştırılabilir:
+    python src/data_collection/reextract.py
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from listing_index import listing_id
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+ARCHIVE_DIR = os.path.join(PROJECT_ROOT, 'data', 'raw', 'html_arsivi')
+
+# --- AYARLAR ---
+ARSIV_AKTIF = True
+SIKISTIRMA_SEVIYESI = 6
+# ----------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    ilan_no INTEGER,
+    kind TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_pages_kind ON pages (kind, url);
+"""
+
+def object_path(archive_dir, sha256):
+    return os.path.join(archive_dir, 'objects', sha256[:2], f"{sha256}.html.gz")
+
+
+def read_object(archive_dir, sha256):
+    with gzip.open(object_path(archive_dir, sha256), 'rt', encoding='utf-8') as f:
+        return f.read()
+
+
+class HtmlArchive:
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        os.makedirs(os.path.join(archive_dir, 'objects'), exist_ok=True)
+        self.archive_dir = archive_dir
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(archive_dir, 'index.sqlite'), timeout=60,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def put(self, url, html, kind='detay', fetched_at=None):
+        """Sayfayı arşivler ve içerik özetini döner."""
+        body = html.encode('utf-8')
+        sha256 = hashlib.sha256(body).hexdigest()
+        path = object_path(self.archive_dir, sha256)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(body, compresslevel=SIKISTIRMA_SEVIYESI))
+            os.replace(tmp_path, path)
+
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO pages (url, ilan_no, kind, fetched_at, sha256) VALUES (?, ?, ?, ?, ?)",
+                               (url, listing_id(url), kind, fetched_at or time.time(), sha256))
+        return sha256
+
+    def get(self, sha256):
+        return read_object(self.archive_dir, sha256)
+
+    def latest(self, kind='detay'):
+        """Her URL'nin en son çekilmiş halini [(url, sha256), ...] olarak döner."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, sha256 FROM pages p WHERE kind = ? AND fetched_at = "
+                "(SELECT MAX(fetched_at) FROM pages WHERE url = p.url AND kind = p.kind) ORDER BY id",
+                (kind,)).fetchall()
+
+    def history(self, url):
+        """Bir URL'nin tüm arşiv kayıtlarını [(fetched_at, sha256), ...] olarak döner."""
+        with self._lock:
+            return self._conn.execute("SELECT fetched_at, sha256 FROM pages WHERE url = ? ORDER BY fetched_at",
+                                      (url,)).fetchall()
+
+
+def open_archive(archive_dir=ARCHIVE_DIR):
+    """Arşiv kapalıysa None döner; scraper'lar bu durumda arşivlemeyi atlar."""
+    return HtmlArchive(archive_dir) if ARSIV_AKTIF else None
@@ -0,0 +1,323 @@
+"""Scraper'ların ortak HTML çıkarım katmanı.
+
+Alan çıkarma mantığı tek bir yerde, ayrıştırıcıdan bağımsız yazılmıştır. Aynı mantık
+'bs4' (BeautifulSoup + html.parser), 'lxml' veya 'selectolax' üzerinde çalışabilir;
+hepsi aynı sözlükleri üretir. Karşılaştırma: benchmarks/bench_html_parsers.py
+"""
+from urllib.parse import urljoin
+
+# --- AYARLAR ---
+# None: kurulu olan en hızlı backend seçilir (selectolax > lxml > bs4)
+VARSAYILAN_BACKEND = None
+# ----------------
+
+PRICE_SELECTORS = [
+    ("div", "desktop-information-price"),
+    ("div", "product-price"),
+    ("span", "product-price-new"),
+    ("span", "price"),
+    ("div", "price-container")
+]
+
+# Liste satırındaki 'listing-text' hücrelerinin sırası
+LIST_ROW_COLUMNS = ['Yıl', 'Kilometre', 'Renk', 'İlan Tarihi', 'İl / İlçe']
+
+
+class Bs4Backend:
+    name = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def parse(self, html):
+        return self._soup(html, 'html.parser')
+
+    def find_all(self, node, tag=None, cls=None, attrs=None):
+        kwargs = dict(attrs or {})
+        if cls:
+            kwargs['class_'] = cls
+        return node.find_all(tag or True, **kwargs)
+
+    def find(self, node, tag=None, cls=None, attrs=None):
+        kwargs = dict(attrs or {})
+        if cls:
+            kwargs['class_'] = cls
+        return node.find(tag or True, **kwargs)
+
+    def text(self, node):
+        return node.text
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        # fromstring, <html> ile başlamayan girdiyi parça olarak ayrıştırıp kök öğeyi döner; kök .//
+        # sorgularına takılmaz. document_fromstring her girdiyi tam belge olarak sarar (bs4 gibi).
+        self._fromstring = lxml.html.document_fromstring
+        self._utf8_parser = lxml.html.HTMLParser(encoding='utf-8')
+        self._parser_error = etree.ParserError
+        self._strip_elements = etree.strip_elements
+        self._xpath = etree.XPath
+        self._cache = {}
+
+    def parse(self, html):
+        # lxml, <?xml encoding=...?> bildirimi taşıyan str'yi reddeder (ValueError); str bayt olarak verilir
+        parser = None
+        if isinstance(html, str):
+            html, parser = html.encode('utf-8'), self._utf8_parser
+        try:
+            root = self._fromstring(html, parser=parser)
+        except self._parser_error:
+            # Boş ya da yalnızca boşluktan oluşan sayfa: diğer backend'ler gibi alanlar None döner
+            return self._fromstring('<html></html>')
+        # bs4'ün .text'i gibi script/style içeriği metne karışmaz
+        self._strip_elements(root, 'script', 'style', with_tail=False)
+        return root
+
+    def _compile(self, tag, cls, attrs):
+        key = (tag, cls, tuple(sorted((attrs or {}).items())))
+        if key not in self._cache:
+            conditions = []
+            if cls:
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')")
+            for name, value in (attrs or {}).items():
+                conditions.append(f"@{name}" if value is True else f"@{name}='{value}'")
+            expr = f".//{tag or '*'}" + "".join(f"[{c}]" for c in conditions)
+            self._cache[key] = self._xpath(expr)
+        return self._cache[key]
+
+    def find_all(self, node, tag=None, cls=None, attrs=None):
+        return self._compile(tag, cls, attrs)(node)
+
+    def find(self, node, tag=None, cls=None, attrs=None):
+        found = self._compile(tag, cls, attrs)(node)
+        return found[0] if found else None
+
+    def text(self, node):
+        return node.text_content()
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class SelectolaxBackend:
+    name = 'selectolax'
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:
+            from selectolax.parser import HTMLParser
+        self._parser = HTMLParser
+
+    def parse(self, html):
+        tree = self._parser(html)
+        # bs4'ün .text'i gibi script/style içeriği metne karışmaz
+        tree.strip_tags(['script', 'style'])
+        return tree
+
+    @staticmethod
+    def _selector(tag, cls, attrs):
+        selector = (tag or '*') + (f".{cls}" if cls else '')
+        for name, value in (attrs or {}).items():
+            selector += f"[{name}]" if value is True else f'[{name}="{value}"]'
+        return selector
+
+    def find_all(self, node, tag=None, cls=None, attrs=None):
+        return node.css(self._selector(tag, cls, attrs))
+
+    def find(self, node, tag=None, cls=None, attrs=None):
+        return node.css_first(self._selector(tag, cls, attrs))
+
+    def text(self, node):
+        return node.text(deep=True)
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+
+BACKENDS = {'bs4': Bs4Backend, 'lxml': LxmlBackend, 'selectolax': SelectolaxBackend}
+_instances = {}
+
+
+def available_backends():
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+            names.append(name)
+        except ImportError:
+            continue
+    return names
+
+
+def get_backend(name=None):
+    """Backend örneğini döner; isim verilmezse kurulu olan en hızlısını seçer."""
+    name = name or VARSAYILAN_BACKEND
+    if name is None:
+        for candidate in ('selectolax', 'lxml', 'bs4'):
+            try:
+                return get_backend(candidate)
+            except ImportError:
+                continue
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+
+def _text_or_none(b, node):
+    return b.text(node).strip() if node is not None else None
+
+
+def parse_listing(html, ilan_linki, backend=None):
+    """İlan detay sayfasından scrape_details'in alan sözlüğünü çıkarır."""
+    b = get_backend(backend)
+    root = b.parse(html)
+    ilan_data = {'Link': ilan_linki}
+
+    ilan_data['Başlık'] = _text_or_none(b, b.find(root, "div", "product-title"))
+    ilan_data['Fiyat'] = _text_or_none(b, b.find(root, "span", "product-price-new"))
+
+    for item in b.find_all(root, "div", "property-item"):
+        key_element = b.find(item, "div", "property-key")
+        value_element = b.find(item, "div", "property-value")
+        if key_element is not None and value_element is not None:
+            ilan_data[b.text(key_element).strip()] = b.text(value_element).strip()
+
+    tramer = None
+    for container in b.find_all(root, None, "tramer-info"):
+        tramer = b.find(container, None, "property-value")
+        if tramer is not None:
+            break
+    ilan_data['Tramer'] = _text_or_none(b, tramer)
+
+    hasar_bilgileri = {}
+    damage_info_container = b.find(root, "div", "car-damage-info")
+    if damage_info_container is not None:
+        for item in b.find_all(damage_info_container, "div", "car-damage-info-item"):
+            status_element = b.find(item, "p")
+            if status_element is not None:
+                status = b.text(status_element).strip()
+                parts_list = [b.text(li).strip() for li in b.find_all(item, "li")]
+                parts = ", ".join([p for p in parts_list if p != "-"])
+                hasar_bilgileri[status] = parts if parts else "Yok"
+
+    ilan_data['Boyalı Parçalar'] = hasar_bilgileri.get('Boyalı', 'Belirtilmemiş')
+    ilan_data['Lokal Boyalı Parçalar'] = hasar_bilgileri.get('Lokal boyalı', 'Belirtilmemiş')
+    ilan_data['Değişen Parçalar'] = hasar_bilgileri.get('Değişmiş', 'Belirtilmemiş')
+
+    return ilan_data
+
+
+def parse_price(html, backend=None):
+    """price_fixer'ın seçici listesiyle fiyatı bulur; yoksa 'Bulunamadı' döner."""
+    b = get_backend(backend)
+    root = b.parse(html)
+    for tag, cls in PRICE_SELECTORS:
+        elm = b.find(root, tag, cls)
+        if elm is not None:
+            txt = b.text(elm).strip()
+            if "TL" in txt or any(c.isdigit() for c in txt):
+                return txt
+    return "Bulunamadı"
+
+
+def _last_page(b, root):
+    pagination_ul = b.find(root, 'ul', 'pagination')
+    if pagination_ul is None: return 1
+
+    last_page_link = b.find(pagination_ul, 'a', attrs={'title': 'Son Sayfa'})
+    if last_page_link is None:
+        all_li = b.find_all(pagination_ul, 'li')
+        if len(all_li) > 2:
+            return int(b.text(all_li[-2]).strip())
+        return 1
+
+    href = b.attr(last_page_link, 'href')
+    return int(href.split('page=')[-1])
+
+
+def _listing_links(b, root, page_url):
+    links = []
+    for ilan_satiri in b.find_all(root, "tr", "listing-list-item", {'id': True}):
+        model_cell = b.find(ilan_satiri, "td", "listing-modelname")
+        link_elementi = b.find(model_cell, 'a') if model_cell is not None else None
+        if link_elementi is not None:
+            links.append(urljoin(page_url, b.attr(link_elementi, 'href')))
+    return links
+
+
+def _listing_rows(b, root, page_url):
+    rows = []
+    for ilan_satiri in b.find_all(root, "tr", "listing-list-item", {'id': True}):
+        model_cell = b.find(ilan_satiri, "td", "listing-modelname")
+        link_elementi = b.find(model_cell, 'a') if model_cell is not None else None
+        if link_elementi is None:
+            continue
+        ozet = {'Link': urljoin(page_url, b.attr(link_elementi, 'href'))}
+        satir_id = b.attr(ilan_satiri, 'id') or ''
+        ozet['İlan No'] = satir_id[len('listing'):] if satir_id.startswith('listing') else None
+        ozet['Model Adı'] = b.text(link_elementi).strip()
+        ozet['Başlık'] = _text_or_none(b, b.find(ilan_satiri, None, "listing-title-lines"))
+        ozet['Fiyat'] = _text_or_none(b, b.find(ilan_satiri, "span", "listing-price"))
+
+        # Sırasıyla: Yıl, Kilometre, Renk, İlan Tarihi, İl / İlçe
+        hucreler = [b.text(td).strip() for td in b.find_all(ilan_satiri, "td", "listing-text")]
+        for i, alan in enumerate(LIST_ROW_COLUMNS):
+            ozet[alan] = hucreler[i] if i < len(hucreler) else None
+        rows.append(ozet)
+    return rows
+
+
+def parse_last_page(html, backend=None):
+    """Liste sayfasının sayfalama bölümünden son sayfa numarasını çıkarır."""
+    b = get_backend(backend)
+    return _last_page(b, b.parse(html))
+
+
+def parse_listing_links(html, page_url, backend=None):
+    """Liste sayfasındaki ilan satırlarından tam ilan linklerini çıkarır."""
+    b = get_backend(backend)
+    return _listing_links(b, b.parse(html), page_url)
+
+
+def parse_list_page(html, page_url, backend=None):
+    """Liste sayfasını bir kez ayrıştırıp (ilan_linkleri, son_sayfa) döner."""
+    b = get_backend(backend)
+    root = b.parse(html)
+    return _listing_links(b, root, page_url), _last_page(b, root)
+
+
+def parse_list_rows(html, page_url, backend=None):
+    """Liste sayfasını bir kez ayrıştırıp (ilan_ozetleri, son_sayfa) döner.
+
+    Her özet, satırdaki linkle birlikte İlan No, Fiyat, Yıl, Kilometre, Renk, İlan Tarihi
+    ve İl / İlçe sütunlarını içerir.
+    """
+    b = get_backend(backend)
+    root = b.parse(html)
+    return _listing_rows(b, root, page_url), _last_page(b, root)
+
+
+def parse_brand_links(html, page_url, backend=None):
+    """Kategori sayfasındaki marka linklerini döner; marka kutusu yoksa None."""
+    b = get_backend(backend)
+    root = b.parse(html)
+
+    category_wrapper = b.find(root, 'div', 'category-list-wrapper')
+    if category_wrapper is None:
+        return None
+
+    links = []
+    for link_element in b.find_all(category_wrapper, 'a', 'list-item'):
+        href = b.attr(link_element, 'href')
+        if href and href.startswith('/'):
+            links.append(urljoin(page_url, href))
+    return links
@@ -0,0 +1,233 @@
+"""İlan numaralarının sıkıştırılmış kümesi (sayfalı bit eşlem).
+
+Linkler her yerde tam URL olarak taşınıyordu; aynı ilan farklı kategorilerden farklı URL'lerle
+gelince (otomobil / arazi-suv-pick-up) tekrar yazılıyor, tekrar çekiliyordu. Kimlik artık URL'nin
+sonundaki ilan numarasıdır:
+    https://www.arabam.com/ilan/galeriden-satilik-fiat-egea/temiz-arac/27500000 -> 27500000
+
+Numaralar 65536'lık bloklara bölünür; her dolu blok 8 KB'lık bir bit eşlemdir. Ekleme ve sorgu
+O(1), bellek ilan sayısıyla değil kapsanan numara aralığıyla büyür (ardışık 10 milyon numara
+yaklaşık 1,2 MB). Dizin diske atomik olarak yazılır ve yanında küçük bir JSON üst bilgi taşır.
+Karşılaştırma: benchmarks/bench_listing_index.py
+
+    index = ListingIndex.open('data/raw/ilan_linkleri.idx')
+    yeni_linkler = index.filter_new(linkler)
+    index.save('data/raw/ilan_linkleri.idx', ofset=f.tell())
+"""
+import json
+import os
+import struct
+import threading
+
+import numpy as np
+
+BLOK_BITI = 16
+BLOK_BOYUTU = 1 << BLOK_BITI          # Blok başına ilan numarası
+BLOK_BAYTI = BLOK_BOYUTU // 8
+DOSYA_IMZASI = b'ILANIDX1\n'
+
+_BIT_SAYISI = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+def listing_id(url):
+    """URL'nin sonundaki ilan numarası; yoksa None."""
+    if not url:
+        return None
+    tail = url.partition('?')[0].partition('#')[0].rstrip('/').rpartition('/')[2]
+    return int(tail) if tail.isascii() and tail.isdigit() else None
+
+
+class ListingIndex:
+    """İlan numarası kümesi. İş parçacığı güvenlidir.
+
+    Numarası çıkarılamayan URL'ler (filter_new/add_url) ayrı, küçük bir kümede tutulur ve diske yazılmaz.
+    """
+
+    def __init__(self):
+        self._blocks = {}
+        self._count = 0
+        self._urls = set()
+        self._lock = threading.Lock()
+        self.meta = {}
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, ilan_no):
+        block = self._blocks.get(ilan_no >> BLOK_BITI)
+        if block is None:
+            return False
+        low = ilan_no & (BLOK_BOYUTU - 1)
+        return bool(block[low >> 3] & (1 << (low & 7)))
+
+    def __iter__(self):
+        """Numaraları küçükten büyüğe döner."""
+        for high in sorted(self._blocks):
+            bits = np.unpackbits(np.frombuffer(self._blocks[high], dtype=np.uint8), bitorder='little')
+            yield from (int(i) + (high << BLOK_BITI) for i in np.flatnonzero(bits))
+
+    def _add(self, ilan_no):
+        high, low = ilan_no >> BLOK_BITI, ilan_no & (BLOK_BOYUTU - 1)
+        block = self._blocks.get(high)
+        if block is None:
+            block = self._blocks[high] = bytearray(BLOK_BAYTI)
+        mask = 1 << (low & 7)
+        if block[low >> 3] & mask:
+            return False
+        block[low >> 3] |= mask
+        self._count += 1
+        return True
+
+    def add(self, ilan_no):
+        """Numarayı ekler; daha önce yoksa True döner."""
+        with self._lock:
+            return self._add(ilan_no)
+
+    def _add_url(self, url, ilan_no):
+        if ilan_no is not None:
+            return self._add(ilan_no)
+        if url in self._urls:
+            return False
+        self._urls.add(url)
+        return True
+
+    def add_url(self, url):
+        ilan_no = listing_id(url)
+        with self._lock:
+            return self._add_url(url, ilan_no)
+
+    def filter_new(self, urls):
+        """Numarası dizinde olmayan URL'leri (aynı numaradan ilkini) ekleyip sırasıyla döner."""
+        pairs = [(url, listing_id(url)) for url in urls]
+        with self._lock:
+            return [url for url, ilan_no in pairs if self._add_url(url, ilan_no)]
+
+    def add_many(self, ids):
+        """Numaraları toplu ekler; her biri için 'yeni miydi' maskesini döner (tekrarlardan ilki yeni sayılır)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return np.zeros(0, dtype=bool)
+        # Aynı numaranın ilk görüldüğü yerler
+        order = np.argsort(ids, kind='stable')
+        sorted_ids = ids[order]
+        first = np.ones(len(ids), dtype=bool)
+        first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+        unique = sorted_ids[first]
+
+        with self._lock:
+            was_present = self._contains_sorted(unique)
+            new_ids = unique[~was_present]
+            highs = new_ids >> BLOK_BITI
+            lows = new_ids & (BLOK_BOYUTU - 1)
+            bounds = np.flatnonzero(np.diff(highs)) + 1
+            for chunk_high, chunk_low in zip(np.split(highs, bounds), np.split(lows, bounds)):
+                if not len(chunk_high):
+                    continue
+                high = int(chunk_high[0])
+                block = self._blocks.get(high)
+                if block is None:
+                    block = self._blocks[high] = bytearray(BLOK_BAYTI)
+                view = np.frombuffer(block, dtype=np.uint8)
+                np.bitwise_or.at(view, chunk_low >> 3, (1 << (chunk_low & 7)).astype(np.uint8))
+            self._count += len(new_ids)
+
+        new_sorted = np.zeros(len(ids), dtype=bool)
+        new_sorted[first] = ~was_present
+        new_mask = np.empty(len(ids), dtype=bool)
+        new_mask[order] = new_sorted
+        return new_mask
+
+    def contains_many(self, ids):
+        """Her numara için dizinde olup olmadığını maske olarak döner."""
+        ids = np.asarray(ids, dtype=np.int64)
+        order = np.argsort(ids, kind='stable')
+        with self._lock:
+            found_sorted = self._contains_sorted(ids[order])
+        found = np.empty(len(ids), dtype=bool)
+        found[order] = found_sorted
+        return found
+
+    def _contains_sorted(self, sorted_ids):
+        found = np.zeros(len(sorted_ids), dtype=bool)
+        if not len(sorted_ids):
+            return found
+        highs = sorted_ids >> BLOK_BITI
+        bounds = np.flatnonzero(np.diff(highs)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(sorted_ids)]))
+        for start, end in zip(starts, ends):
+            block = self._blocks.get(int(highs[start]))
+            if block is None:
+                continue
+            lows = sorted_ids[start:end] & (BLOK_BOYUTU - 1)
+            view = np.frombuffer(block, dtype=np.uint8)
+            found[start:end] = (view[lows >> 3] >> (lows & 7).astype(np.uint8)) & 1
+        return found
+
+    def nbytes(self):
+        return len(self._blocks) * BLOK_BAYTI
+
+    # --- Disk ---
+    def save(self, path, **meta):
+        """Dizini geçici dosyaya yazıp yerine taşır; meta üst bilgiye eklenir."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._lock:
+            self.meta.update(meta)
+            header = json.dumps({'sayi': self._count, 'blok': len(self._blocks), **self.meta}, ensure_ascii=False)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(DOSYA_IMZASI)
+                f.write(header.encode('utf-8') + b'\n')
+                for high in sorted(self._blocks):
+                    f.write(struct.pack('<Q', high))
+                    f.write(self._blocks[high])
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path, 'rb') as f:
+            if f.readline() != DOSYA_IMZASI:
+                raise ValueError(f"'{path}' bir ilan dizini değil.")
+            header = json.loads(f.readline().decode('utf-8'))
+            for _ in range(header.pop('blok')):
+                high, = struct.unpack('<Q', f.read(8))
+                block = bytearray(f.read(BLOK_BAYTI))
+                index._blocks[high] = block
+                index._count += int(_BIT_SAYISI[np.frombuffer(block, dtype=np.uint8)].sum())
+        header.pop('sayi')
+        index.meta = header
+        return index
+
+    @classmethod
+    def open(cls, path):
+        """Dosya varsa yükler, yoksa boş dizin döner."""
+        return cls.load(path) if os.path.exists(path) else cls()
+
+
+def open_stage_index(state, stage, path):
+    """Durum deposundaki bir aşamanın ilan dizinini (dizin, son_id) olarak döner.
+
+    Dizin diskten yüklenir ve yalnızca kaydedildiği andan sonra aşamaya eklenen url'ler depodan okunur;
+    dosya yoksa ya da başka bir depoya aitse tüm aşamadan kurulur. son_id, dizinle birlikte
+    save(path, son_id=son_id) olarak kaydedilmelidir.
+    """
+    son_id = state.last_id()
+    index = ListingIndex.open(path)
+    after = index.meta.get('son_id', 0)
+    if after > son_id:
+        index, after = ListingIndex(), 0
+    for url in state.iter_urls(stage, after=after):
+        index.add_url(url)
+    return index, son_id
+
+
+def keep_latest(rows, link_key='Link'):
+    """Aynı ilan numarasından yalnızca son satırı bırakır; sıra korunur.
+
+    link_key: satırdaki linkin anahtarı ya da sırası.
+    """
+    index = ListingIndex()
+    kept = [row for row in reversed(rows) if index.add_url(row[link_key])]
+    kept.reverse()
+    return kept
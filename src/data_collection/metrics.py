@@ -0,0 +1,376 @@
+"""Scraper'ların ortak ölçüm katmanı: sayaçlar, göstergeler, histogramlar ve zamanlama aralıkları (span).
+
+Ölçümler süreç içinde tutulur. Betik sonunda data/raw/metrikler/<betik>.json dosyasına yazılır
+ve özet olarak ekrana basılır. METRIK_PORTU ayarlıysa tarama sürerken Prometheus metin biçimi
+http://127.0.0.1:<port>/metrics, JSON biçimi /metrics.json adresinden okunabilir. Scraper'lar
+çalışanlarını iş parçacığı olarak aynı süreçte çalıştırır, bu yüzden tek kayıt defteri yeterlidir.
+IZ_DOSYASI ayarlıysa her span ayrıca JSON satırı olarak bu dosyaya eklenir (zaman çizelgesi için).
+
+Kayıtlı dosyaların (ör. birden fazla betiğin) birleşik özeti:
+    python src/data_collection/metrics.py data/raw/metrikler/*.json
+    python src/data_collection/metrics.py data/raw/metrikler/price_fixer.json --prometheus
+"""
+import argparse
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+METRICS_DIR = os.path.join(PROJECT_ROOT, 'data', 'raw', 'metrikler')
+
+# --- AYARLAR ---
+METRIK_PORTU = None  # Ör. 9100; None ise HTTP uç noktası açılmaz
+IZ_DOSYASI = None    # Ör. os.path.join(METRICS_DIR, 'izler.jsonl'); None ise span'ler dosyaya yazılmaz
+# ----------------
+
+VARSAYILAN_KOVALAR = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.values.get(_label_key(labels), 0)
+
+    def snapshot(self):
+        with self._lock:
+            return [{'etiketler': dict(key), 'deger': value} for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    """Anlık değer (ör. güncel bekleme süresi); birleştirmede en son görüntünün değeri alınır."""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self.values[_label_key(labels)] = value
+
+
+class Histogram:
+    """Prometheus tarzı kovalı histogram (kovalar üst sınırdır, saniye cinsinden)."""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=VARSAYILAN_KOVALAR):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.values = {}  # etiket -> [kova adetleri (+Inf dahil), toplam, adet]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            item = self.values.get(key)
+            if item is None:
+                item = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            item[0][bisect.bisect_left(self.buckets, value)] += 1
+            item[1] += value
+            item[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [{'etiketler': dict(key), 'kovalar': list(counts), 'toplam': total, 'adet': n}
+                    for key, (counts, total, n) in self.values.items()]
+
+
+class Registry:
+
+    def __init__(self):
+        self.metrics = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name, help_text=''):
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text=''):
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name, help_text='', buckets=VARSAYILAN_KOVALAR):
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def snapshot(self):
+        """JSON'a yazılabilir anlık görüntü."""
+        metrics = {}
+        for name, metric in list(self.metrics.items()):
+            entry = {'tur': metric.kind, 'yardim': metric.help, 'degerler': metric.snapshot()}
+            if metric.kind == 'histogram':
+                entry['sinirlar'] = list(metric.buckets)
+            metrics[name] = entry
+        return {'baslangic': self.started, 'zaman': time.time(), 'pid': os.getpid(), 'metrikler': metrics}
+
+
+
+REGISTRY = Registry()
+_trace_lock = threading.Lock()
+
+
+def counter(name, help_text=''):
+    return REGISTRY.counter(name, help_text)
+
+
+def gauge(name, help_text=''):
+    return REGISTRY.gauge(name, help_text)
+
+
+def histogram(name, help_text='', buckets=VARSAYILAN_KOVALAR):
+    return REGISTRY.histogram(name, help_text, buckets)
+
+
+# Scraper'ların ortak sayaçları; süreler span('scraper_fetch' | 'scraper_parse' | 'scraper_write', ...) ile tutulur
+SAYFALAR = counter('scraper_pages_total', "Kaydedilen sayfa sayısı")
+ISTEKLER = counter('scraper_requests_total', "Sonuçlanan HTTP istekleri (sonuç: durum kodu ya da hata türü)")
+TEKRARLAR = counter('scraper_retries_total', "Tekrar denenen istekler")
+SURUCU_YENIDEN_BASLATMA = counter('scraper_driver_restarts_total', "Chrome sürücüsünün yeniden başlatılma sayısı")
+FIYAT_SONUCLARI = counter('price_fixer_results_total', "Fiyat sayfası sonuçları (bulundu, Bulunamadı, Hata)")
+
+
+@contextmanager
+def span(name, **labels):
+    """Bloğun süresini <name>_seconds histogramına yazar; hata çıkarsa <name>_errors_total artar."""
+    started_at = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        counter(f"{name}_errors_total", f"{name} sırasında oluşan hatalar").inc(**labels, hata=error)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram(f"{name}_seconds", f"{name} süresi (sn)").observe(elapsed, **labels)
+        if IZ_DOSYASI:
+            _write_trace({'ad': name, 'etiketler': labels, 'baslangic': started_at, 'sure': elapsed,
+                          'hata': error, 'pid': os.getpid(), 'is_parcacigi': threading.get_ident()})
+
+
+def _write_trace(record):
+    with _trace_lock:
+        os.makedirs(os.path.dirname(IZ_DOSYASI), exist_ok=True)
+        with open(IZ_DOSYASI, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def classify_error(error):
+    """Sürücü hatalarını yeniden başlatma nedenine çevirir."""
+    text = str(error).lower()
+    if "read timed out" in text:
+        return 'read_timed_out'
+    if "invalid session id" in text:
+        return 'invalid_session_id'
+    if "timeout" in text or "timed out" in text:
+        return 'zaman_asimi'
+    return type(error).__name__
+
+
+# --- Birleştirme ve dışa aktarma ---
+def merge_snapshots(snapshots):
+    """Birden fazla sürecin anlık görüntülerini toplar (sayaçlar ve histogramlar etiket bazında)."""
+    merged = {'baslangic': min(s['baslangic'] for s in snapshots), 'zaman': max(s['zaman'] for s in snapshots),
+              'pid': None, 'metrikler': {}}
+    for snapshot in sorted(snapshots, key=lambda s: s['zaman']):
+        for name, entry in snapshot['metrikler'].items():
+            target = merged['metrikler'].setdefault(name, {**entry, 'degerler': []})
+            by_labels = {_label_key(v['etiketler']): v for v in target['degerler']}
+            for value in entry['degerler']:
+                key = _label_key(value['etiketler'])
+                if key not in by_labels:
+                    by_labels[key] = json.loads(json.dumps(value))
+                    target['degerler'].append(by_labels[key])
+                elif entry['tur'] == 'counter':
+                    by_labels[key]['deger'] += value['deger']
+                elif entry['tur'] == 'gauge':
+                    by_labels[key]['deger'] = value['deger']
+                else:
+                    current = by_labels[key]
+                    current['kovalar'] = [a + b for a, b in zip(current['kovalar'], value['kovalar'])]
+                    current['toplam'] += value['toplam']
+                    current['adet'] += value['adet']
+    return merged
+
+
+def _prometheus_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    escaped = [f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in items]
+    return '{' + ','.join(escaped) + '}'
+
+
+def to_prometheus(snapshot):
+    """Prometheus metin biçimi (0.0.4)."""
+    lines = []
+    for name, entry in sorted(snapshot['metrikler'].items()):
+        lines.append(f"# HELP {name} {entry['yardim']}")
+        lines.append(f"# TYPE {name} {entry['tur']}")
+        for value in entry['degerler']:
+            labels = value['etiketler']
+            if entry['tur'] in ('counter', 'gauge'):
+                lines.append(f"{name}{_prometheus_labels(labels)} {value['deger']}")
+                continue
+            cumulative = 0
+            for bound, count in zip(entry['sinirlar'] + ['+Inf'], value['kovalar']):
+                cumulative += count
+                lines.append(f"{name}_bucket{_prometheus_labels(labels, {'le': bound})} {cumulative}")
+            lines.append(f"{name}_sum{_prometheus_labels(labels)} {value['toplam']}")
+            lines.append(f"{name}_count{_prometheus_labels(labels)} {value['adet']}")
+    return '\n'.join(lines) + '\n'
+
+
+def histogram_quantile(bounds, counts, q):
+    """Kova adetlerinden yaklaşık yüzdelik (kova içinde doğrusal dağılım varsayılır)."""
+    total = sum(counts)
+    if not total:
+        return None
+    target = q * total
+    cumulative, lower = 0, 0.0
+    for bound, count in zip(list(bounds) + [float('inf')], counts):
+        if count and cumulative + count >= target:
+            if bound == float('inf'):
+                return lower
+            return lower + (bound - lower) * (target - cumulative) / count
+        cumulative += count
+        lower = bound
+    return lower
+
+
+def summarize(snapshot):
+    """Anlık görüntünün okunabilir özeti (satır listesi)."""
+    elapsed = max(snapshot['zaman'] - snapshot['baslangic'], 1e-9)
+    lines = [f"Süre: {elapsed:.0f} sn"]
+    for name, entry in sorted(snapshot['metrikler'].items()):
+        for value in sorted(entry['degerler'], key=lambda v: _label_key(v['etiketler'])):
+            labels = ', '.join(f"{k}={v}" for k, v in sorted(value['etiketler'].items()))
+            if entry['tur'] == 'counter':
+                lines.append(f"{name} [{labels}]: {value['deger']:g} ({value['deger'] / elapsed:.2f}/sn)")
+            elif entry['tur'] == 'gauge':
+                lines.append(f"{name} [{labels}]: {value['deger']:g}")
+            elif value['adet']:
+                p50 = histogram_quantile(entry['sinirlar'], value['kovalar'], 0.50)
+                p99 = histogram_quantile(entry['sinirlar'], value['kovalar'], 0.99)
+                lines.append(f"{name} [{labels}]: {value['adet']} kez, ort {value['toplam'] / value['adet']:.3f} sn, "
+                             f"p50 ~{p50:.3f} sn, p99 ~{p99:.3f} sn, toplam {value['toplam']:.1f} sn")
+    return lines
+
+
+def snapshot_path(name, metrics_dir=METRICS_DIR):
+    return os.path.join(metrics_dir, f"{name}.json")
+
+
+def write_json(path, snapshot=None):
+    snapshot = snapshot or REGISTRY.snapshot()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshots(paths):
+    snapshots = []
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8') as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # Betik o anda dosyayı yazıyor olabilir
+    return snapshots
+
+
+def report(name):
+    """Betik sonunda çağrılır: ölçümleri data/raw/metrikler/<name>.json dosyasına yazar ve özetini basar."""
+    snapshot = REGISTRY.snapshot()
+    path = write_json(snapshot_path(name), snapshot)
+    print(f"\n--- Ölçümler ({path}) ---")
+    for line in summarize(snapshot):
+        print(line)
+    return snapshot
+
+
+# --- HTTP uç noktası ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        snapshot = REGISTRY.snapshot()
+
+        if self.path.startswith('/metrics.json'):
+            body, content_type = json.dumps(snapshot, ensure_ascii=False).encode('utf-8'), 'application/json'
+        elif self.path.startswith('/metrics'):
+            body, content_type = to_prometheus(snapshot).encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=None):
+    """METRIK_PORTU (ya da port) ayarlıysa uç noktayı arka planda açar; sunucuyu (ya da None) döner."""
+    port = port if port is not None else METRIK_PORTU
+    if port is None:
+        return None
+    server = ThreadingHTTPServer(('127.0.0.1', port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[INFO] Ölçümler: http://127.0.0.1:{server.server_address[1]}/metrics")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıtlı ölçüm dosyalarını birleştirip özetler.")
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--prometheus', action='store_true', help="Prometheus metin biçiminde yaz")
+    args = parser.parse_args()
+
+    snapshot = merge_snapshots(load_snapshots(args.paths))
+    if args.prometheus:
+        print(to_prometheus(snapshot), end='')
+    else:
+        print('\n'.join(summarize(snapshot)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,31 @@
 import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
-import random
 import os
-import math
-from multiprocessing import Process
+import itertools
+import threading
+
+from html_extract import parse_price
+from crawl_state import CrawlState, DONE, PRICE_MISSING
+from html_archive import open_archive
+from driver_pool import DriverPool, PoolExhausted
+from throttle import BULUNAMADI, Throttle
+from listing_index import open_stage_index
+import metrics
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
 
 DATA_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'ilanlar_ham.csv')
+INDEX_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'fiyat_kuyrugu.idx')
 
 # --- AYARLAR ---
 CALISAN_SAYISI = 5
+RAPOR_ARALIGI = 50  # Her çalışan kaç ilanda bir ilerleme yazdırsın
+ILK_BEKLEME = 1.0  # sn; tek tarayıcıda istekler arası başlangıç aralığı, sonra siteye göre uyarlanır
 # ----------------
 
-def get_price_worker(worker_id, subset_indices, all_data_file):
-    """Her bir çalışanın (tarayıcının) yapacağı iş."""
-
-    wait_time = worker_id * 5
-    print(f"[Worker-{worker_id}] Hazırlanıyor... {wait_time} saniye bekleyip başlayacak.")
-    time.sleep(wait_time)
-
-    print(f"[Worker-{worker_id}] İş başı yapıyor! {len(subset_indices)} ilan tarayacak.")
 
+def create_driver(worker_id):
     options = uc.ChromeOptions()
     options.page_load_strategy = 'eager'
     options.add_argument('--disable-gpu')
@@ -35,79 +36,82 @@ def get_price_worker(worker_id, subset_indices, all_data_file):
     options.add_experimental_option("prefs", prefs)
     options.add_argument(f'user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) Worker/{worker_id}')
 
-    driver = None
-    try:
-        driver = uc.Chrome(options=options, use_subprocess=True)
-    except Exception as e:
-        print(f"[Worker-{worker_id}] Driver başlatılamadı! Hata: {e}")
-        return
+    driver = uc.Chrome(options=options, use_subprocess=True)
+    driver.set_page_load_timeout(20)
+    return driver
 
-    try:
-        df = pd.read_csv(all_data_file, on_bad_lines='skip', low_memory=False)
-    except:
-        if driver: driver.quit()
-        return
 
-    results = []
-    save_interval = 50
-    temp_file = f"temp_result_{worker_id}.csv"
+def get_price_worker(worker_id, state, pool, throttle, archive=None):
+    """Her bir çalışanın yapacağı iş: durum deposundan link alıp havuzdaki bir tarayıcıyla fiyatı bulur.
 
-    count = 0
-    for idx in subset_indices:
-        if idx >= len(df):
-            continue
+    'Bulunamadı' sonuçları throttle'a bildirilir; ani artışları site engellemesi sayılıp yavaşlanır.
+    """
+    print(f"[Worker-{worker_id}] İş başı yapıyor!")
 
-        link = df.at[idx, 'Link']
-        found_price = None
+    count = 0
+    while True:
+        claimed = state.claim('fiyat')
+        if not claimed:
+            break
 
+        link = claimed[0]
         try:
-            driver.set_page_load_timeout(20)
-            driver.get(link)
-            time.sleep(random.uniform(0.5, 1.5))
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            selectors = [
-                ("div", "desktop-information-price"),
-                ("div", "product-price"),
-                ("span", "product-price-new"),
-                ("span", "price"),
-                ("div", "price-container")
-            ]
-            for tag, cls in selectors:
-                elm = soup.find(tag, class_=cls)
-                if elm:
-                    txt = elm.text.strip()
-                    if "TL" in txt or any(c.isdigit() for c in txt):
-                        found_price = txt
-                        break
-
-            if not found_price:
-                found_price = "Bulunamadı"
-
-        except Exception:
-            try:
-                driver.quit()
-                time.sleep(3)
-                driver = uc.Chrome(options=options, use_subprocess=True)
-            except:
-                pass
-            found_price = "Hata"
-
-        results.append({'Index': idx, 'Fiyat': found_price})
+            with throttle.request() as req:
+                with pool.session() as driver:
+                    with metrics.span('scraper_fetch', asama='fiyat', calisan=worker_id):
+                        driver.get(link)
+                    html = driver.page_source
+                with metrics.span('scraper_parse', asama='fiyat'):
+                    found_price = parse_price(html)
+                if found_price == "Bulunamadı":
+                    req.outcome = BULUNAMADI
+
+            with metrics.span('scraper_write', asama='fiyat'):
+                if archive:
+                    archive.put(link, html)
+                if found_price == "Bulunamadı":
+                    state.mark('fiyat', link, PRICE_MISSING, {'Fiyat': found_price})
+                else:
+                    # Fiyat hem bu aşamada hem de ilanın detay kaydında aynı işlemde güncellenir
+                    with state.transaction():
+                        state.mark_done('fiyat', link, {'Fiyat': found_price})
+                        if state.update_payload('detay', link, {'Fiyat': found_price}):
+                            state.mark_done('detay', link)
+            sonuc = 'Bulunamadı' if found_price == "Bulunamadı" else 'bulundu'
+            metrics.FIYAT_SONUCLARI.inc(sonuc=sonuc, calisan=worker_id)
+            metrics.SAYFALAR.inc(asama='fiyat', calisan=worker_id)
+
+        except PoolExhausted as e:
+            # Link 'işleniyor' olarak kalır, ana süreç bir sonraki çalışmaya bırakır
+            print(f"[Worker-{worker_id}] {e} Çalışan durduruluyor.")
+            break
+        except Exception as e:
+            # Oturum bozulduysa havuz onu zaten yeniledi
+            state.mark_failed('fiyat', link, e)
+            metrics.FIYAT_SONUCLARI.inc(sonuc='Hata', calisan=worker_id)
+
         count += 1
+        if count % RAPOR_ARALIGI == 0:
+            bulunamadi = metrics.FIYAT_SONUCLARI.get(sonuc='Bulunamadı', calisan=worker_id)
+            hata = metrics.FIYAT_SONUCLARI.get(sonuc='Hata', calisan=worker_id)
+            print(f"[Worker-{worker_id}] {count} ilan tarandı "
+                  f"(Bulunamadı: %{100 * bulunamadi / count:.0f}, Hata: %{100 * hata / count:.0f}).")
+
+    print(f"[Worker-{worker_id}] GÖREV TAMAMLANDI. {count} ilan tarandı.")
 
-        if count % save_interval == 0:
-            pd.DataFrame(results).to_csv(temp_file, index=False)
-            print(f"[Worker-{worker_id}] {count}/{len(subset_indices)} tamamlandı.")
 
-    pd.DataFrame(results).to_csv(temp_file, index=False)
-    if driver: driver.quit()
-    print(f"[Worker-{worker_id}] GÖREV TAMAMLANDI. Dosya kaydedildi: {temp_file}")
+def merge_prices(df, df_results):
+    """Bulunan fiyatları Link üzerinden tek bir vektörel atamayla DataFrame'e işler. Güncellenen satır sayısını döner."""
+    gecerli = df_results[df_results['Fiyat'].notna() & (df_results['Fiyat'] != "Hata")]
+    fiyatlar = gecerli.drop_duplicates(subset='Link', keep='last').set_index('Link')['Fiyat']
+    yeni_fiyat = df['Link'].map(fiyatlar)
+    guncellenecek = yeni_fiyat.notna()
+    df.loc[guncellenecek, 'Fiyat'] = yeni_fiyat[guncellenecek]
+    return int(guncellenecek.sum())
 
 
 def main():
-    print(f"--- OTOMATİK TURBO MOD BAŞLATILIYOR ({CALISAN_SAYISI} ÇEKİRDEK) ---")
+    print(f"--- OTOMATİK TURBO MOD BAŞLATILIYOR ({CALISAN_SAYISI} TARAYICI) ---")
 
     try:
         df = pd.read_csv(DATA_FILE_PATH, on_bad_lines='skip', low_memory=False)
@@ -115,52 +119,62 @@ def main():
         print(f"Dosya okunamadı: {e}")
         return
 
-    eksik_indexler = df[df['Fiyat'].isna() | (df['Fiyat'] == '')].index.tolist()
+    state = CrawlState()
+    state.reset_in_progress('fiyat')
+
+    # Numarası kuyrukta (ya da tamamlanmışlarda) olan ilan başka bir URL'le tekrar eklenmez
+    eksik = df.loc[df['Fiyat'].isna() | (df['Fiyat'] == ''), 'Link']
+    bilinen, son_id = open_stage_index(state, 'fiyat', INDEX_FILE_PATH)
+    state.add('fiyat', bilinen.filter_new(eksik.tolist()))
+    bilinen.save(INDEX_FILE_PATH, son_id=son_id)
+    # Bekleyenlerle birlikte deneme hakkı kalan hatalı işler de claim ile tekrar denenir
+    toplam_is = state.claimable('fiyat')
 
-    toplam_is = len(eksik_indexler)
     print(f"Toplam Satır: {len(df)}")
     print(f"Tamir Edilecek: {toplam_is}")
 
     if toplam_is == 0:
-        print("Yapılacak iş yok! Tüm fiyatlar dolu.")
-        return
-
-    chunk_size = math.ceil(toplam_is / CALISAN_SAYISI)
-    chunks = [eksik_indexler[i:i + chunk_size] for i in range(0, toplam_is, chunk_size)]
-
-    processes = []
-
-    for i in range(len(chunks)):
-        p = Process(target=get_price_worker, args=(i, chunks[i], DATA_FILE_PATH))
-        processes.append(p)
-        p.start()
-
-    print("\nTüm çalışanlar sahaya gönderildi. Pencerelerin sırayla açılmasını bekle...\n")
-    for p in processes:
-        p.join()
+        print("Yapılacak yeni iş yok. Önceki sonuçlar birleştirilecek.")
+    else:
+        # Sabit parçalar yerine ortak kuyruk: hızlı çalışan daha çok iş alır, yavaş olan süreyi uzatmaz.
+        # Tarayıcılar ayrı süreçler yerine tek bir oturum havuzundan iş parçacıklarına dağıtılır.
+        calisan_sayisi = min(CALISAN_SAYISI, toplam_is)
+        driver_ids = itertools.count()
+        archive = open_archive()
+        throttle = Throttle(name='price_fixer', max_concurrency=calisan_sayisi,
+                            start_delay=ILK_BEKLEME / calisan_sayisi)
+        metrics.serve()
+        try:
+            with DriverPool(lambda: create_driver(next(driver_ids)), calisan_sayisi, name='price_fixer') as pool:
+                threads = [threading.Thread(target=get_price_worker, args=(i, state, pool, throttle, archive))
+                           for i in range(calisan_sayisi)]
+                for t in threads:
+                    t.start()
+
+                print("\nTüm çalışanlar sahaya gönderildi.\n")
+                for t in threads:
+                    t.join()
+        except PoolExhausted as e:
+            print(f"[KRİTİK HATA] {e}")
+        finally:
+            if archive:
+                archive.close()
+
+        # Yarıda kalan çalışanın kilitlediği işler bir sonraki çalışmaya kalsın
+        state.reset_in_progress('fiyat')
+        metrics.report('price_fixer')
 
     print("\n--- TÜM İŞLEMLER BİTTİ. VERİLER BİRLEŞTİRİLİYOR ---")
 
-    guncellenen_sayisi = 0
-    for i in range(len(chunks)):
-        temp_file = f"temp_result_{i}.csv"
-        if os.path.exists(temp_file):
-            try:
-                df_temp = pd.read_csv(temp_file)
-                for _, row in df_temp.iterrows():
-                    orj_idx = int(row['Index'])
-                    yeni_fiyat = row['Fiyat']
-                    if pd.notna(yeni_fiyat) and yeni_fiyat != "Hata":
-                        df.at[orj_idx, 'Fiyat'] = yeni_fiyat
-
-                guncellenen_sayisi += len(df_temp)
-                os.remove(temp_file)
-            except Exception as e:
-                print(f"Hata: {temp_file} birleştirilemedi. {e}")
+    sonuclar = pd.DataFrame([{'Link': link, 'Fiyat': payload['Fiyat']}
+                             for link, payload in state.iter_payloads('fiyat', (DONE, PRICE_MISSING))],
+                            columns=['Link', 'Fiyat'])
+    state.close()
+    guncellenen_sayisi = merge_prices(df, sonuclar)
 
     df.to_csv(DATA_FILE_PATH, index=False, encoding='utf-8-sig')
     print(f"Tebrikler! Toplam {guncellenen_sayisi} ilan güncellendi ve '{DATA_FILE_PATH}' dosyasına kaydedildi.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,101 @@
+"""Arşivlenmiş ilan sayfalarını ağa çıkmadan, tüm çekirdeklerde yeniden ayrıştırır.
+
+Her ilanın (ilan numarası başına) en son çekilmiş hali html_extract ile işlenir, sonuçlar durum deposuna
+yazılır ve ilanlar_ham.csv scrape_details'in export_csv'siyle yeniden üretilir (sonraki scrape_details
+çalışması da aynı kayıtları yazar). Ana fiyat seçicisi boş kalırsa price_fixer'ın seçici listesi de aynı
+HTML üzerinde denenir.
+    python src/data_collection/reextract.py --output data/raw/ilanlar_ham_yeni.csv
+"""
+import argparse
+import os
+import time
+from multiprocessing import Pool, cpu_count
+
+from crawl_state import CrawlState, PRICE_MISSING
+from html_archive import ARCHIVE_DIR, HtmlArchive, read_object
+from html_extract import parse_listing, parse_price
+from listing_index import keep_latest
+from scrape_details import export_csv
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+OUTPUT_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'ilanlar_ham.csv')
+
+_worker_options = {}
+
+
+def _init_worker(archive_dir, backend):
+    _worker_options['archive_dir'] = archive_dir
+    _worker_options['backend'] = backend
+
+
+def _reparse(item):
+    ilan_linki, sha256 = item
+    html = read_object(_worker_options['archive_dir'], sha256)
+    ilan_data = parse_listing(html, ilan_linki, _worker_options['backend'])
+    if not ilan_data['Fiyat']:
+        fiyat = parse_price(html, _worker_options['backend'])
+        if fiyat != "Bulunamadı":
+            ilan_data['Fiyat'] = fiyat
+    return ilan_data
+
+
+def save_to_state(state, rows):
+    """Yeniden ayrıştırılan ilanları scrape_details'in save_listing kurallarıyla durum deposuna yazar."""
+    # Arşivdeki sayfada fiyat yoksa price_fixer'ın sonradan bulduğu fiyat korunur
+    kayitli = state.lookup('detay', [ilan_data['Link'] for ilan_data in rows if not ilan_data['Fiyat']])
+    for ilan_data in rows:
+        eski = kayitli.get(ilan_data['Link'], (None, None))[1]
+        if not ilan_data['Fiyat'] and eski and eski.get('Fiyat'):
+            ilan_data['Fiyat'] = eski['Fiyat']
+
+    fiyatsiz = {ilan_data['Link']: ilan_data for ilan_data in rows if not ilan_data['Fiyat']}
+    with state.transaction():
+        state.put_payloads('detay', {ilan_data['Link']: ilan_data for ilan_data in rows if ilan_data['Fiyat']})
+        state.put_payloads('detay', fiyatsiz, status=PRICE_MISSING)
+        state.add('fiyat', list(fiyatsiz))
+
+
+def reextract(output_path=OUTPUT_FILE_PATH, archive_dir=ARCHIVE_DIR, workers=None, backend=None, state=None):
+    archive = HtmlArchive(archive_dir)
+    # Aynı ilan farklı URL'lerle arşivlenmiş olabilir; en son çekileni ayrıştırılır
+    items = keep_latest(archive.latest('detay'), link_key=0)
+    archive.close()
+
+    if not items:
+        print("[INFO] Arşivde ilan sayfası yok.")
+        return 0
+
+    workers = workers or cpu_count()
+    started = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(archive_dir, backend)) as pool:
+        rows = pool.map(_reparse, items, chunksize=max(1, len(items) // (workers * 8)))
+    elapsed = time.perf_counter() - started
+
+    owns_state = state is None
+    state = state or CrawlState()
+    try:
+        save_to_state(state, rows)
+        export_csv(state, output_path)
+    finally:
+        if owns_state:
+            state.close()
+    print(f"[INFO] {len(rows)} sayfa {workers} çekirdekte {elapsed:.1f} sn'de ayrıştırıldı "
+          f"({len(rows) / elapsed:.0f} sayfa/sn). Çıktı: '{output_path}'")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arşivdeki ilan sayfalarını yeniden ayrıştırır.")
+    parser.add_argument('--output', default=OUTPUT_FILE_PATH)
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--workers', type=int, default=None, help="Varsayılan: tüm çekirdekler")
+    parser.add_argument('--backend', default=None, choices=['bs4', 'lxml', 'selectolax'])
+    args = parser.parse_args()
+
+    reextract(args.output, args.archive_dir, args.workers, args.backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,31 @@
 import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
-import time
-import random
 from tqdm import tqdm
 import pandas as pd
 import os
 
+from html_extract import parse_listing
+from crawl_state import CrawlState, PENDING, DONE, PRICE_MISSING
+from html_archive import open_archive
+from driver_pool import DriverPool, PoolExhausted
+from throttle import Throttle
+from listing_index import keep_latest, open_stage_index
+import metrics
+
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
 
 INPUT_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'ilan_linkleri.txt')
 OUTPUT_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'ilanlar_ham.csv')
+INDEX_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'detay_kuyrugu.idx')
 
+# --- AYARLAR ---
+# 'chrome': her ilan tek bir Chrome oturumunda açılır (eski yöntem)
+# 'async' : ilanlar eşzamanlı HTTP istekleriyle çekilir, JS isteyen sayfalar Chrome'a bırakılır
+FETCH_MODE = 'async'
+PARTI_BOYUTU = 500  # Durum deposundan tek seferde alınacak ilan sayısı
+CHROME_OTURUMU = 1  # Chrome'a kalan ilanlar için havuzdaki oturum sayısı
+ILK_BEKLEME = 3.0  # sn; Chrome istekleri arasındaki başlangıç aralığı, sonra siteye göre uyarlanır
+# ----------------
 
 
 def create_driver():
@@ -31,6 +45,93 @@ def create_driver():
         return None
 
 
+def save_listing(state, ilan_data):
+    """İlanı tek işlemde kaydeder; fiyatı yoksa price_fixer'ın kuyruğuna da ekler."""
+    ilan_linki = ilan_data['Link']
+    with state.transaction():
+        if ilan_data.get('Fiyat'):
+            state.mark_done('detay', ilan_linki, ilan_data)
+        else:
+            state.mark('detay', ilan_linki, PRICE_MISSING, ilan_data)
+            state.add('fiyat', [ilan_linki])
+
+
+def import_existing_csv(state, csv_path=OUTPUT_FILE_PATH):
+    """Durum deposu öncesinden kalan CSV satırlarını bir kereye mahsus 'tamamlandı' olarak aktarır."""
+    df_existing = pd.read_csv(csv_path, on_bad_lines='skip', low_memory=False)
+    df_existing = df_existing.astype(object).where(df_existing.notna(), None)
+    with state.transaction():
+        for ilan_data in df_existing.to_dict('records'):
+            state.add('detay', [ilan_data['Link']])
+            state.mark_done('detay', ilan_data['Link'], ilan_data)
+    return len(df_existing)
+
+
+def export_csv(state, output_path=OUTPUT_FILE_PATH):
+    """Durum deposundaki ilanları ilanlar_ham.csv olarak yazar; her ilan numarasından en son çekileni kalır."""
+    rows = keep_latest([ilan_data for _, ilan_data in state.iter_payloads('detay', (DONE, PRICE_MISSING))])
+    if rows:
+        pd.DataFrame(rows).to_csv(output_path, index=False, encoding='utf-8-sig')
+    return len(rows)
+
+
+def scrape_with_chrome(state, pool, throttle, links, archive=None):
+    """İlanları havuzdaki Chrome oturumlarıyla, throttle'ın belirlediği aralıkla çeker."""
+    for ilan_linki in tqdm(links, desc="İlan Detayları Çekiliyor"):
+        try:
+            with throttle.request(), pool.session() as driver:
+                with metrics.span('scraper_fetch', asama='detay', yontem='chrome'):
+                    driver.get(ilan_linki)
+                html = driver.page_source
+
+            with metrics.span('scraper_parse', asama='detay'):
+                ilan_data = parse_listing(html, ilan_linki)
+            with metrics.span('scraper_write', asama='detay'):
+                if archive:
+                    archive.put(ilan_linki, html)
+                save_listing(state, ilan_data)
+            metrics.SAYFALAR.inc(asama='detay', yontem='chrome')
+
+        except PoolExhausted:
+            raise
+        except Exception as e:
+            state.mark_failed('detay', ilan_linki, e)
+
+
+def scrape_with_async(state, links, archive=None, **fetch_options):
+    """İlanları havuzlu HTTP istemcisiyle çeker; Chrome'a kalması gereken linkleri döner."""
+    from async_fetch import fetch_all
+
+    progress = tqdm(total=len(links), desc="İlan Detayları Çekiliyor (async)")
+
+    def handle_page(ilan_linki, html):
+        progress.update(1)
+        with metrics.span('scraper_parse', asama='detay'):
+            ilan_data = parse_listing(html, ilan_linki)
+        # Başlık yoksa sayfa içeriği JS ile yükleniyordur, Chrome ile tekrar denenecek
+        if not ilan_data['Başlık']:
+            metrics.counter('scraper_js_fallback_total', "Chrome'a bırakılan sayfalar").inc(asama='detay')
+            return False
+
+        with metrics.span('scraper_write', asama='detay'):
+            if archive:
+                archive.put(ilan_linki, html)
+            save_listing(state, ilan_data)
+        metrics.SAYFALAR.inc(asama='detay', yontem='async')
+        return True
+
+    try:
+        failed = fetch_all(links, handle_page, labels={'asama': 'detay'}, **fetch_options)
+    finally:
+        progress.close()
+
+    for ilan_linki, error in failed:
+        if error:
+            print(f"[UYARI] {ilan_linki} çekilemedi: {error}")
+
+    return [ilan_linki for ilan_linki, _ in failed]
+
+
 def main():
     try:
         with open(INPUT_FILE_PATH, 'r', encoding='utf-8') as f:
@@ -39,99 +140,64 @@ def main():
         print(f"Hata: '{INPUT_FILE_PATH}' dosyası bulunamadı.")
         return
 
-    processed_links = set()
-    if os.path.exists(OUTPUT_FILE_PATH):
+    state = CrawlState()
+    state.reset_in_progress('detay')
+    archive = open_archive()
+    metrics.serve()
+
+    if not state.counts('detay') and os.path.exists(OUTPUT_FILE_PATH):
         try:
-            df_existing = pd.read_csv(OUTPUT_FILE_PATH, on_bad_lines='skip', low_memory=False)
-            processed_links = set(df_existing['Link'])
-            print(
-                f"[INFO] Mevcut CSV dosyasında {len(processed_links)} adet işlenmiş link bulundu. Kaldığı yerden devam edilecek.")
+            aktarilan = import_existing_csv(state)
+            print(f"[INFO] Mevcut CSV dosyasındaki {aktarilan} ilan durum deposuna aktarıldı.")
         except Exception as e:
             print(f"[UYARI] Mevcut dosya okunurken hata oluştu: {e}. Baştan başlanabilir.")
 
-    links_to_scrape = [link for link in all_links if link not in processed_links]
-
-    if not links_to_scrape:
-        print("[INFO] Tüm linkler zaten işlenmiş. Program sonlandırılıyor.")
-        return
-
-    driver = create_driver()
-    if not driver: return
-
-    all_car_data = []
-    save_interval = 100
-
+    # Aynı ilan farklı URL'lerle gelebilir; kuyrukta (ya da tamamlanmışlarda) numarası olan link eklenmez.
+    # Dizin diskte tutulur, depodan yalnızca son kayıttan sonra eklenen linkler okunur.
+    bilinen, son_id = open_stage_index(state, 'detay', INDEX_FILE_PATH)
+    yeni = state.add('detay', bilinen.filter_new(all_links))
+    bilinen.save(INDEX_FILE_PATH, son_id=son_id)
+    durum = state.counts('detay')
+    print(f"[INFO] {yeni} yeni link eklendi. Bekleyen: {durum.get(PENDING, 0)}, "
+          f"tamamlanan: {durum.get(DONE, 0) + durum.get(PRICE_MISSING, 0)}. Kaldığı yerden devam edilecek.")
+
+    # Hız denetleyicileri partiler boyunca korunur; öğrenilen hız bir sonraki partiye taşınır
+    async_throttle = None
+    if FETCH_MODE == 'async':
+        from async_fetch import HOST_BASINA_ISTEK
+        async_throttle = Throttle(name='scrape_details_async', max_concurrency=HOST_BASINA_ISTEK, start_delay=0.0)
+    chrome_throttle = Throttle(name='scrape_details', max_concurrency=CHROME_OTURUMU, start_delay=ILK_BEKLEME)
+    pool = None
     try:
-        for i, ilan_linki in enumerate(tqdm(links_to_scrape, desc="İlan Detayları Çekiliyor")):
-            try:
-                driver.get(ilan_linki)
-                time.sleep(random.uniform(2, 4))
-
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                ilan_data = {'Link': ilan_linki}
-
-                def get_text_safely(element):
-                    return element.text.strip() if element else None
-
-                ilan_data['Başlık'] = get_text_safely(soup.find("div", class_="product-title"))
-                ilan_data['Fiyat'] = get_text_safely(soup.find("span", class_="product-price-new"))
-
-                for item in soup.find_all("div", class_="property-item"):
-                    key_element = item.find("div", class_="property-key")
-                    value_element = item.find("div", class_="property-value")
-                    if key_element and value_element:
-                        ilan_data[key_element.text.strip()] = value_element.text.strip()
-
-                ilan_data['Tramer'] = get_text_safely(soup.select_one(".tramer-info .property-value"))
-
-                hasar_bilgileri = {}
-                damage_info_container = soup.find("div", class_="car-damage-info")
-                if damage_info_container:
-                    for item in damage_info_container.find_all("div", class_="car-damage-info-item"):
-                        status_element = item.find("p")
-                        if status_element:
-                            status = status_element.text.strip()
-                            parts_list = item.find_all("li")
-                            parts = ", ".join([p.text.strip() for p in parts_list if p.text.strip() != "-"])
-                            hasar_bilgileri[status] = parts if parts else "Yok"
-
-                ilan_data['Boyalı Parçalar'] = hasar_bilgileri.get('Boyalı', 'Belirtilmemiş')
-                ilan_data['Lokal Boyalı Parçalar'] = hasar_bilgileri.get('Lokal boyalı', 'Belirtilmemiş')
-                ilan_data['Değişen Parçalar'] = hasar_bilgileri.get('Değişmiş', 'Belirtilmemiş')
-
-                all_car_data.append(ilan_data)
-
-                if (i + 1) % save_interval == 0:
-                    df_batch = pd.DataFrame(all_car_data)
-                    header = not os.path.exists(OUTPUT_FILE_PATH)
-                    df_batch.to_csv(OUTPUT_FILE_PATH, mode='a', header=header, index=False, encoding='utf-8-sig')
-                    all_car_data = []
-
-            except Exception as e:
-                error_str = str(e).lower()
-                if "read timed out" in error_str or "invalid session id" in error_str:
-                    print("[INFO] Önemli bir driver hatası tespit edildi. Driver yeniden başlatılıyor...")
-                    try:
-                        driver.quit()
-                    except:
-                        pass
-                    driver = create_driver()
-                    if not driver:
-                        print("[KRİTİK HATA] Yeni driver başlatılamadı. Program sonlandırılıyor.")
-                        break
-                continue
-
+        while True:
+            links_to_scrape = state.claim('detay', PARTI_BOYUTU)
+            if not links_to_scrape:
+                break
+
+            if FETCH_MODE == 'async':
+                links_to_scrape = scrape_with_async(state, links_to_scrape, archive, throttle=async_throttle)
+                if links_to_scrape:
+                    print(f"[INFO] {len(links_to_scrape)} ilan JS gerektiriyor veya çekilemedi, Chrome ile denenecek.")
+
+            if links_to_scrape:
+                # Chrome yalnızca gerektiğinde açılır ve partiler boyunca aynı havuz kullanılır
+                pool = pool or DriverPool(create_driver, CHROME_OTURUMU, name='scrape_details').start()
+                scrape_with_chrome(state, pool, chrome_throttle, links_to_scrape, archive)
+    except PoolExhausted as e:
+        print(f"[KRİTİK HATA] {e} Program sonlandırılıyor.")
     finally:
-        if all_car_data:
-            df_final = pd.DataFrame(all_car_data)
-            header = not os.path.exists(OUTPUT_FILE_PATH)
-            df_final.to_csv(OUTPUT_FILE_PATH, mode='a', header=header, index=False, encoding='utf-8-sig')
-            print(f"\n[INFO] Kalan {len(all_car_data)} ilan dosyaya kaydedildi.")
-        if driver:
-            driver.quit()
+        if pool:
+            pool.close()
+        # Chrome da başaramadıysa iş kilitli kalmasın, bir sonraki çalışmada tekrar denensin
+        state.reset_in_progress('detay')
+        toplam = export_csv(state)
+        state.close()
+        if archive:
+            archive.close()
+        metrics.report('scrape_details')
         print("\n-------------------------------------------")
-        print(f"İşlem tamamlandı veya durduruldu. Veriler '{OUTPUT_FILE_PATH}' dosyasına kaydedildi.")
+        print(f"İşlem tamamlandı veya durduruldu. {toplam} ilan '{OUTPUT_FILE_PATH}' dosyasına kaydedildi.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,224 @@
+"""Scraper'ların ortak uyarlanır hız denetleyicisi (AIMD).
+
+Sabit rastgele beklemelerin yerine geçer. İki şeyi ayarlar:
+  * bekleme: ardışık iki isteğin başlangıcı arasındaki süre (tüm çalışanlar için ortak),
+  * eşzamanlılık: aynı anda uçuşta olabilecek istek sayısı.
+Site rahatken, yani son PENCERE / 2 istekte sinyal yoksa, yavaş yavaş hızlanır: eşzamanlılık +1, bekleme
+x HIZLANMA_CARPANI. Aşağıdaki sinyallerden biri gelince sert yavaşlar: eşzamanlılık x AZALTMA_CARPANI,
+bekleme ise gözlenen istek aralığı / AZALTMA_CARPANI olur, yani fiili istek hızı yarıya iner:
+  * 429/503 (Retry-After varsa o süre boyunca hiç istek gönderilmez),
+  * zaman aşımı,
+  * penceredeki hata oranının HATA_ESIGI'ni aşması,
+  * 'Bulunamadı' oranının BULUNAMADI_ESIGI'ni aşması (site engellerken boş sayfa döndürebiliyor),
+  * pencere medyan gecikmesinin en iyi görülen gecikmenin GECIKME_CARPANI katını aşması.
+Son yavaşlamadan önce başlamış isteklerin sonuçları yok sayılır; aynı dalga iki kez yavaşlatmaz.
+
+    throttle = Throttle(name='collect_links', max_concurrency=4, start_delay=0.75)
+    with throttle.request() as req:
+        driver.get(url)
+        if parse_price(driver.page_source) == "Bulunamadı":
+            req.outcome = BULUNAMADI
+"""
+import asyncio
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+import metrics
+
+# --- AYARLAR ---
+MAKS_BEKLEME = 30.0       # sn
+EN_KISA_BEKLEME = 0.01    # sn; bekleme bunun altına inerse min_delay'e yuvarlanır
+HIZLANMA_CARPANI = 0.9    # Sakin geçen her yarım pencereden sonra bekleme bununla çarpılır
+AZALTMA_CARPANI = 0.5     # Yavaşlarken eşzamanlılık ve istek hızı bununla çarpılır
+PENCERE = 20              # Karar penceresi (istek sayısı)
+HATA_ESIGI = 0.2
+BULUNAMADI_ESIGI = 0.5
+GECIKME_CARPANI = 2.0
+SAPMA = 0.3               # Beklemeye eklenen ± rastgele oran
+# ----------------
+
+BASARILI, HATA, ZAMAN_ASIMI, SINIR, BULUNAMADI = 'basarili', 'hata', 'zaman_asimi', 'sinir', 'bulunamadi'
+SINIR_KODLARI = {429, 503}
+
+
+def outcome_for_error(error):
+    if isinstance(error, TimeoutError) or metrics.classify_error(error) in ('read_timed_out', 'zaman_asimi'):
+        return ZAMAN_ASIMI
+    return HATA
+
+
+class Request:
+    """Throttle.request() bloğunun sonucu; çağıran sonucu ve Retry-After'ı kendisi belirleyebilir."""
+
+    def __init__(self, started):
+        self.outcome = BASARILI
+        self.retry_after = None
+        self.started = started
+
+
+class Throttle:
+    """İş parçacığı ve asyncio ile birlikte kullanılabilir AIMD hız denetleyicisi."""
+
+    def __init__(self, name='throttle', max_concurrency=4, start_concurrency=None, min_concurrency=1,
+                 start_delay=1.0, min_delay=0.0, max_delay=MAKS_BEKLEME, window=PENCERE):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = start_concurrency or max_concurrency
+        self.delay = start_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.in_flight = 0
+        self._window = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._starts = deque(maxlen=window)
+        self._best_latency = None
+        self._calm = 0
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        self._lock = threading.Lock()
+        self._publish()
+
+    # --- İzin alma ---
+    def _reserve(self):
+        """Eşzamanlılık sınırı doluysa None, değilse yer ayırıp isteğin başlayacağı anı (monotonic) döner."""
+        with self._lock:
+            if self.in_flight >= self.concurrency:
+                return None
+            now = time.monotonic()
+            start = max(now, self._next_slot, self._paused_until)
+            self._next_slot = start + self.delay * random.uniform(1 - SAPMA, 1 + SAPMA)
+            self._starts.append(start)
+            self.in_flight += 1
+            return start
+
+    def acquire(self):
+        """İzin gelene kadar bekler; isteğin başlangıç anını döner (release'e verilir)."""
+        while (start := self._reserve()) is None:
+            time.sleep(0.05)
+        time.sleep(max(start - time.monotonic(), 0))
+        return start
+
+    async def acquire_async(self):
+        while (start := self._reserve()) is None:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(max(start - time.monotonic(), 0))
+        return start
+
+    def release(self, started, outcome=BASARILI, latency=None, retry_after=None):
+        with self._lock:
+            self.in_flight -= 1
+            self._record(started, outcome, latency, retry_after)
+
+    def _finish(self, req, latency, error=None):
+        if error is not None:
+            self.release(req.started, outcome_for_error(error), retry_after=req.retry_after)
+        else:
+            self.release(req.started, req.outcome, latency, req.retry_after)
+
+    @contextmanager
+    def request(self):
+        """Bloğu izinle çalıştırır; süreyi ve sonucu (hata fırlarsa hata türünü) kaydeder."""
+        req = Request(self.acquire())
+        started = time.perf_counter()
+        try:
+            yield req
+        except Exception as e:
+            self._finish(req, None, e)
+            raise
+        self._finish(req, time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def arequest(self):
+        req = Request(await self.acquire_async())
+        started = time.perf_counter()
+        try:
+            yield req
+        except Exception as e:
+            self._finish(req, None, e)
+            raise
+        self._finish(req, time.perf_counter() - started)
+
+    # --- Karar ---
+    def _record(self, started, outcome, latency, retry_after):
+        now = time.monotonic()
+        if outcome == SINIR and retry_after is not None:
+            try:
+                self._paused_until = max(self._paused_until, now + float(retry_after))
+            except ValueError:
+                pass
+        if started < self._last_decrease:
+            return  # Eski hızla gönderilmiş istek; yeni hızı değerlendirmeye karışmasın
+
+        self._window.append(outcome)
+        if outcome == BASARILI and latency is not None:
+            self._latencies.append(latency)
+
+        reason = self._signal(outcome)
+        if reason:
+            self._decrease(reason, now)
+        else:
+            self._calm += 1
+            if self._calm >= self._window.maxlen // 2:
+                self._increase()
+
+    def _signal(self, outcome):
+        if outcome in (SINIR, ZAMAN_ASIMI):
+            return outcome
+        window = self._window
+        if len(window) < window.maxlen // 2:
+            return None
+        if sum(o in (HATA, ZAMAN_ASIMI, SINIR) for o in window) / len(window) > HATA_ESIGI:
+            return 'hata_orani'
+        if window.count(BULUNAMADI) / len(window) > BULUNAMADI_ESIGI:
+            return BULUNAMADI
+        if len(self._latencies) >= self._latencies.maxlen // 2:
+            median = statistics.median(self._latencies)
+            if self._best_latency is None or median < self._best_latency:
+                self._best_latency = median
+            elif median > self._best_latency * GECIKME_CARPANI:
+                return 'gecikme'
+        return None
+
+    def _observed_interval(self):
+        """Son isteklerin başlangıçları arasındaki ortalama süre."""
+        if len(self._starts) < 2:
+            return 0.0
+        return (self._starts[-1] - self._starts[0]) / (len(self._starts) - 1)
+
+    def _decrease(self, reason, now):
+        self.concurrency = max(self.min_concurrency, int(self.concurrency * AZALTMA_CARPANI))
+        interval = max(self.delay, self._observed_interval(), EN_KISA_BEKLEME)
+        self.delay = min(self.max_delay, interval / AZALTMA_CARPANI)
+        self._last_decrease = now
+        self._calm = 0
+        if reason == 'gecikme':
+            # Site kalıcı olarak yavaşladıysa taban gecikme de yavaş yavaş ona uysun
+            self._best_latency *= GECIKME_CARPANI ** 0.5
+        self._window.clear()
+        self._latencies.clear()
+        self._starts.clear()
+        metrics.counter('throttle_adjustments_total', "Hız denetleyicisinin ayarlamaları").inc(
+            betik=self.name, yon='yavasla', neden=reason)
+        self._publish()
+
+    def _increase(self):
+        self._calm = 0
+        if self.concurrency >= self.max_concurrency and self.delay <= self.min_delay:
+            return
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        self.delay *= HIZLANMA_CARPANI
+        if self.delay < max(self.min_delay, EN_KISA_BEKLEME):
+            self.delay = self.min_delay
+        metrics.counter('throttle_adjustments_total', "Hız denetleyicisinin ayarlamaları").inc(
+            betik=self.name, yon='hizlan', neden='sakin')
+        self._publish()
+
+    def _publish(self):
+        metrics.gauge('throttle_delay_seconds', "İstekler arası güncel bekleme (sn)").set(self.delay, betik=self.name)
+        metrics.gauge('throttle_concurrency', "Güncel eşzamanlılık sınırı").set(self.concurrency, betik=self.name)
@@ -0,0 +1,61 @@
+"""Ham ilan verisinin (ilanlar_ham.csv) temizliği: 01_veri_analizi notebook'unun vektörel karşılığı.
+
+Metin sütunları features._on_uniques ile yalnızca tekil değerleri üzerinden temizlenir.
+"""
+import pandas as pd
+
+from features import _on_uniques
+
+DROP_COLS = ['Başlık', 'İlan No', 'İlan Tarihi']
+MAKS_KM = 1_000_000
+MIN_FIYAT = 50_000
+BOS_TRAMER_DEGERLERI = ['nan', 'None', 'Belirtilmemiş']
+
+
+def strip_to_numeric(series, remove_strs):
+    """remove_strs ve binlik ayırıcı noktalar silindikten sonra sayıya çevirir; çevrilemeyenler NaN."""
+    def _clean(values):
+        text = values.astype(str)
+        for remove_str in remove_strs:
+            text = text.str.replace(remove_str, '', regex=False)
+        return pd.to_numeric(text, errors='coerce').where(values.notna())
+
+    return _on_uniques(series, _clean).astype(float)
+
+
+def clean_tramer_raw(series):
+    """Ham Tramer sütunu: boş / 'Belirtilmemiş' değerler 0, '12.500 TL' -> 12500."""
+    def _clean(values):
+        text = values.astype(object).where(values.notna(), 'nan').astype(str)
+        text = text.where(~text.isin(BOS_TRAMER_DEGERLERI), '0')
+        text = text.str.replace(' TL', '', regex=False).str.replace('.', '', regex=False)
+        return pd.to_numeric(text, errors='coerce').fillna(0).astype(int)
+
+    return _on_uniques(series, _clean).astype(int)
+
+
+def clean_raw_listings(df, verbose=False):
+    """ilanlar_ham şemasındaki ilanları ilanlar_final şemasına getirir."""
+    df = df.copy()
+    n_start = len(df)
+
+    df['Fiyat'] = strip_to_numeric(df['Fiyat'], [' TL', '.'])
+    df = df[df['Fiyat'].notna()]
+    df['Fiyat'] = df['Fiyat'].astype(int)
+
+    df['Kilometre'] = strip_to_numeric(df['Kilometre'], [' km', '.'])
+    df = df[df['Kilometre'].notna()]
+    df['Kilometre'] = df['Kilometre'].astype(int)
+
+    df['Yıl'] = pd.to_numeric(df['Yıl'], errors='coerce')
+    df = df[df['Yıl'].notna()]
+    df['Yıl'] = df['Yıl'].astype(int)
+
+    df = df.drop(columns=[col for col in DROP_COLS if col in df.columns])
+    df = df[(df['Kilometre'] < MAKS_KM) & (df['Fiyat'] > MIN_FIYAT)]
+
+    df['Tramer'] = clean_tramer_raw(df['Tramer'])
+
+    if verbose:
+        print(f"[INFO] Temizlik: {n_start} -> {len(df)} satır")
+    return df
@@ -0,0 +1,242 @@
+"""Değerlemenin yanında gösterilen emsal ilanlar: Marka/Seri bölümlü en yakın komşu araması.
+
+Her ilan Yıl, Kilometre, Motor Gücü, Hasar_Skoru ve Tramer ile temsil edilir. Kilometre ve Tramer
+log ölçeğine alınır; her özellik veri setinin medyanı ve standart sapmasıyla normalize edilip
+ağırlıklandırılır. İlanlar Marka/Seri'ye göre sıralı tek bir float32 matriste tutulur; bir sorgu
+yalnızca kendi bölümündeki ilanlarla karşılaştırılır. Sorgular bölüme göre gruplanıp toplu hesaplanır.
+
+Dizin, veri setinin sürümüyle (içerik özeti) birlikte diske yazılır ve veri seti değişmedikçe
+yeniden kurulmaz. Değiştiğinde tek bir vektörel geçişle baştan kurulur (100 bin ilanda 0,2 sn
+civarı). Değişmeyen satırların özelliklerini satır özetiyle eşleştirip eski dizinden almak da
+denendi; özet hesabı özelliklerin kendisinden pahalı olduğu için daha yavaştı:
+    python src/modeling/comparables.py
+    python src/modeling/comparables.py --queries envanter.csv --output emsaller.csv -k 10
+Karşılaştırma: benchmarks/bench_comparables.py
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset import DATA_PATH, dataset_version, load_listings
+from features import prepare_input
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+COMPARABLES_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'emsaller.pkl')
+
+BOLUM_SUTUNLARI = ['Marka', 'Seri']
+OZELLIKLER = ['Yıl', 'Kilometre', 'Motor Gücü', 'Hasar_Skoru', 'Tramer']
+LOG_OZELLIKLER = ['Kilometre', 'Tramer']
+# Dizinin veri setinden okuduğu sütunlar
+KAYNAK_SUTUNLARI = BOLUM_SUTUNLARI + [
+    'Model', 'Fiyat', 'Link', 'Yıl', 'Kilometre', 'Motor Gücü', 'Tramer',
+    'Boyalı Parçalar', 'Lokal Boyalı Parçalar', 'Değişen Parçalar',
+]
+# Özelliklerin hesaplandığı sütunlar; form girdisinde hasar metin yerine parça sayısı olarak gelir
+OZELLIK_KAYNAKLARI = [
+    'Yıl', 'Kilometre', 'Motor Gücü', 'Tramer',
+    'Boyalı Parçalar', 'Lokal Boyalı Parçalar', 'Değişen Parçalar', 'Boyali_Sayisi', 'Degisen_Sayisi',
+]
+EMSAL_SUTUNLARI = BOLUM_SUTUNLARI + ['Model'] + OZELLIKLER + ['Fiyat', 'Link']
+BICIM_SURUMU = 1
+
+# --- AYARLAR ---
+EMSAL_SAYISI = 5
+AGIRLIKLAR = {'Yıl': 1.0, 'Kilometre': 1.0, 'Motor Gücü': 1.0, 'Hasar_Skoru': 0.5, 'Tramer': 0.5}
+SORGU_PARTISI = 256  # Mesafe matrisi en fazla bu kadar sorguluk partilerle hesaplanır
+# ----------------
+
+
+def listing_features(df):
+    """İlan satırlarından (ya da form girdisinden) OZELLIKLER'i float olarak döner; bilinmeyenler NaN."""
+    features = prepare_input(df[[col for col in OZELLIK_KAYNAKLARI if col in df.columns]], OZELLIKLER)
+    features = features.astype('float64')
+    # clean_numeric çevrilemeyen motor gücünü 0 yapar; bölüm medyanıyla doldurulsun diye boş sayılır
+    features['Motor Gücü'] = features['Motor Gücü'].where(features['Motor Gücü'] > 0)
+    return features
+
+
+def _transform(values):
+    values = np.array(values, dtype='float64')
+    for j, col in enumerate(OZELLIKLER):
+        if col in LOG_OZELLIKLER:
+            values[:, j] = np.log1p(np.clip(values[:, j], 0, None))
+    return values
+
+
+class ComparablesIndex:
+    """Emsal dizini. rows: EMSAL_SUTUNLARI, Marka/Seri'ye göre sıralı.
+
+    rows'un index'i ilanın veri setindeki satır numarasıdır; sonuçlar bu numarayla döner.
+    """
+
+    def __init__(self, rows, data_version=None):
+        self.rows = rows
+        self.data_version = data_version
+        self._build_matrix()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def partition_count(self):
+        return len(self._bounds)
+
+    def _build_matrix(self):
+        keys = pd.MultiIndex.from_frame(self.rows[BOLUM_SUTUNLARI])
+        codes, uniques = pd.factorize(keys)
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(codes)]
+        self._bounds = {uniques[codes[start]]: (start, end) for start, end in zip(starts, ends)}
+
+        values = _transform(self.rows[OZELLIKLER])
+        # Boş özellikler önce bölüm, sonra tüm veri medyanıyla doldurulur
+        medians = pd.DataFrame(values).groupby(codes).median()
+        self._global_median = np.nan_to_num(np.nanmedian(values, axis=0))
+        self._medians = {uniques[code]: np.where(np.isnan(row), self._global_median, row)
+                         for code, row in zip(medians.index, medians.to_numpy())}
+        missing = np.isnan(values)
+        if missing.any():
+            values[missing] = medians.to_numpy()[codes][missing]
+            values = np.where(np.isnan(values), self._global_median, values)
+
+        self._center = np.median(values, axis=0)
+        scale = values.std(axis=0)
+        self._scale = np.where(scale > 0, scale, 1.0) / np.array([AGIRLIKLAR[col] for col in OZELLIKLER])
+        self._matrix = ((values - self._center) / self._scale).astype(np.float32)
+        self._norms = (self._matrix ** 2).sum(axis=1)
+        self._links = self.rows['Link'].to_numpy() if 'Link' in self.rows.columns else None
+
+    def _normalize(self, features, key):
+        values = _transform(features)
+        values = np.where(np.isnan(values), self._medians.get(key, self._global_median), values)
+        return ((values - self._center) / self._scale).astype(np.float32)
+
+    @classmethod
+    def build(cls, df, data_version=None):
+        """df: veri seti (load_listings çıktısı, KAYNAK_SUTUNLARI yeterli)."""
+        rows = df[[col for col in EMSAL_SUTUNLARI if col in df.columns and col not in OZELLIKLER]].copy()
+        for col in BOLUM_SUTUNLARI + ['Model']:
+            rows[col] = rows[col].astype(str)
+        rows[OZELLIKLER] = listing_features(df).to_numpy()
+        return cls(rows.sort_values(BOLUM_SUTUNLARI, kind='stable'), data_version)
+
+    def nearest(self, queries, k=EMSAL_SAYISI, exclude_self=True):
+        """Her sorgu satırı için kendi Marka/Seri bölümündeki en yakın k ilanı döner.
+
+        Sonuç uzun biçimlidir ve sorgu sırasındadır: Sorgu (sorgunun index değeri), Sıra (1..k), Mesafe
+        ve EMSAL_SUTUNLARI.
+        Bölümü dizinde olmayan sorgular sonuçta yer almaz. exclude_self: sorgunun Link'i varsa aynı
+        ilan kendi emsali sayılmaz.
+        """
+        features = listing_features(queries).to_numpy()
+        keys = queries[BOLUM_SUTUNLARI].astype(str)
+        query_links = queries['Link'].to_numpy() if exclude_self and 'Link' in queries.columns else None
+        if self._links is None:
+            query_links = None
+
+        parts = []
+        for key, positions in keys.groupby(BOLUM_SUTUNLARI, sort=False).indices.items():
+            if key not in self._bounds:
+                continue
+            start, end = self._bounds[key]
+            block, norms = self._matrix[start:end], self._norms[start:end]
+            kk = min(k + (query_links is not None), end - start)
+            q_all = self._normalize(features[positions], key)
+
+            for i in range(0, len(positions), SORGU_PARTISI):
+                q, q_pos = q_all[i:i + SORGU_PARTISI], positions[i:i + SORGU_PARTISI]
+                dist = norms[None, :] - 2 * (q @ block.T) + (q ** 2).sum(axis=1)[:, None]
+                nearest = np.argpartition(dist, kk - 1, axis=1)[:, :kk]
+                nearest_dist = np.take_along_axis(dist, nearest, axis=1)
+                order = np.argsort(nearest_dist, axis=1, kind='stable')
+                nearest = np.take_along_axis(nearest, order, axis=1) + start
+                nearest_dist = np.take_along_axis(nearest_dist, order, axis=1)
+
+                keep = np.ones(nearest.shape, dtype=bool)
+                if query_links is not None:
+                    keep = self._links[nearest] != query_links[q_pos][:, None]
+                rank = np.cumsum(keep, axis=1)
+                keep &= rank <= k
+                parts.append((np.repeat(q_pos, keep.sum(axis=1)), rank[keep], nearest[keep],
+                              np.sqrt(np.maximum(nearest_dist[keep], 0))))
+
+        cols = [col for col in EMSAL_SUTUNLARI if col in self.rows.columns]
+        if not parts:
+            return pd.DataFrame(columns=['Sorgu', 'Sıra', 'Mesafe'] + cols)
+        q_pos, rank, row_pos, dist = (np.concatenate(arrays) for arrays in zip(*parts))
+        order = np.lexsort((rank, q_pos))  # Sorgu sırasına göre
+        q_pos, rank, row_pos, dist = q_pos[order], rank[order], row_pos[order], dist[order]
+        result = self.rows.iloc[row_pos][cols]
+        result.insert(0, 'Sorgu', queries.index.to_numpy()[q_pos])
+        result.insert(1, 'Sıra', rank)
+        result.insert(2, 'Mesafe', dist)
+        return result
+
+    # --- Disk ---
+    def save(self, path=COMPARABLES_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        pd.to_pickle({'bicim': BICIM_SURUMU, 'surum': self.data_version, 'satirlar': self.rows}, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=COMPARABLES_PATH):
+        """Kayıtlı dizini döner; dosya yoksa ya da eski biçimdeyse None."""
+        if not os.path.exists(path):
+            return None
+        saved = pd.read_pickle(path)
+        if saved.get('bicim') != BICIM_SURUMU:
+            return None
+        return cls(saved['satirlar'], saved['surum'])
+
+
+def summarize(neighbours):
+    """Sorgu başına emsal sayısı ve fiyat medyanı / en düşük / en yüksek."""
+    return neighbours.groupby('Sorgu')['Fiyat'].agg(Emsal_Sayisi='size', Emsal_Medyan='median',
+                                                    Emsal_Min='min', Emsal_Max='max')
+
+
+def load_or_build(data_path=DATA_PATH, path=COMPARABLES_PATH, df=None, force=False):
+    """Veri setinin güncel sürümüne ait dizini döner; kayıtlı dizin eskiyse yeniden kurup yazar."""
+    version = dataset_version(data_path)
+    previous = ComparablesIndex.load(path)
+    if previous is not None and previous.data_version == version and not force:
+        return previous
+
+    started = time.perf_counter()
+    if df is None:
+        df = load_listings(data_path, KAYNAK_SUTUNLARI)
+    index = ComparablesIndex.build(df, version)
+    index.save(path)
+    print(f"[INFO] Emsal dizini {time.perf_counter() - started:.1f} sn'de kuruldu: {len(index)} ilan, "
+          f"{index.partition_count()} Marka/Seri. Çıktı: '{path}'")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emsal ilan dizinini kurar; --queries verilirse emsalleri yazar.")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--output-index', default=COMPARABLES_PATH)
+    parser.add_argument('--force', action='store_true', help="Sürüm aynı olsa bile yeniden kur")
+    parser.add_argument('--queries', help="Emsalleri aranacak ilanlar (CSV, ilanlar_final.csv şeması)")
+    parser.add_argument('--output', help="Emsallerin yazılacağı CSV")
+    parser.add_argument('-k', type=int, default=EMSAL_SAYISI)
+    args = parser.parse_args()
+
+    index = load_or_build(args.data, args.output_index, force=args.force)
+    if args.queries:
+        queries = pd.read_csv(args.queries, low_memory=False)
+        started = time.perf_counter()
+        neighbours = index.nearest(queries, args.k)
+        elapsed = time.perf_counter() - started
+        output = args.output or f"{os.path.splitext(args.queries)[0]}_emsaller.csv"
+        neighbours.to_csv(output, index_label='Satir', encoding='utf-8-sig')
+        print(f"[INFO] {len(queries)} ilanın emsalleri {elapsed:.2f} sn'de bulundu. Çıktı: '{output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Temizlenmiş ilan veri setinin (ilanlar_final.csv) ortak yükleyicisi.
+
+CSV kaynak olarak kalır; yanında sütun bazlı bir Parquet kopyası üretilebilir:
+    python src/modeling/dataset.py
+Parquet kopyasında kategorik sütunlar sözlük kodlu (category), tam sayılar küçültülmüş
+tiplerde tutulur. Kopya kaynak CSV ile aynı sürümdeyse load_listings onu tercih eder ve
+yalnızca istenen sütunları bellek eşlemeli (memory-map) okur.
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from features import CAT_COLS
+from versions import file_hash
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'ilanlar_final.csv')
+PARQUET_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'ilanlar_final.parquet')
+
+# Uygulamanın (form, fırsat taraması ve canlı puanlama) kullandığı sütunlar
+APP_COLUMNS = CAT_COLS + [
+    'Fiyat', 'Yıl', 'Kilometre', 'Motor Hacmi', 'Motor Gücü', 'Tramer', 'Link',
+    'Boyalı Parçalar', 'Lokal Boyalı Parçalar', 'Değişen Parçalar',
+]
+
+# --- AYARLAR ---
+KATEGORI_ORANI = 0.5  # Tekil değer oranı bunun altındaki metin sütunları category olur
+SURUM_ANAHTARI = b'kaynak_surum'
+# ----------------
+
+
+def dataset_version(path=DATA_PATH):
+    return file_hash(path)
+
+
+def dataset_stamp(path=DATA_PATH):
+    """Veri dosyasının (yol, boyut, değişme zamanı) damgası; yalnızca stat çağrısı yapar.
+
+    Uygulama her yeniden çizimde bunu okur; içerik özeti (dataset_version) yalnızca damga değişince hesaplanır.
+    """
+    return path, os.path.getsize(path), os.path.getmtime(path)
+
+
+def _drop_missing_categories(df):
+    """Kategorik sütunlardan biri boş olan satırları atar, kalanları metne çevirir."""
+    cat_cols = [col for col in CAT_COLS if col in df.columns]
+    df = df[df[cat_cols].notna().all(axis=1)].copy()
+    df[cat_cols] = df[cat_cols].astype(str)
+    return df
+
+
+def optimize_dtypes(df):
+    """Tam sayıları en küçük tipe indirir, tekrarlı metin sütunlarını category yapar.
+
+    Ondalıklı sütunlara dokunulmaz; böylece model tahminleri CSV yoluyla birebir aynı kalır.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif col in CAT_COLS or (pd.api.types.is_string_dtype(series)
+                                 and series.nunique() < KATEGORI_ORANI * len(series)):
+            df[col] = series.astype('category')
+    return df
+
+
+def parquet_version(parquet_path=PARQUET_PATH):
+    """Parquet kopyasının üretildiği CSV sürümünü döner; kopya yoksa None."""
+    if pq is None or not os.path.exists(parquet_path):
+        return None
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    version = metadata.get(SURUM_ANAHTARI)
+    return version.decode('utf-8') if version else None
+
+
+def write_parquet(path=DATA_PATH, parquet_path=PARQUET_PATH):
+    if pq is None:
+        raise ImportError("Parquet için pyarrow gerekli: pip install pyarrow")
+
+    df = optimize_dtypes(_drop_missing_categories(pd.read_csv(path, low_memory=False)))
+    table = pa.Table.from_pandas(df)
+    metadata = {**(table.schema.metadata or {}), SURUM_ANAHTARI: dataset_version(path).encode('utf-8')}
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = f"{parquet_path}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, parquet_path)
+    print(f"[INFO] {len(df)} satır Parquet'e yazıldı: '{parquet_path}' "
+          f"({os.path.getsize(path) / 1e6:.1f} MB CSV -> {os.path.getsize(parquet_path) / 1e6:.1f} MB)")
+    return parquet_path
+
+
+def load_listings(path=DATA_PATH, columns=None, parquet_path=PARQUET_PATH):
+    """Veri setini okur; kategorik sütunlardan biri boş olan satırlar atılır.
+
+    Satırların orijinal sıra numarası (index) korunur; önceden hesaplanan tahminler bu
+    numarayla eşleştirilir. columns verilirse yalnızca bunlardan mevcut olanlar döner.
+    """
+    if parquet_path and parquet_version(parquet_path) == dataset_version(path):
+        if columns is not None:
+            available = set(pq.read_schema(parquet_path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(parquet_path, columns=columns, engine='pyarrow', memory_map=True)
+
+    df = _drop_missing_categories(pd.read_csv(path, low_memory=False))
+    return df if columns is None else df[[col for col in columns if col in df.columns]]
+
+
+# --- Parça parça okuma / yazma ---
+def _is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def iter_chunks(path, chunk_size, columns=None):
+    """CSV ya da Parquet dosyasını en fazla chunk_size satırlık DataFrame'ler halinde okur.
+
+    CSV parçalarının index'i dosyadaki satır numarasıdır.
+    """
+    if _is_parquet(path):
+        if pq is None:
+            raise ImportError("Parquet için pyarrow gerekli: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns, low_memory=False)
+
+
+class ChunkWriter:
+    """Parçaları sırayla CSV'ye ya da tek bir Parquet dosyasına ekler."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._started = False
+
+    def write(self, df):
+        if _is_parquet(self.path):
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        elif self._started:
+            df.to_csv(self.path, mode='a', header=False, index=False, encoding='utf-8')
+        else:
+            df.to_csv(self.path, index=False, encoding='utf-8-sig')
+        self._started = True
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ilanlar_final.csv'den Parquet kopyası üretir.")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--output', default=PARQUET_PATH)
+    args = parser.parse_args()
+
+    write_parquet(args.data, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Uygulama (app/streamlit_app.py) ve model eğitiminin ortak özellik hazırlama adımları.
+
+Tüm adımlar vektöreldir: metin sütunları önce tekil değerlerine indirgenir (pd.factorize),
+temizlik yalnızca bu tekil değerler üzerinde pandas string işlemleriyle yapılır ve sonuç
+satırlara geri dağıtılır. Çıktı, önceki satır satır .apply mantığıyla birebir aynıdır
+(karşılaştırma: benchmarks/bench_features.py).
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+CURRENT_YEAR = datetime.date.today().year
+TRAIN_CURRENT_YEAR = 2025  # Eğitim notebook'unda kullanılan sabit yıl
+
+CAT_COLS = ['Marka', 'Seri', 'Model', 'Vites Tipi', 'Yakıt Tipi', 'Kasa Tipi', 'Renk', 'Kimden', 'Çekiş']
+MEDYAN_SUTUNLARI = ['Motor Hacmi', 'Motor Gücü']  # Eğitimde boşları Model medyanıyla doldurulur
+BOS_HASAR_DEGERLERI = ['Yok', 'Belirtilmemiş', 'Orijinal', 'Tamamı orjinal', 'Hatasız', 'nan']
+TRAIN_DROP_COLS = [
+    'Link', 'İlan No', 'İlan Tarihi',
+    'Boyalı Parçalar', 'Lokal Boyalı Parçalar', 'Değişen Parçalar',
+    'Araç Durumu', 'Takasa Uygun', 'Boya-değişen', 'Ağır Hasarlı',
+    'Ort. Yakıt Tüketimi', 'Yakıt Deposu'
+]
+
+
+def _on_uniques(series, func):
+    """func'ı yalnızca tekil değerlere uygular, sonucu tüm satırlara dağıtır."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    result = func(pd.Series(uniques, dtype=object))
+    return pd.Series(np.asarray(result)[codes], index=series.index)
+
+
+def _is_text(series):
+    return series.dtype == object or isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype))
+
+
+def count_parts(series):
+    """Virgülle ayrılmış parça listesindeki parça sayısı; boş/belirtilmemiş değerler 0 sayılır."""
+    def _count(values):
+        text = values.astype(str)
+        counts = text.str.count(',').fillna(0).astype('int64') + 1
+        return counts.where(~(values.isna() | text.isin(BOS_HASAR_DEGERLERI)), 0)
+
+    return _on_uniques(series, _count).astype('int64')
+
+
+def has_part(series, part):
+    """Parça listesinde verilen parça geçiyorsa 1, geçmiyorsa 0."""
+    def _check(values):
+        found = values.astype(str).str.lower().str.contains(part.lower(), regex=False)
+        return found.where(values.notna(), False).astype('int64')
+
+    return _on_uniques(series, _check).astype('int64')
+
+
+def clean_numeric(series, remove_strs=(' cc', ' hp', ' lt')):
+    """'1.461 cc' / '4,8 lt' gibi değerleri int'e çevirir; çevrilemeyenler 0 olur (uygulama mantığı)."""
+    def _clean(values):
+        text = values.astype(str)
+        for remove_str in remove_strs:
+            text = text.str.replace(remove_str, '', regex=False)
+        text = text.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        return pd.to_numeric(text, errors='coerce').fillna(0).astype(int)
+
+    return _on_uniques(series, _clean).astype(int)
+
+
+def text_to_float(series, remove_str):
+    """Eğitim notebook'undaki clean_text_to_numeric'in vektörel karşılığı; çevrilemeyenler NaN olur."""
+    def _clean(values):
+        text = values.astype(str).str.replace(remove_str, '', regex=False)
+        text = text.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        return pd.to_numeric(text, errors='coerce').where(values.notna()).astype(float)
+
+    return _on_uniques(series, _clean).astype(float)
+
+
+def clean_tramer(series):
+    """'12.500 TL' -> 12500; boş ya da hatalı değerler 0 olur (uygulama mantığı)."""
+    def _clean(values):
+        text = values.astype(str).str.replace(' TL', '', regex=False).str.replace('.', '', regex=False)
+        return pd.to_numeric(text, errors='coerce').fillna(0).astype(int)
+
+    return _on_uniques(series, _clean).astype(int)
+
+
+def add_damage_features(df):
+    df['Boyali_Sayisi'] = count_parts(df['Boyalı Parçalar']) + count_parts(df['Lokal Boyalı Parçalar'])
+    df['Degisen_Sayisi'] = count_parts(df['Değişen Parçalar'])
+    return df
+
+
+def add_age_features(df, current_year):
+    df['Yas'] = current_year - df['Yıl']
+    df['Yas'] = df['Yas'].replace(0, 1)
+    df['Yillik_KM'] = df['Kilometre'] / df['Yas']
+    return df
+
+
+def prepare_input(df_input, feature_names, current_year=CURRENT_YEAR):
+    """Uygulamanın tahmin girdisini hazırlar ve model sütunlarını sırasıyla döner."""
+    df_proc = df_input.copy()
+
+    if 'Boyalı Parçalar' in df_proc.columns and _is_text(df_proc['Boyalı Parçalar']):
+        add_damage_features(df_proc)
+        df_proc['Kaput_Degisen'] = has_part(df_proc['Değişen Parçalar'], 'kaput')
+        df_proc['Tavan_Boyali'] = has_part(df_proc['Boyalı Parçalar'], 'tavan')
+
+    if 'Yıl' in df_proc.columns:
+        df_proc['Yas'] = current_year - df_proc['Yıl']
+        df_proc['Yas'] = df_proc['Yas'].replace(0, 1)
+
+    if 'Kilometre' in df_proc.columns and 'Yas' in df_proc.columns:
+        df_proc['Yillik_KM'] = df_proc['Kilometre'] / df_proc['Yas']
+
+    if 'Boyali_Sayisi' in df_proc.columns and 'Degisen_Sayisi' in df_proc.columns:
+        df_proc['Hasar_Skoru'] = (df_proc['Boyali_Sayisi'] * 1) + (df_proc['Degisen_Sayisi'] * 2)
+
+    for col in ['Motor Hacmi', 'Motor Gücü', 'Yakıt Deposu', 'Ort. Yakıt Tüketimi']:
+        if col in df_proc.columns and _is_text(df_proc[col]):
+            df_proc[col] = clean_numeric(df_proc[col])
+
+    if 'Tramer' in df_proc.columns and _is_text(df_proc['Tramer']):
+        df_proc['Tramer'] = clean_tramer(df_proc['Tramer'])
+
+    for col in feature_names:
+        if col not in df_proc.columns:
+            df_proc[col] = "Bilinmiyor" if col in CAT_COLS else 0
+
+    return df_proc[list(feature_names)]
+
+
+def remove_model_outliers(df, low=0.10, high=0.90, min_count=5):
+    """Her Model içinde fiyatın [low, high] yüzdelikleri dışındaki ilanları atar.
+
+    groupby().apply yerine transform ile tek geçişte hesaplanır. Satır sırası eski
+    apply çıktısıyla aynı olsun diye (Model'e göre gruplar) kararlı sıralama yapılır.
+    """
+    fiyat = df.groupby('Model')['Fiyat']
+    adet = fiyat.transform('size')
+    alt = fiyat.transform('quantile', low)
+    ust = fiyat.transform('quantile', high)
+
+    return df[price_within_bounds(df, adet, alt, ust, min_count)].sort_values('Model', kind='stable')
+
+
+def price_within_bounds(df, adet, alt, ust, min_count=5):
+    """Fiyatı Model'inin [alt, ust] sınırları içinde kalan ya da Model'i min_count'tan az ilanı olan satırlar."""
+    return df['Model'].notna() & ((adet < min_count) | ((df['Fiyat'] >= alt) & (df['Fiyat'] <= ust)))
+
+
+def convert_training_numbers(df):
+    """Eğitim verisinin satır bazlı sayı dönüşümleri; df yerinde değişir."""
+    df['Motor Hacmi'] = text_to_float(df['Motor Hacmi'], ' cc')
+    df['Motor Gücü'] = text_to_float(df['Motor Gücü'], ' hp')
+    df['Tramer'] = text_to_float(df['Tramer'], ' TL').fillna(0)
+    return df
+
+
+def build_training_frame(df, current_year=TRAIN_CURRENT_YEAR):
+    """Temiz veri setinden (ilanlar_final.csv) eğitim için X ve y'yi üretir."""
+    df = convert_training_numbers(df.copy())
+
+    for col in MEDYAN_SUTUNLARI:
+        df[col] = df[col].fillna(df.groupby('Model')[col].transform('median')).fillna(0)
+
+    df = remove_model_outliers(df)
+    return finish_training_frame(df, current_year)
+
+
+def finish_training_frame(df, current_year=TRAIN_CURRENT_YEAR):
+    """Aykırı değerleri atılmış veriden X ve y: yaş / hasar özellikleri, boş kategoriler. Satır bazlıdır."""
+    add_age_features(df, current_year)
+    add_damage_features(df)
+    df['Hasar_Skoru'] = (df['Boyali_Sayisi'] * 1) + (df['Degisen_Sayisi'] * 2)
+
+    for col in CAT_COLS:
+        if col in df.columns:
+            df[col] = df[col].fillna("Bilinmiyor").astype(str)
+
+    X = df.drop(columns=['Fiyat'] + [c for c in TRAIN_DROP_COLS if c in df.columns], errors='ignore')
+    y = df['Fiyat']
+    return X, y
@@ -0,0 +1,55 @@
+"""Fiyat hesaplama formu için Marka -> Seri -> Model hiyerarşisi ve model referans özellikleri.
+
+Veri setinin her sürümü için bir kez kurulur; form her yeniden çizimde veri setini taramak
+yerine sözlüklerden okur.
+"""
+import pandas as pd
+
+HIERARCHY_COLS = ['Marka', 'Seri', 'Model']
+REFERENCE_COLS = ['Kasa Tipi', 'Motor Hacmi', 'Motor Gücü', 'Çekiş', 'Renk']
+OPTION_COLS = ['Vites Tipi', 'Yakıt Tipi']
+
+# 'first': veri setinde modelin ilk ilanı (önceki davranış), 'mode': her sütunun en sık değeri
+AGGREGATIONS = ('first', 'mode')
+
+
+def _sorted_children(keys, parent_cols, child_col):
+    return {parent if len(parent_cols) > 1 else parent[0]: sorted(group[child_col].unique())
+            for parent, group in keys.groupby(parent_cols, sort=False)}
+
+
+def _reference_first(df, cols):
+    return df.drop_duplicates('Model').set_index('Model')[cols]
+
+
+def _reference_mode(df, cols):
+    ref = pd.DataFrame(index=pd.Index(df['Model'].unique(), name='Model'))
+    for col in cols:
+        counts = df.groupby(['Model', col], observed=True, dropna=False).size().rename('adet').reset_index()
+        counts = counts.sort_values(['Model', 'adet'], ascending=[True, False], kind='stable')
+        ref[col] = counts.drop_duplicates('Model').set_index('Model')[col]
+    return ref
+
+
+def build_hierarchy(df, aggregation='first'):
+    """{'markalar', 'seriler', 'modeller', 'referans', 'varsayilan_referans', 'secenekler'} sözlüğünü döner.
+
+    seriler[marka] ve modeller[(marka, seri)] sıralı listelerdir; referans[model] formda
+    kullanıcıya sorulmayan özellikleri (REFERENCE_COLS) tutar.
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Bilinmeyen toplama yöntemi: {aggregation} (seçenekler: {', '.join(AGGREGATIONS)})")
+
+    keys = df[HIERARCHY_COLS].drop_duplicates().astype(str)
+    cols = [col for col in REFERENCE_COLS if col in df.columns]
+    ref_source = df[['Model'] + cols].astype({'Model': str})
+    ref = _reference_first(ref_source, cols) if aggregation == 'first' else _reference_mode(ref_source, cols)
+
+    return {
+        'markalar': sorted(keys['Marka'].unique()),
+        'seriler': _sorted_children(keys, ['Marka'], 'Seri'),
+        'modeller': _sorted_children(keys, ['Marka', 'Seri'], 'Model'),
+        'referans': ref.to_dict('index'),
+        'varsayilan_referans': df[cols].iloc[0].to_dict(),
+        'secenekler': {col: sorted(df[col].astype(str).unique()) for col in OPTION_COLS if col in df.columns},
+    }
@@ -0,0 +1,179 @@
+"""Eğitilmiş CatBoost modellerinin yüklenmesi ve sürüm etiketi.
+
+İki düzen desteklenir: ana, alt ve üst sınır için üç ayrı model ya da alt/orta/üst
+yüzdelikleri tek geçişte veren tek bir MultiQuantile modeli (bkz. train.py --mode multi).
+
+Modeller pickle (.pkl) dışında CatBoost'un kendi ikili biçiminde (.cbm) de saklanabilir:
+    python src/modeling/model_store.py
+Bu komut etkin modelleri .cbm olarak yazar ve sürümü, dosyaları ve özellik listesini içeren
+models/manifest.json'ı üretir. Manifest güncelse modeller oradan yüklenir; alt ve üst sınır
+modelleri ilk ihtiyaç duyulduklarında (LazyModel) belleğe alınır.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import joblib
+
+from versions import file_hash
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'models')
+MODEL_FILES = {
+    'main': "catboost_main.pkl",
+    'low': "catboost_low.pkl",
+    'high': "catboost_high.pkl",
+}
+MULTI_MODEL_FILE = "catboost_multi.pkl"
+MANIFEST_FILE = "manifest.json"
+QUANTILES = (0.10, 0.50, 0.90)  # MultiQuantile çıktı sırası: alt, orta (ana tahmin), üst
+
+# --- AYARLAR ---
+MODEL_TURU = 'auto'  # 'auto': varsa MultiQuantile modeli, yoksa üç model | 'three' | 'multi'
+MODEL_FORMATI = 'auto'  # 'auto': manifest güncelse .cbm, değilse .pkl | 'pkl'
+TEMBEL_YUKLEME = True  # Alt/üst sınır modelleri ilk tahminde yüklensin
+# ----------------
+
+
+def model_paths(models_dir=MODELS_DIR):
+    return {name: os.path.join(models_dir, file_name) for name, file_name in MODEL_FILES.items()}
+
+
+def active_model_kind(models_dir=MODELS_DIR, kind=None):
+    kind = kind or MODEL_TURU
+    if kind == 'auto':
+        return 'multi' if os.path.exists(os.path.join(models_dir, MULTI_MODEL_FILE)) else 'three'
+    return kind
+
+
+def pickle_paths(models_dir=MODELS_DIR, kind=None):
+    """Etkin düzenin pickle dosyaları: {'main', 'low', 'high'} ya da {'multi'} -> yol."""
+    if active_model_kind(models_dir, kind) == 'multi':
+        return {'multi': os.path.join(models_dir, MULTI_MODEL_FILE)}
+    return model_paths(models_dir)
+
+
+def load_manifest(models_dir=MODELS_DIR, kind=None):
+    """Güncel manifest'i döner; yoksa, kapalıysa, istenen düzene uymuyorsa ya da kaynak
+    pickle dosyaları manifest'ten sonra değiştiyse (ör. notebook ile yeniden eğitim) None."""
+    path = os.path.join(models_dir, MANIFEST_FILE)
+    if MODEL_FORMATI == 'pkl' or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    kind = kind or MODEL_TURU
+    if kind != 'auto' and kind != manifest['tur']:
+        return None
+    for source in manifest['kaynaklar']:
+        source_path = os.path.join(models_dir, source)
+        if os.path.exists(source_path) and os.path.getmtime(source_path) > manifest['olusturulma']:
+            return None
+    return manifest
+
+
+def active_model_paths(models_dir=MODELS_DIR, kind=None):
+    manifest = load_manifest(models_dir, kind)
+    if manifest:
+        return {name: os.path.join(models_dir, file_name) for name, file_name in manifest['dosyalar'].items()}
+    return pickle_paths(models_dir, kind)
+
+
+def load_model_file(path):
+    if path.endswith('.cbm'):
+        from catboost import CatBoostRegressor
+        return CatBoostRegressor().load_model(path, format='cbm')
+    return joblib.load(path)
+
+
+class LazyModel:
+    """Model dosyasını ilk kullanımda (ör. ilk predict çağrısında) yükleyen vekil."""
+
+    def __init__(self, path):
+        self.path = path
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = load_model_file(self.path)
+        return self._model
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+
+def open_models(models_dir=MODELS_DIR, kind=None, lazy=TEMBEL_YUKLEME):
+    """{'main', 'low', 'high'} ya da {'multi'} -> model. lazy ise ana model dışındakiler LazyModel olur."""
+    paths = active_model_paths(models_dir, kind)
+    return {name: LazyModel(path) if lazy and name in ('low', 'high') else load_model_file(path)
+            for name, path in paths.items()}
+
+
+def model_version(models_dir=MODELS_DIR, kind=None):
+    manifest = load_manifest(models_dir, kind)
+    if manifest:
+        return manifest['surum']
+    return file_hash(*pickle_paths(models_dir, kind).values())
+
+
+def model_stamp(models_dir=MODELS_DIR, kind=None):
+    """Etkin model dosyalarının (yol, boyut, değişme zamanı) listesi; yalnızca stat çağrısı yapar.
+
+    Uygulama bunu her yeniden çizimde okuyup önbellek anahtarı olarak kullanır; yeni bir model
+    yüklendiğinde damga değişir ve tahmin motoru (ve tahmin önbelleği) yenilenir.
+    """
+    paths = list(active_model_paths(models_dir, kind).values()) + [os.path.join(models_dir, MANIFEST_FILE)]
+    return tuple((path, os.path.getsize(path), os.path.getmtime(path)) for path in paths if os.path.exists(path))
+
+
+def export_native(models_dir=MODELS_DIR, kind=None):
+    """Etkin pickle modellerini .cbm olarak yazar ve manifest.json'ı günceller."""
+    sources = pickle_paths(models_dir, kind)
+    files = {}
+    feature_names = None
+    for name, path in sources.items():
+        model = joblib.load(path)
+        file_name = os.path.basename(path).replace('.pkl', '.cbm')
+        model.save_model(os.path.join(models_dir, file_name), format='cbm')
+        files[name] = file_name
+        feature_names = feature_names or list(model.feature_names_)
+
+    manifest = {
+        'surum': file_hash(*(os.path.join(models_dir, f) for f in files.values())),
+        'tur': 'multi' if 'multi' in files else 'three',
+        'dosyalar': files,
+        'kaynaklar': [os.path.basename(path) for path in sources.values()],
+        'ozellikler': feature_names,
+        'olusturulma': time.time(),
+    }
+    tmp_path = os.path.join(models_dir, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(models_dir, MANIFEST_FILE))
+    print(f"[INFO] {len(files)} model .cbm olarak yazıldı (sürüm {manifest['surum']}): '{models_dir}'")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pickle modelleri CatBoost .cbm biçimine aktarır.")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--kind', choices=['auto', 'three', 'multi'], default=None)
+    args = parser.parse_args()
+
+    export_native(args.models_dir, args.kind)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Veri hazırlama ve model eğitimi hattı: raw -> clean -> features -> train -> export.
+
+Notebook'lardaki adımların betik karşılığıdır. Her aşama, girdi dosyalarının, kodunun ve
+ayarlarının içerik özeti değişmediyse (ve çıktıları yerindeyse) atlanır; bu yüzden hattı
+baştan sona tekrar çalıştırmak yalnızca değişen kısmı yeniden üretir:
+    python src/modeling/pipeline.py
+    python src/modeling/pipeline.py --stages train export --mode multi
+    python src/modeling/pipeline.py --force
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import model_store
+import stream_clean
+import train
+from comparables import COMPARABLES_PATH, load_or_build
+from dataset import DATA_PATH, PARQUET_PATH, write_parquet
+from features import TRAIN_CURRENT_YEAR, build_training_frame
+from precompute_predictions import PREDICTIONS_DIR, precompute
+from versions import file_hash
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+RAW_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'ilanlar_ham.csv')
+FEATURES_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'egitim_verisi.parquet')
+STATE_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'pipeline_durumu.json')
+METRICS_FILE = "metrics.json"
+
+# --- AYARLAR ---
+PIPELINE_CONFIG = {
+    'clean': {'parca_boyutu': stream_clean.PARCA_BOYUTU},
+    # parcali: eğitim verisi iki geçişte parça parça üretilir (satırlar Model'e göre gruplanmaz)
+    'features': {'current_year': TRAIN_CURRENT_YEAR, 'parcali': False},
+    'train': {'mode': 'three', 'iterations': train.COMMON_PARAMS['iterations'], 'test_size': 0.2},
+    'export': {'precompute': True, 'emsaller': True},
+}
+# ----------------
+
+STAGE_ORDER = ['clean', 'features', 'train', 'export']
+
+
+def default_paths():
+    return {
+        'raw': RAW_PATH,
+        'clean': DATA_PATH,
+        'parquet': PARQUET_PATH,
+        'features': FEATURES_PATH,
+        'models_dir': model_store.MODELS_DIR,
+        'predictions_dir': PREDICTIONS_DIR,
+        'comparables': COMPARABLES_PATH,
+        'state': STATE_PATH,
+    }
+
+
+def _code(*module_names):
+    return [os.path.join(CURRENT_DIR, f"{name}.py") for name in module_names]
+
+
+def _model_files(paths, config):
+    kind = config['train']['mode']
+    return list(model_store.pickle_paths(paths['models_dir'], kind).values())
+
+
+# --- Aşamalar ---
+def run_clean(paths, config):
+    os.makedirs(os.path.dirname(paths['clean']), exist_ok=True)
+    stream_clean.clean_file(paths['raw'], paths['clean'], config['clean']['parca_boyutu'])
+    write_parquet(paths['clean'], paths['parquet'])
+
+
+def run_features(paths, config):
+    cfg = config['features']
+    if cfg['parcali']:
+        stream_clean.build_training_file(paths['clean'], paths['features'], cfg['current_year'],
+                                         config['clean']['parca_boyutu'])
+        return
+    df = pd.read_csv(paths['clean'], low_memory=False)
+    X, y = build_training_frame(df, cfg['current_year'])
+    # Link, train aşamasındaki bölme içindir; eğitimden önce ayrılır
+    frame = X.assign(Fiyat=y, Link=df.loc[X.index, 'Link'])
+    frame.to_parquet(paths['features'], index=False)
+    print(f"[INFO] Eğitim verisi: {len(frame)} satır, {X.shape[1]} özellik")
+
+
+def run_train(paths, config):
+    cfg = config['train']
+    frame = pd.read_parquet(paths['features'])
+    y = np.log1p(frame.pop('Fiyat'))
+    X_train, X_test, y_train, y_test = train.split_by_link(frame, y, frame.pop('Link'), cfg['test_size'])
+    params = {**train.COMMON_PARAMS, 'iterations': cfg['iterations']}
+
+    metrics = train.fit_and_save(cfg['mode'], X_train, y_train, X_test, y_test, params, paths['models_dir'])
+    train.save_training_snapshot(pd.read_csv(paths['clean'], usecols=['Link'] + train.DEGISIM_SUTUNLARI),
+                                 paths['models_dir'])
+    with open(os.path.join(paths['models_dir'], METRICS_FILE), 'w', encoding='utf-8') as f:
+        json.dump({**metrics, 'mode': cfg['mode'], 'egitim': len(X_train), 'test': len(X_test)}, f, indent=2)
+    print(f"[INFO] MAE: {metrics['mae']:,.0f} TL | R²: {metrics['r2']:.4f} | Kapsama: %{metrics['kapsama'] * 100:.1f}")
+
+
+def run_export(paths, config):
+    model_store.export_native(paths['models_dir'], config['train']['mode'])
+    if config['export']['precompute']:
+        precompute(paths['clean'], paths['models_dir'], paths['predictions_dir'])
+    if config['export']['emsaller']:
+        load_or_build(paths['clean'], paths['comparables'])
+
+
+STAGES = {
+    'clean': {
+        'inputs': lambda p, c: [p['raw']],
+        'outputs': lambda p, c: [p['clean'], p['parquet']],
+        'code': _code('cleaning', 'stream_clean', 'features', 'dataset'),
+        'run': run_clean,
+    },
+    'features': {
+        'inputs': lambda p, c: [p['clean']],
+        'outputs': lambda p, c: [p['features']],
+        'code': _code('features', 'stream_clean'),
+        'run': run_features,
+    },
+    'train': {
+        'inputs': lambda p, c: [p['features']],
+        'outputs': lambda p, c: _model_files(p, c) + [os.path.join(p['models_dir'], METRICS_FILE)],
+        'code': _code('train'),
+        'run': run_train,
+    },
+    'export': {
+        'inputs': lambda p, c: _model_files(p, c) + [p['clean']],
+        'outputs': lambda p, c: [os.path.join(p['models_dir'], model_store.MANIFEST_FILE)],
+        'code': _code('model_store', 'predict', 'precompute_predictions', 'comparables'),
+        'run': run_export,
+    },
+}
+
+
+# --- Aşama önbelleği ---
+def stage_key(name, paths, config):
+    """Girdi dosyaları + aşama kodu + ayarların özeti."""
+    stage = STAGES[name]
+    inputs = stage['inputs'](paths, config)
+    missing = [path for path in inputs if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"'{name}' aşamasının girdisi yok: {', '.join(missing)}")
+
+    digest = hashlib.sha256()
+    digest.update(file_hash(*inputs).encode())
+    digest.update(file_hash(*stage['code']).encode())
+    digest.update(json.dumps(config[name], sort_keys=True).encode())
+    if name == 'export':
+        digest.update(config['train']['mode'].encode())
+    return digest.hexdigest()[:16]
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_pipeline(stages=STAGE_ORDER, config=PIPELINE_CONFIG, paths=None, force=False):
+    """Aşamaları sırayla çalıştırır; {aşama: 'çalıştı' | 'atlandı'} döner."""
+    paths = paths or default_paths()
+    state = load_state(paths['state'])
+    results = {}
+
+    for name in [stage for stage in STAGE_ORDER if stage in stages]:
+        key = stage_key(name, paths, config)
+        outputs_ready = all(os.path.exists(path) for path in STAGES[name]['outputs'](paths, config))
+        if not force and outputs_ready and state.get(name, {}).get('anahtar') == key:
+            print(f"--- {name}: girdiler değişmedi, atlanıyor ---")
+            results[name] = 'atlandı'
+            continue
+
+        print(f"--- {name}: çalışıyor ---")
+        started = time.perf_counter()
+        STAGES[name]['run'](paths, config)
+        elapsed = time.perf_counter() - started
+
+        state[name] = {'anahtar': key, 'tamamlanma': time.time(), 'sure_sn': round(elapsed, 2)}
+        save_state(paths['state'], state)
+        results[name] = 'çalıştı'
+        print(f"--- {name}: {elapsed:.1f} sn ---")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="raw -> clean -> features -> train -> export hattını çalıştırır.")
+    parser.add_argument('--stages', nargs='+', choices=STAGE_ORDER, default=STAGE_ORDER)
+    parser.add_argument('--force', action='store_true', help="Önbelleği yok sayıp seçili aşamaları yeniden çalıştır")
+    parser.add_argument('--raw', default=RAW_PATH)
+    parser.add_argument('--models-dir', default=model_store.MODELS_DIR)
+    parser.add_argument('--mode', choices=['three', 'multi'], default=PIPELINE_CONFIG['train']['mode'])
+    parser.add_argument('--iterations', type=int, default=PIPELINE_CONFIG['train']['iterations'])
+    args = parser.parse_args()
+
+    config = {**PIPELINE_CONFIG, 'train': {**PIPELINE_CONFIG['train'], 'mode': args.mode,
+                                           'iterations': args.iterations}}
+    paths = {**default_paths(), 'raw': args.raw, 'models_dir': args.models_dir}
+    run_pipeline(args.stages, config, paths, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Veri setindeki tüm ilanları ana, alt ve üst sınır modelleriyle bir kez puanlar.
+
+Tahminler yalnızca veri setine ve modellere bağlıdır, "Fırsat Bul" filtrelerine bağlı değildir.
+Bu yüzden her veri seti / model sürümü için bir kez hesaplanıp diske yazılır; uygulama tarama
+sırasında yalnızca bu sütunları filtreler ve sıralar. Veri seti ya da modeller her
+güncellendiğinde yeniden çalıştırılmalıdır:
+    python src/modeling/precompute_predictions.py
+"""
+import argparse
+import glob
+import os
+import time
+
+import pandas as pd
+
+from dataset import DATA_PATH, dataset_version, load_listings
+from features import CURRENT_YEAR
+from model_store import MODELS_DIR, model_version
+from predict import PriceEstimator
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+PREDICTIONS_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed', 'tahminler')
+PREDICTION_COLS = ['AI_Tahmin', 'AI_Alt', 'AI_Ust', 'Kazanç']
+FIRSAT_ESIGI = 20_000  # "Fırsat Bul" sekmesinde fırsat sayılan en düşük Kazanç (TL)
+FIRSAT_SAYISI = 50
+
+# --- AYARLAR ---
+ESKI_SURUMLERI_SIL = True
+# ----------------
+
+
+def predictions_path(data_version, models_version, current_year=CURRENT_YEAR, predictions_dir=PREDICTIONS_DIR):
+    # Yaş özelliği içinde bulunulan yıla bağlı olduğu için yıl da sürüm anahtarına dahildir
+    return os.path.join(predictions_dir, f"{data_version}_{models_version}_{current_year}.pkl")
+
+
+def score_listings(df, estimator):
+    """df satırlarını (aynı index ile) AI_Tahmin / AI_Alt / AI_Ust / Kazanç sütunlarıyla döner."""
+    preds = estimator.predict(df)
+    preds['Kazanç'] = preds['AI_Tahmin'] - df['Fiyat']
+    return preds
+
+
+def filter_listings(data, marka, butce, yil_araligi):
+    """"Fırsat Bul" filtreleri: bütçe, yıl aralığı ve marka ("Tümü" ise hepsi)."""
+    mask = (data['Fiyat'] <= butce) & (data['Yıl'] >= yil_araligi[0]) & (data['Yıl'] <= yil_araligi[1])
+    if marka != "Tümü":
+        mask &= data['Marka'] == marka
+    return data[mask]
+
+
+def top_opportunities(df, min_gain=FIRSAT_ESIGI, limit=FIRSAT_SAYISI):
+    """Kazanç'ı min_gain'i aşan ilanların en kârlı limit tanesi."""
+    return df[df['Kazanç'] > min_gain].sort_values('Kazanç', ascending=False).head(limit)
+
+
+def load_predictions(data_version, models_version, current_year=CURRENT_YEAR, predictions_dir=PREDICTIONS_DIR):
+    """Sürüme uyan önceden hesaplanmış tahminleri döner; yoksa None."""
+    path = predictions_path(data_version, models_version, current_year, predictions_dir)
+    if not os.path.exists(path):
+        return None
+    return pd.read_pickle(path)
+
+
+def precompute(data_path=DATA_PATH, models_dir=MODELS_DIR, predictions_dir=PREDICTIONS_DIR, force=False):
+    path = predictions_path(dataset_version(data_path), model_version(models_dir), CURRENT_YEAR, predictions_dir)
+    if os.path.exists(path) and not force:
+        print(f"[INFO] Tahminler güncel, atlanıyor: '{path}'")
+        return path
+
+    started = time.perf_counter()
+    df = load_listings(data_path)
+    preds = score_listings(df, PriceEstimator.load(models_dir, CURRENT_YEAR))
+    elapsed = time.perf_counter() - started
+
+    os.makedirs(predictions_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    preds.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+    if ESKI_SURUMLERI_SIL:
+        for old_path in glob.glob(os.path.join(predictions_dir, '*.pkl')):
+            if old_path != path:
+                os.remove(old_path)
+
+    print(f"[INFO] {len(preds)} ilan {elapsed:.1f} sn'de puanlandı. Çıktı: '{path}'")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tüm ilanların model tahminlerini önceden hesaplar.")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--output-dir', default=PREDICTIONS_DIR)
+    parser.add_argument('--force', action='store_true', help="Sürüm aynı olsa bile yeniden hesapla")
+    args = parser.parse_args()
+
+    precompute(args.data, args.models_dir, args.output_dir, args.force)
+
+
+if __name__ == "__main__":
+    main()
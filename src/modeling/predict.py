@@ -0,0 +1,64 @@
+"""Streamlit'ten bağımsız fiyat tahmin motoru.
+
+Uygulama, önceden hesaplama adımı ve toplu tahmin komutu (predict_batch.py) aynı motoru
+kullanır: özellik hazırlığı + ana, alt ve üst sınır tahminleri + log ölçeğinden TL'ye dönüşüm.
+Tahminler üç ayrı modelden ya da tek bir MultiQuantile modelinden gelebilir.
+"""
+import numpy as np
+import pandas as pd
+
+from features import CAT_COLS, CURRENT_YEAR, prepare_input
+from model_store import MODELS_DIR, QUANTILES, TEMBEL_YUKLEME, model_version, open_models
+
+PREDICTION_COLUMNS = {'main': 'AI_Tahmin', 'low': 'AI_Alt', 'high': 'AI_Ust'}
+# MultiQuantile çıktısındaki sütun sırası (QUANTILES ile aynı)
+MULTI_OUTPUT_ORDER = {'low': QUANTILES.index(0.10), 'main': QUANTILES.index(0.50), 'high': QUANTILES.index(0.90)}
+
+
+class PriceEstimator:
+
+    def __init__(self, model_main=None, model_low=None, model_high=None, current_year=CURRENT_YEAR,
+                 multi_model=None, version=None):
+        self.models = {'main': model_main, 'low': model_low, 'high': model_high}
+        self.multi_model = multi_model
+        self.current_year = current_year
+        self.version = version
+
+    @classmethod
+    def load(cls, models_dir=MODELS_DIR, current_year=CURRENT_YEAR, kind=None, lazy=TEMBEL_YUKLEME):
+        models = open_models(models_dir, kind, lazy)
+        version = model_version(models_dir, kind)
+        if 'multi' in models:
+            return cls(current_year=current_year, multi_model=models['multi'], version=version)
+        return cls(models['main'], models['low'], models['high'], current_year=current_year, version=version)
+
+    @property
+    def feature_names(self):
+        return (self.multi_model or self.models['main']).feature_names_
+
+    def prepare(self, df):
+        """İlanlar (ilanlar_final.csv şeması) -> model girdisi. Boş kategoriler 'Bilinmiyor' olur."""
+        processed = prepare_input(df, self.feature_names, self.current_year)
+        for col in CAT_COLS:
+            if col in processed.columns and processed[col].isna().any():
+                values = processed[col].astype(object)
+                processed[col] = values.where(values.notna(), "Bilinmiyor").astype(str)
+        return processed
+
+    def predict(self, df, which=('main', 'low', 'high')):
+        """df ile aynı index'e sahip AI_Tahmin / AI_Alt / AI_Ust (TL) sütunlarını döner."""
+        return self.predict_prepared(self.prepare(df), which)
+
+    def predict_prepared(self, processed, which=('main', 'low', 'high')):
+        """prepare() çıktısı üzerinde tahmin yapar."""
+        preds = pd.DataFrame(index=processed.index)
+        if self.multi_model is not None:
+            # Tek ağaç geçişi tüm yüzdelikleri birlikte verir
+            log_preds = self.multi_model.predict(processed).reshape(len(processed), -1)
+            for name in which:
+                preds[PREDICTION_COLUMNS[name]] = np.expm1(log_preds[:, MULTI_OUTPUT_ORDER[name]])
+            return preds
+
+        for name in which:
+            preds[PREDICTION_COLUMNS[name]] = np.expm1(self.models[name].predict(processed))
+        return preds
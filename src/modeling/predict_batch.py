@@ -0,0 +1,62 @@
+"""Bir ilan dosyasının (CSV veya Parquet) tamamını parça parça fiyatlar.
+
+Girdi ilanlar_final.csv şemasındadır. Dosya bellekte tümüyle tutulmaz: her parça özellik
+hazırlığından ve üç modelden geçirilip hemen çıktıya eklenir.
+    python src/modeling/predict_batch.py envanter.csv fiyatlar.csv
+    python src/modeling/predict_batch.py envanter.parquet fiyatlar.parquet --chunk-size 100000
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from dataset import ChunkWriter, iter_chunks
+from model_store import MODELS_DIR
+from predict import PriceEstimator
+
+# --- AYARLAR ---
+PARCA_BOYUTU = 50_000
+KORUNAN_SUTUNLAR = ['Link', 'İlan No', 'Marka', 'Seri', 'Model', 'Yıl', 'Kilometre', 'Fiyat']
+# ----------------
+
+
+def predict_file(input_path, output_path, models_dir=MODELS_DIR, chunk_size=PARCA_BOYUTU,
+                 keep_columns=KORUNAN_SUTUNLAR, estimator=None):
+    estimator = estimator or PriceEstimator.load(models_dir)
+    writer = ChunkWriter(output_path)
+    total = 0
+    started = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunk_size):
+            preds = estimator.predict(chunk)
+            out = pd.concat([chunk[[col for col in keep_columns if col in chunk.columns]], preds], axis=1)
+            writer.write(out)
+
+            total += len(chunk)
+            elapsed = time.perf_counter() - started
+            print(f"[INFO] {total:,} satır fiyatlandı ({total / elapsed:,.0f} satır/sn)")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] Tamamlandı: {total:,} satır, {elapsed:.1f} sn, {total / max(elapsed, 1e-9):,.0f} satır/sn. "
+          f"Çıktı: '{output_path}'")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İlan dosyasını ana/alt/üst modellerle toplu fiyatlar.")
+    parser.add_argument('input', help="ilanlar_final.csv şemasında CSV veya Parquet")
+    parser.add_argument('output', help="Çıktı dosyası (.csv veya .parquet)")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--chunk-size', type=int, default=PARCA_BOYUTU)
+    args = parser.parse_args()
+
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error("Girdi ve çıktı aynı dosya olamaz.")
+    predict_file(args.input, args.output, args.models_dir, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Fiyat Hesapla formu için oturumlar arası paylaşılan, sınırlı (LRU + TTL) tahmin önbelleği.
+
+Anahtar, model sürümü ile modele giden normalize edilmiş özellik vektörüdür; aynı araç
+yapılandırması tekrar sorulduğunda modeller çalıştırılmaz. Sürüm anahtarda olduğu için model
+değişimi sırasında eski ve yeni modelle gelen istekler birbirinin kayıtlarını silmez; eski
+sürümün kayıtları yeni model yüklendiğinde set_version ile atılır.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from predict import PREDICTION_COLUMNS
+
+# --- AYARLAR ---
+ONBELLEK_BOYUTU = 10_000
+ONBELLEK_SURESI = 6 * 3600  # sn; None ise süresiz
+# ----------------
+
+
+def _normalize(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        # 2019 ile 2019.0 aynı anahtarı üretsin; NaN kendine eşit olmadığı için metne çevrilir
+        if value != value:
+            return 'nan'
+        return int(value) if value.is_integer() else round(value, 6)
+    return str(value)
+
+
+class PredictionCache:
+
+    def __init__(self, maxsize=ONBELLEK_BOYUTU, ttl=ONBELLEK_SURESI, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def make_key(self, values, version=None):
+        return (version or self.version,) + tuple(_normalize(v) for v in values)
+
+    def set_version(self, version):
+        """Model sürümü değiştiyse eski tahminleri atar; her tahminde değil, model yüklendiğinde çağrılır."""
+        with self._lock:
+            if version != self.version:
+                self._data.clear()
+                self.version = version
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, stored_at = item
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, self._clock())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'boyut': len(self._data),
+            'isabet': self.hits,
+            'iska': self.misses,
+            'tahliye': self.evictions,
+            'isabet_orani': self.hits / total if total else 0.0,
+            'surum': self.version,
+        }
+
+    def predict(self, estimator, df):
+        """estimator.predict ile aynı çıktı; önbellekte olmayan satırlar tek seferde tahmin edilir."""
+        processed = estimator.prepare(df)
+        keys = [self.make_key(row, estimator.version) for row in processed.itertuples(index=False, name=None)]
+
+        results = [self.get(key) for key in keys]
+        missing = [i for i, value in enumerate(results) if value is None]
+        if missing:
+            preds = estimator.predict_prepared(processed.iloc[missing])
+            for i, row in zip(missing, preds.itertuples(index=False, name=None)):
+                results[i] = row
+                self.put(keys[i], row)
+
+        return pd.DataFrame(results, index=df.index, columns=list(PREDICTION_COLUMNS.values()))
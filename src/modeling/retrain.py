@@ -0,0 +1,132 @@
+"""Dağıtımdaki modellerin yeni ve değişen ilanlarla artımlı (warm start) güncellenmesi.
+
+Son eğitimin ilan özeti (models/egitim_ozeti.parquet) ile karşılaştırılarak yeni ya da fiyatı /
+kilometresi değişen ilanlar bulunur. Mevcut modeller CatBoost init_model ile bu satırlar (ve
+unutmayı sınırlamak için eski satırlardan bir örneklem) üzerinde birkaç yüz ağaç daha eğitilir;
+üç model aynı anda, model başına iş parçacığı bütçesiyle çalışır. Her güncelleme modele ağaç
+eklediği için arada bir tam eğitim (train.py / pipeline.py) yapılmalıdır.
+    python src/modeling/retrain.py
+    python src/modeling/retrain.py --compare    # tam yeniden eğitimle süre ve doğruluk farkı
+"""
+import argparse
+import time
+
+import pandas as pd
+
+import train
+from dataset import DATA_PATH
+from model_store import MODELS_DIR, active_model_kind, export_native, open_models
+
+# --- AYARLAR ---
+ARTIMLI_ITERASYON = 300
+TEKRAR_ORANI = 1.0  # Yeni/değişen satır başına eğitime eklenen eski satır
+MIN_YENI_SATIR = 100  # Daha az yeni/değişen satır varsa modeller güncellenmez
+# ----------------
+
+
+def changed_listings(df, snapshot):
+    """Özette olmayan ya da DEGISIM_SUTUNLARI değerleri değişen ilanlarda True olan maske."""
+    if snapshot is None:
+        return pd.Series(True, index=df.index)
+    previous = snapshot.set_index('Link')
+    changed = ~df['Link'].isin(previous.index)
+    for col in train.DEGISIM_SUTUNLARI:
+        changed |= df['Link'].map(previous[col]).ne(df[col])
+    return changed
+
+
+def increment_rows(X_train, changed, ratio=TEKRAR_ORANI, random_state=42):
+    """Eğitim kümesindeki yeni/değişen satırlar + eski satırlardan örneklem: (index, yeni satır sayısı)."""
+    is_new = changed.reindex(X_train.index, fill_value=False).to_numpy()
+    new_index = X_train.index[is_new]
+    old_index = pd.Series(X_train.index[~is_new])
+    replay = old_index.sample(min(len(old_index), int(len(new_index) * ratio)), random_state=random_state)
+    return new_index.append(pd.Index(replay)), len(new_index)
+
+
+def model_losses(kind):
+    return {'multi': train.MULTI_LOSS} if kind == 'multi' else train.THREE_LOSSES
+
+
+def retrain(data_path=DATA_PATH, models_dir=MODELS_DIR, kind=None, iterations=ARTIMLI_ITERASYON,
+            threads=None, compare=False, save=True):
+    """Artımlı eğitimi yapar; süreleri ve test metriklerini içeren rapor sözlüğü döner."""
+    kind = active_model_kind(models_dir, kind)
+    df = pd.read_csv(data_path, low_memory=False)
+    X_train, X_test, y_train, y_test = train.split_training_frame(df)
+
+    snapshot = train.load_training_snapshot(models_dir)
+    if snapshot is None:
+        print("[UYARI] Eğitim özeti yok; tüm eğitim satırları yeni sayılıyor.")
+    rows, n_new = increment_rows(X_train, changed_listings(df, snapshot))
+    report = {'mod': kind, 'yeni_satir': n_new, 'artimli_satir': len(rows), 'egitim_satiri': len(X_train)}
+    print(f"Yeni/değişen: {n_new} satır | Artımlı eğitim: {len(rows)} satır | Tam eğitim: {len(X_train)} satır")
+
+    if n_new < MIN_YENI_SATIR:
+        print(f"[INFO] {MIN_YENI_SATIR} satırdan az değişiklik var, modeller güncellenmedi.")
+        report['durum'] = 'atlandı'
+        return report
+
+    deployed = open_models(models_dir, kind, lazy=False)
+    report['mevcut'] = train.evaluate_models(deployed, X_test, y_test)
+
+    params = {**train.COMMON_PARAMS, 'iterations': iterations}
+    started = time.perf_counter()
+    models = train.fit_many(model_losses(kind), X_train.loc[rows], y_train.loc[rows], X_test, y_test, params,
+                            parallel=True, threads=threads, init_models=deployed)
+    report['artimli_sure'] = time.perf_counter() - started
+    report['artimli'] = train.evaluate_models(models, X_test, y_test)
+
+    if compare:
+        # Bugünkü yenileme: sıfırdan, modeller art arda
+        started = time.perf_counter()
+        full = train.fit_many(model_losses(kind), X_train, y_train, X_test, y_test, train.COMMON_PARAMS)
+        report['tam_sure'] = time.perf_counter() - started
+        report['tam'] = train.evaluate_models(full, X_test, y_test)
+
+    if save:
+        train.save_models(models, models_dir)
+        export_native(models_dir, kind)
+        train.save_training_snapshot(df, models_dir)
+        report['durum'] = 'güncellendi'
+    else:
+        report['durum'] = 'kaydedilmedi'
+    return report
+
+
+def print_report(report):
+    print(f"\n{'Yöntem':<16}{'Süre (sn)':>12}{'MAE (TL)':>14}{'R²':>10}{'Kapsama':>10}")
+    for name, label, elapsed in [('mevcut', 'Mevcut model', None), ('artimli', 'Artımlı', report.get('artimli_sure')),
+                                 ('tam', 'Tam eğitim', report.get('tam_sure'))]:
+        if name not in report:
+            continue
+        m = report[name]
+        sure = f"{elapsed:.1f}" if elapsed is not None else "-"
+        print(f"{label:<16}{sure:>12}{m['mae']:>14,.0f}{m['r2']:>10.4f}{m['kapsama'] * 100:>9.1f}%")
+
+    if 'tam' in report:
+        print(f"\nArtımlı eğitim {report['tam_sure'] / report['artimli_sure']:.1f}x daha hızlı | "
+              f"MAE farkı: {report['artimli']['mae'] - report['tam']['mae']:+,.0f} TL | "
+              f"R² farkı: {report['artimli']['r2'] - report['tam']['r2']:+.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mevcut modelleri yeni/değişen ilanlarla artımlı olarak günceller.")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--mode', choices=['three', 'multi'], default=None)
+    parser.add_argument('--iterations', type=int, default=ARTIMLI_ITERASYON)
+    parser.add_argument('--threads', type=int, default=train.THREAD_BUTCESI, help="Model başına iş parçacığı")
+    parser.add_argument('--compare', action='store_true',
+                        help="Tam yeniden eğitimle karşılaştır (modelleri değiştirmez, --dry-run'ı içerir)")
+    parser.add_argument('--dry-run', action='store_true', help="Güncellenen modelleri kaydetme")
+    args = parser.parse_args()
+
+    report = retrain(args.data, args.models_dir, args.mode, args.iterations, args.threads, args.compare,
+                     save=not (args.dry_run or args.compare))
+    if report['durum'] != 'atlandı':
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Ham ilan dosyasının parça parça, sınırlı bellekle temizlenmesi ve eğitim verisinin üretilmesi.
+
+clean    : ilanlar_ham.csv -> ilanlar_final.csv. cleaning.clean_raw_listings satır bazlıdır; her
+           parça ayrı temizlenip çıktıya eklenir, sonuç tüm dosyayı bir kerede temizlemekle aynıdır.
+features : ilanlar_final.csv -> eğitim verisi. Model bazında medyan doldurma ve fiyat aykırı değer
+           sınırları tüm veriye bağlıdır; bu yüzden iki geçiş yapılır. İlk geçiş yalnızca Model,
+           Fiyat, Tramer, Motor Hacmi ve Motor Gücü sütunlarını okuyup (Model, değer) -> adet sayımlarını
+           toplar; ikinci geçiş bu sayımlardan hesaplanan kesin medyan / yüzdelikleri her parçaya
+           uygular. Bellek satır sayısıyla değil, tekil (Model, değer) çifti sayısıyla büyür.
+           Satırlar Model'e göre gruplanmaz, dosyadaki sırada kalır.
+    python src/modeling/stream_clean.py clean data/raw/ilanlar_ham.csv data/processed/ilanlar_final.csv
+    python src/modeling/stream_clean.py features data/processed/ilanlar_final.csv egitim_verisi.parquet
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_raw_listings
+from dataset import ChunkWriter, iter_chunks
+from features import (MEDYAN_SUTUNLARI, TRAIN_CURRENT_YEAR, convert_training_numbers, finish_training_frame,
+                      price_within_bounds)
+
+# --- AYARLAR ---
+PARCA_BOYUTU = 100_000
+AYKIRI_ALT, AYKIRI_UST, AYKIRI_MIN_ADET = 0.10, 0.90, 5  # features.remove_model_outliers ile aynı
+# ----------------
+
+
+class ModelValueCounts:
+    """Model bazında (değer -> adet) sayımları; bunlardan kesin yüzdelik ve medyan hesaplanır."""
+
+    def __init__(self):
+        self.counts = None
+
+    def add(self, models, values):
+        pairs = pd.DataFrame({'Model': models.to_numpy(), 'deger': values.to_numpy(dtype=float)}).dropna()
+        counts = pairs.value_counts()
+        self.counts = counts if self.counts is None else self.counts.add(counts, fill_value=0)
+
+    def sizes(self):
+        """Model -> değeri boş olmayan satır sayısı."""
+        return self.counts.groupby(level='Model').sum()
+
+    def quantile(self, q):
+        """Model -> q yüzdeliği; pandas'ın 'linear' yöntemiyle aynı sonuç."""
+        v_lo, v_hi, frac = self._neighbours(q)
+        return v_lo + (v_hi - v_lo) * frac
+
+    def median(self):
+        # pandas medyanı çift sayıda değerde iki ortancanın ortalamasıdır
+        v_lo, v_hi, frac = self._neighbours(0.5)
+        return v_lo.where(frac == 0, (v_lo + v_hi) / 2)
+
+    def _neighbours(self, q):
+        """Her Model için q konumunu çevreleyen iki sıralı değer ve aralarındaki kesir."""
+        counts = self.counts.sort_index()
+        models = counts.index.get_level_values('Model')
+        values = counts.index.get_level_values('deger').to_numpy(dtype=float)
+        adet = counts.to_numpy()
+        cum = counts.groupby(level='Model').cumsum().to_numpy()
+        n = counts.groupby(level='Model').transform('sum').to_numpy()
+        start = cum - adet
+
+        h = (n - 1) * q
+        lo = np.floor(h)
+        hi = np.minimum(lo + 1, n - 1)
+        lo_row = (start <= lo) & (lo < cum)
+        hi_row = (start <= hi) & (hi < cum)
+
+        v_lo = pd.Series(values[lo_row], index=models[lo_row])
+        v_hi = pd.Series(values[hi_row], index=models[hi_row])
+        frac = pd.Series((h - lo)[lo_row], index=models[lo_row])
+        return v_lo, v_hi, frac
+
+
+def _tmp_path(path):
+    # Uzantı korunur; ChunkWriter biçimi uzantıdan anlar
+    root, ext = os.path.splitext(path)
+    return f"{root}.tmp{ext}"
+
+
+def clean_file(raw_path, output_path, chunk_size=PARCA_BOYUTU):
+    """Ham dosyayı parça parça temizleyip output_path'e yazar; yazılan satır sayısını döner."""
+    tmp_path = _tmp_path(output_path)
+    writer = ChunkWriter(tmp_path)
+    n_in = n_out = 0
+    try:
+        for chunk in iter_chunks(raw_path, chunk_size):
+            n_in += len(chunk)
+            cleaned = clean_raw_listings(chunk)
+            n_out += len(cleaned)
+            writer.write(cleaned)
+    finally:
+        writer.close()
+    os.replace(tmp_path, output_path)
+    print(f"[INFO] Temizlik: {n_in} -> {n_out} satır")
+    return n_out
+
+
+def collect_model_stats(path, chunk_size=PARCA_BOYUTU):
+    """1. geçiş: Fiyat ve MEDYAN_SUTUNLARI için Model bazında değer sayımları."""
+    stats = {col: ModelValueCounts() for col in ['Fiyat'] + MEDYAN_SUTUNLARI}
+    for chunk in iter_chunks(path, chunk_size, columns=['Model', 'Fiyat', 'Tramer'] + MEDYAN_SUTUNLARI):
+        chunk = convert_training_numbers(chunk)
+        for col, counts in stats.items():
+            counts.add(chunk['Model'], chunk[col])
+    return stats
+
+
+def build_training_file(clean_path, output_path, current_year=TRAIN_CURRENT_YEAR, chunk_size=PARCA_BOYUTU):
+    """features.build_training_frame'in iki geçişli, parça parça karşılığı; yazılan satır sayısını döner."""
+    stats = collect_model_stats(clean_path, chunk_size)
+    medians = {col: stats[col].median() for col in MEDYAN_SUTUNLARI}
+    adet, alt, ust = stats['Fiyat'].sizes(), stats['Fiyat'].quantile(AYKIRI_ALT), stats['Fiyat'].quantile(AYKIRI_UST)
+
+    tmp_path = _tmp_path(output_path)
+    writer = ChunkWriter(tmp_path)
+    n_out = 0
+    try:
+        for chunk in iter_chunks(clean_path, chunk_size):
+            df = convert_training_numbers(chunk)
+            for col in MEDYAN_SUTUNLARI:
+                df[col] = df[col].fillna(df['Model'].map(medians[col])).fillna(0)
+
+            model = df['Model']
+            keep = price_within_bounds(df, model.map(adet), model.map(alt), model.map(ust), AYKIRI_MIN_ADET)
+            X, y = finish_training_frame(df[keep].copy(), current_year)
+            writer.write(X.assign(Fiyat=y, Link=df.loc[X.index, 'Link']))
+            n_out += len(X)
+    finally:
+        writer.close()
+    os.replace(tmp_path, output_path)
+    print(f"[INFO] Eğitim verisi: {n_out} satır")
+    return n_out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ham ilanları ve eğitim verisini parça parça üretir.")
+    parser.add_argument('step', choices=['clean', 'features'])
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--chunk-size', type=int, default=PARCA_BOYUTU)
+    parser.add_argument('--current-year', type=int, default=TRAIN_CURRENT_YEAR)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.step == 'clean':
+        clean_file(args.input, args.output, args.chunk_size)
+    else:
+        build_training_file(args.input, args.output, args.current_year, args.chunk_size)
+    print(f"[INFO] {time.perf_counter() - started:.1f} sn -> '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Fiyat modellerinin eğitimi (02_model_egitimi notebook'unun betik karşılığı).
+
+İki mod vardır:
+  three : ana (MAE), alt (Quantile 0.10) ve üst (Quantile 0.90) için üç ayrı model
+  multi : tek bir MultiQuantile modeli; tek ağaç geçişinde alt, orta ve üst tahminleri verir
+    python src/modeling/train.py --mode multi
+Üç model --parallel ile aynı anda, her biri kendi CPU iş parçacığı bütçesiyle eğitilebilir.
+"""
+import argparse
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+
+from dataset import DATA_PATH
+from features import CAT_COLS, build_training_frame
+from model_store import MODEL_FILES, MODELS_DIR, MULTI_MODEL_FILE, QUANTILES, export_native
+
+COMMON_PARAMS = {
+    'iterations': 3000,
+    'learning_rate': 0.03,
+    'depth': 8,
+    'random_seed': 42,
+    'verbose': 500,
+    'allow_writing_files': False,
+    'l2_leaf_reg': 3
+}
+THREE_LOSSES = {
+    'main': 'MAE',
+    'low': 'Quantile:alpha=0.10',
+    'high': 'Quantile:alpha=0.90',
+}
+MULTI_LOSS = "MultiQuantile:alpha=" + ",".join(f"{q:g}" for q in QUANTILES)
+ERKEN_DURDURMA = 200
+SNAPSHOT_FILE = "egitim_ozeti.parquet"
+DEGISIM_SUTUNLARI = ['Fiyat', 'Kilometre']  # Bu sütunlardan biri değişen ilan "değişmiş" sayılır
+TEST_KOVASI = 10_000  # test_mask'in Link özetlerini böldüğü kova sayısı
+
+# --- AYARLAR ---
+THREAD_BUTCESI = None  # Paralel eğitimde model başına iş parçacığı; None ise çekirdekler modellere bölünür
+# ----------------
+
+
+def test_mask(links, test_size=0.2):
+    """İlanı Link'inin crc32 özetine göre test kümesine ayırır (True: test).
+
+    Rastgele bölmenin aksine veri seti büyüdükçe ilanlar taraf değiştirmez; artımlı eğitim (retrain.py)
+    önceki eğitimde görülmüş ilanlarla test edilmez.
+    """
+    kovalar = np.fromiter((zlib.crc32(str(link).encode('utf-8')) % TEST_KOVASI for link in links),
+                          dtype=np.int64, count=len(links))
+    return kovalar < test_size * TEST_KOVASI
+
+
+def split_by_link(X, y, links, test_size=0.2):
+    """(X_train, X_test, y_train, y_test) döner; links X ile aynı sıradadır."""
+    test = test_mask(links, test_size)
+    return X[~test], X[test], y[~test], y[test]
+
+
+def split_training_frame(df, test_size=0.2):
+    """(X_train, X_test, y_train, y_test) döner; hedef log1p(Fiyat). Index'ler df'inkilerdir."""
+    X, y = build_training_frame(df)
+    return split_by_link(X, np.log1p(y), df.loc[X.index, 'Link'], test_size)
+
+
+def load_training_data(path=DATA_PATH, test_size=0.2):
+    return split_training_frame(pd.read_csv(path, low_memory=False), test_size)
+
+
+def thread_budget(n_models, budget=None):
+    """Aynı anda eğitilen model başına CPU iş parçacığı sayısı."""
+    budget = budget or THREAD_BUTCESI
+    return budget or max(1, (os.cpu_count() or 1) // n_models)
+
+
+def _fit(loss, X_train, y_train, X_test, y_test, params, init_model=None):
+    """init_model verilirse eğitim o modelin ağaçlarının üzerine devam eder (warm start)."""
+    model = CatBoostRegressor(loss_function=loss, cat_features=[c for c in CAT_COLS if c in X_train.columns],
+                              **params)
+    model.fit(X_train, y_train, eval_set=(X_test, y_test), early_stopping_rounds=ERKEN_DURDURMA,
+              init_model=init_model)
+    return model
+
+
+def fit_many(losses, X_train, y_train, X_test, y_test, params=COMMON_PARAMS, parallel=False, threads=None,
+             init_models=None):
+    """{isim: kayıp} -> {isim: model}. parallel ise modeller aynı anda, thread_budget kadar iş parçacığıyla eğitilir.
+
+    CatBoost eğitim sırasında GIL'i bıraktığı için iş parçacıkları gerçekten paralel çalışır.
+    """
+    init_models = init_models or {}
+    if not parallel or len(losses) == 1:
+        return {name: _fit(loss, X_train, y_train, X_test, y_test, params, init_models.get(name))
+                for name, loss in losses.items()}
+
+    params = {**params, 'thread_count': thread_budget(len(losses), threads)}
+    with ThreadPoolExecutor(max_workers=len(losses)) as pool:
+        futures = {name: pool.submit(_fit, loss, X_train, y_train, X_test, y_test, params, init_models.get(name))
+                   for name, loss in losses.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def train_three(X_train, y_train, X_test, y_test, params=COMMON_PARAMS, parallel=False, threads=None):
+    """{'main', 'low', 'high'} -> model sözlüğü."""
+    return fit_many(THREE_LOSSES, X_train, y_train, X_test, y_test, params, parallel, threads)
+
+
+def train_multi(X_train, y_train, X_test, y_test, params=COMMON_PARAMS):
+    return _fit(MULTI_LOSS, X_train, y_train, X_test, y_test, params)
+
+
+def save_three(models, models_dir=MODELS_DIR):
+    os.makedirs(models_dir, exist_ok=True)
+    for name, model in models.items():
+        joblib.dump(model, os.path.join(models_dir, MODEL_FILES[name]))
+
+
+def save_multi(model, models_dir=MODELS_DIR):
+    os.makedirs(models_dir, exist_ok=True)
+    joblib.dump(model, os.path.join(models_dir, MULTI_MODEL_FILE))
+
+
+def save_training_snapshot(df, models_dir=MODELS_DIR):
+    """Modellerin eğitildiği ilanların Link + DEGISIM_SUTUNLARI özetini saklar (artımlı eğitim için)."""
+    os.makedirs(models_dir, exist_ok=True)
+    snapshot = df[['Link'] + DEGISIM_SUTUNLARI].drop_duplicates('Link', keep='last')
+    snapshot.to_parquet(os.path.join(models_dir, SNAPSHOT_FILE), index=False)
+
+
+def load_training_snapshot(models_dir=MODELS_DIR):
+    path = os.path.join(models_dir, SNAPSHOT_FILE)
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def evaluate(pred_main, pred_low, pred_high, y_test):
+    """Log ölçekli tahminlerden TL cinsinden MAE, R² ve [alt, üst] aralık kapsamasını hesaplar."""
+    y_true = np.expm1(y_test)
+    main = np.expm1(pred_main)
+    return {
+        'mae': mean_absolute_error(y_true, main),
+        'r2': r2_score(y_true, main),
+        'kapsama': float(np.mean((y_true >= np.expm1(pred_low)) & (y_true <= np.expm1(pred_high)))),
+    }
+
+
+def evaluate_models(models, X_test, y_test):
+    """{'main', 'low', 'high'} ya da {'multi'} model sözlüğünün test metrikleri."""
+    if 'multi' in models:
+        low, main_pred, high = models['multi'].predict(X_test).T
+    else:
+        main_pred, low, high = (models[name].predict(X_test) for name in ('main', 'low', 'high'))
+    return evaluate(main_pred, low, high, y_test)
+
+
+def save_models(models, models_dir=MODELS_DIR):
+    if 'multi' in models:
+        save_multi(models['multi'], models_dir)
+    else:
+        save_three(models, models_dir)
+
+
+def fit_and_save(mode, X_train, y_train, X_test, y_test, params=COMMON_PARAMS, models_dir=MODELS_DIR,
+                 parallel=False, threads=None):
+    """Seçilen moddaki modelleri eğitir, kaydeder ve test metriklerini döner."""
+    if mode == 'multi':
+        models = {'multi': train_multi(X_train, y_train, X_test, y_test, params)}
+    else:
+        models = train_three(X_train, y_train, X_test, y_test, params, parallel, threads)
+    save_models(models, models_dir)
+    return evaluate_models(models, X_test, y_test)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fiyat modellerini eğitir ve models/ altına kaydeder.")
+    parser.add_argument('--mode', choices=['three', 'multi'], default='three')
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--iterations', type=int, default=COMMON_PARAMS['iterations'])
+    parser.add_argument('--parallel', action='store_true', help="Üç modeli aynı anda eğit")
+    parser.add_argument('--threads', type=int, default=THREAD_BUTCESI, help="Model başına iş parçacığı")
+    args = parser.parse_args()
+
+    params = {**COMMON_PARAMS, 'iterations': args.iterations}
+    df = pd.read_csv(args.data, low_memory=False)
+    X_train, X_test, y_train, y_test = split_training_frame(df)
+    print(f"Eğitim: {len(X_train)} satır | Test: {len(X_test)} satır | Mod: {args.mode}")
+
+    started = time.perf_counter()
+    metrics = fit_and_save(args.mode, X_train, y_train, X_test, y_test, params, args.models_dir,
+                           args.parallel, args.threads)
+    elapsed = time.perf_counter() - started
+    export_native(args.models_dir, args.mode)
+    save_training_snapshot(df, args.models_dir)
+
+    print("\n--- FİNAL MODEL BAŞARISI ---")
+    print(f"Ortalama Hata (MAE): {metrics['mae']:,.0f} TL")
+    print(f"Başarı Skoru (R²): {metrics['r2']:.4f}")
+    print(f"Alt-Üst Aralık Kapsaması: %{metrics['kapsama'] * 100:.1f}")
+    print(f"Eğitim süresi: {elapsed:.1f} sn. Modeller kaydedildi: '{args.models_dir}'")
+
+
+if __name__ == "__main__":
+    main()
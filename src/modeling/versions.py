@@ -0,0 +1,16 @@
+"""Veri seti ve model dosyaları için içerik özetine dayalı sürüm etiketleri."""
+import hashlib
+import os
+
+OKUMA_BLOGU = 1 << 20
+
+
+def file_hash(*paths, length=12):
+    """Dosyaların içerik özetini (SHA-256, ilk length karakter) döner; sıra önemlidir."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(OKUMA_BLOGU), b''):
+                digest.update(block)
+    return digest.hexdigest()[:length]
@@ -0,0 +1,106 @@
+"""Fiyat Hesapla formu için senaryo analizi: kilometre x yıl x hasar ızgarasında fiyat eğrileri.
+
+Formdaki araç tek satır olarak alınır; km, model yılı ve hasar durumu değiştirilerek tüm ızgara
+tek bir DataFrame'de üretilir ve tek prepare + model başına tek predict çağrısıyla puanlanır
+(formu her senaryo için tekrar göndermek yerine). Sonuç, model sürümü ve form girdisiyle
+anahtarlanıp önbelleğe alınabilir (prediction_cache.PredictionCache).
+
+    scores = what_if(estimator, input_data, cache)
+    km_egrisi, yil_egrisi = curves(scores, input_data)
+    depreciation_table(km_egrisi)
+"""
+import numpy as np
+import pandas as pd
+
+from features import CURRENT_YEAR, prepare_input
+from predict import PREDICTION_COLUMNS
+
+HASAR_SUTUNLARI = ['Boyali_Sayisi', 'Degisen_Sayisi', 'Kaput_Degisen', 'Tavan_Boyali', 'Tramer']
+HASAR_METIN_SUTUNLARI = ['Boyalı Parçalar', 'Lokal Boyalı Parçalar', 'Değişen Parçalar']
+GIRILEN = 'Girilen'  # Formdaki hasar durumu
+
+# --- AYARLAR ---
+KM_ADIMLARI = list(range(0, 300_001, 25_000))
+YIL_PENCERESI = 5  # Formdaki yılın bu kadar öncesi ve sonrası (içinde bulunulan yılı geçmeden)
+HASAR_SEVIYELERI = {
+    'Hatasız': {'Boyali_Sayisi': 0, 'Degisen_Sayisi': 0, 'Kaput_Degisen': 0, 'Tavan_Boyali': 0, 'Tramer': 0},
+    '2 Boyalı': {'Boyali_Sayisi': 2, 'Degisen_Sayisi': 0, 'Kaput_Degisen': 0, 'Tavan_Boyali': 0, 'Tramer': 0},
+    '1 Değişen, 2 Boyalı': {'Boyali_Sayisi': 2, 'Degisen_Sayisi': 1, 'Kaput_Degisen': 0, 'Tavan_Boyali': 0,
+                            'Tramer': 25_000},
+    '2 Değişen, 4 Boyalı': {'Boyali_Sayisi': 4, 'Degisen_Sayisi': 2, 'Kaput_Degisen': 1, 'Tavan_Boyali': 0,
+                            'Tramer': 75_000},
+}
+# ----------------
+
+
+def year_range(year, window=YIL_PENCERESI, current_year=CURRENT_YEAR):
+    return list(range(int(year) - window, min(int(year) + window, current_year) + 1))
+
+
+def build_grid(base, km_values=KM_ADIMLARI, years=None, damage_levels=HASAR_SEVIYELERI):
+    """Tek satırlık girdiden (form ya da ilan) hasar x yıl x km ızgarasını üretir.
+
+    Formdaki km ve yıl eksenlere eklenir; formdaki hasar durumu 'Girilen' seviyesi olur.
+    Hasar_Durumu sütunu satırın hasar seviyesinin adıdır.
+    """
+    row = base.iloc[[0]]
+    km_values = sorted(set(km_values) | {int(row['Kilometre'].iloc[0])})
+    years = sorted(set(years or year_range(row['Yıl'].iloc[0])))
+
+    # Hasar metin olarak geldiyse (ilan satırı) sayılara çevrilir; ızgarada yalnızca sayılar kullanılır
+    entered = prepare_input(row, HASAR_SUTUNLARI).iloc[0].to_dict()
+    levels = {GIRILEN: entered, **damage_levels}
+
+    level_idx, year_idx, km_idx = (axis.ravel() for axis in np.meshgrid(
+        np.arange(len(levels)), np.arange(len(years)), np.arange(len(km_values)), indexing='ij'))
+    grid = row.drop(columns=HASAR_METIN_SUTUNLARI, errors='ignore')
+    grid = grid.loc[grid.index.repeat(len(level_idx))].reset_index(drop=True)
+    grid['Yıl'] = np.asarray(years)[year_idx]
+    grid['Kilometre'] = np.asarray(km_values)[km_idx]
+    for col in HASAR_SUTUNLARI:
+        grid[col] = np.asarray([level[col] for level in levels.values()])[level_idx]
+    grid['Hasar_Durumu'] = np.asarray(list(levels), dtype=object)[level_idx]
+    return grid
+
+
+def score_grid(estimator, grid):
+    """Izgarayı tek seferde puanlar: Hasar_Durumu, Yıl, Kilometre + AI_Tahmin / AI_Alt / AI_Ust."""
+    return grid[['Hasar_Durumu', 'Yıl', 'Kilometre']].join(estimator.predict(grid))
+
+
+def _cache_key(cache, base, km_values, years, damage_levels, version):
+    levels = tuple((name, *level.values()) for name, level in damage_levels.items())
+    return cache.make_key(('senaryo', *base.iloc[0].tolist(), *km_values, '|', *(years or ()), '|', *levels), version)
+
+
+def what_if(estimator, base, cache=None, km_values=KM_ADIMLARI, years=None, damage_levels=HASAR_SEVIYELERI):
+    """build_grid + score_grid; cache verilirse aynı girdi ve model sürümü için ızgara tekrar puanlanmaz."""
+    if cache is None:
+        return score_grid(estimator, build_grid(base, km_values, years, damage_levels))
+
+    key = _cache_key(cache, base, km_values, years, damage_levels, estimator.version)
+    scores = cache.get(key)
+    if scores is None:
+        scores = score_grid(estimator, build_grid(base, km_values, years, damage_levels))
+        cache.put(key, scores)
+    return scores.copy()
+
+
+def curves(scores, base, column=PREDICTION_COLUMNS['main']):
+    """(km_egrisi, yil_egrisi): satırlar km / yıl, sütunlar hasar durumu; diğer eksen formdaki değerde sabit.
+
+    Yıl eğrisi en yeni modelden eskiye doğru sıralıdır.
+    """
+    row = base.iloc[0]
+    order = list(dict.fromkeys(scores['Hasar_Durumu']))
+    by_km = scores[scores['Yıl'] == row['Yıl']].pivot(index='Kilometre', columns='Hasar_Durumu', values=column)
+    by_year = scores[scores['Kilometre'] == row['Kilometre']].pivot(index='Yıl', columns='Hasar_Durumu',
+                                                                    values=column)
+    return by_km[order], by_year[order].sort_index(ascending=False)
+
+
+def depreciation_table(curve, level=GIRILEN):
+    """Eğrinin ilk satırına (0 km ya da en yeni yıl) göre değer kaybı: Fiyat, Kayıp (TL), Kayıp (%)."""
+    values = curve[level]
+    return pd.DataFrame({'Fiyat': values, 'Kayıp (TL)': values.iloc[0] - values,
+                         'Kayıp (%)': (1 - values / values.iloc[0]) * 100})